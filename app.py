@@ -1,12 +1,16 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, g, request, jsonify, render_template, send_from_directory, stream_with_context
 from flask_cors import CORS
-import json
 import traceback
 import os
-from geometry.models import (
-    Point, Line, Circle, Triangle, Polygon, Transformations, GeometryEngine,
-    GeometryError, PointError, LineError, CircleError, TriangleError, PolygonError
+import time
+from geometry import metrics
+from geometry.binary import MIME_TYPE as BINARY_MIME_TYPE, decode_request, encode_result
+from geometry.profiling import profile_call, summarize
+from geometry.operations import (
+    run_operation, run_batch, error_info, OPERATIONS, RESULT_CACHE, OFFLOADER
 )
+from geometry.schema import ValidationError
+from geometry.streaming import iter_lines, polygon_measures, read_transform_header, transform_lines
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
 CORS(app)  # Enable CORS for all routes
@@ -14,6 +18,47 @@ CORS(app)  # Enable CORS for all routes
 # Ensure the static directory exists
 os.makedirs('static', exist_ok=True)
 
+# Timing hooks around the model classes are off by default; set GEOMETRY_MODEL_TIMING=1 to enable
+app.config['MODEL_TIMING'] = os.environ.get('GEOMETRY_MODEL_TIMING', '') == '1'
+if app.config['MODEL_TIMING']:
+    metrics.instrument_models()
+
+# Per-request profiling (?profile=1 or an X-Profile: 1 header) is only honoured when enabled;
+# with GEOMETRY_PROFILE_DIR set, every profile is also saved there
+app.config['PROFILING'] = os.environ.get('GEOMETRY_PROFILING', '') == '1'
+app.config['PROFILE_DIR'] = os.environ.get('GEOMETRY_PROFILE_DIR') or None
+
+# Operations on at least OFFLOAD_MIN_POINTS points run in a pool of OFFLOAD_WORKERS processes
+# (0 runs everything inline) and fail with a timeout after OFFLOAD_TIMEOUT seconds
+app.config['OFFLOAD_WORKERS'] = int(os.environ.get('GEOMETRY_OFFLOAD_WORKERS', OFFLOADER.workers))
+app.config['OFFLOAD_MIN_POINTS'] = int(os.environ.get('GEOMETRY_OFFLOAD_MIN_POINTS', OFFLOADER.min_points))
+app.config['OFFLOAD_TIMEOUT'] = float(os.environ.get('GEOMETRY_OFFLOAD_TIMEOUT', OFFLOADER.timeout))
+OFFLOADER.workers = app.config['OFFLOAD_WORKERS']
+OFFLOADER.min_points = app.config['OFFLOAD_MIN_POINTS']
+OFFLOADER.timeout = app.config['OFFLOAD_TIMEOUT']
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and record its latency and payload size under its route pattern"""
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    # For streamed responses this is the time until the body starts streaming
+    elapsed = time.perf_counter() - g.get('request_start', time.perf_counter())
+    metrics.HTTP_REQUESTS.inc(route, request.method, str(response.status_code))
+    metrics.HTTP_LATENCY.observe(elapsed, route)
+    metrics.HTTP_PAYLOAD.observe(request.content_length or 0, route)
+    if response.status_code >= 400:
+        metrics.HTTP_ERRORS.inc(route, g.get('error_code', 'http_error'))
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request and model metrics in the Prometheus text format"""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -26,788 +71,147 @@ def report():
 def serve_static(path):
     return send_from_directory('static', path)
 
-# Helper function to parse points from request
-def parse_points(data):
-    points = []
-    for point_data in data:
-        try:
-            x = float(point_data.get('x', 0))
-            y = float(point_data.get('y', 0))
-            points.append(Point(x, y))
-        except ValueError:
-            raise PointError("Invalid point coordinates")
-    return points
-
-# API Routes
-@app.route('/api/point/distance', methods=['POST'])
-def point_distance():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        distance = p1.distance_to(p2)
-        return jsonify({
-            'success': True,
-            'result': {
-                'distance': distance,
-                'point1': p1.to_dict(),
-                'point2': p2.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/point/midpoint', methods=['POST'])
-def point_midpoint():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        midpoint = p1.midpoint(p2)
-        return jsonify({
-            'success': True,
-            'result': {
-                'midpoint': midpoint.to_dict(),
-                'point1': p1.to_dict(),
-                'point2': p2.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/point/section', methods=['POST'])
-def point_section():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        ratio = float(data['ratio'])
-        section_point = p1.section_formula(p2, ratio)
-        return jsonify({
-            'success': True,
-            'result': {
-                'section_point': section_point.to_dict(),
-                'point1': p1.to_dict(),
-                'point2': p2.to_dict(),
-                'ratio': ratio
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/line/create', methods=['POST'])
-def line_create():
+def error_response(error: Exception, status: int = 400):
+    """Structured error response; the traceback is only formatted in debug mode"""
+    # Errors that are not the client's fault (timeouts, a full queue) carry their own status
+    status = getattr(error, 'status', status)
+    body = dict(error_info(error), success=False)
+    g.error_code = body['code']
+    if app.debug:
+        body['traceback'] = traceback.format_exc()
+    return jsonify(body), status
+
+def request_json():
+    """JSON request body, or a ValidationError when it does not parse"""
+    data = request.get_json(silent=True)
+    if data is None and request.get_data():
+        raise ValidationError("Request body is not valid JSON", code='invalid_json')
+    return data
+
+def profiling_requested() -> bool:
+    if not app.config['PROFILING']:
+        return False
+    flag = request.args.get('profile') or request.headers.get('X-Profile', '')
+    return flag.lower() in ('1', 'true', 'yes')
+
+def profiled(label: str, func, *args, **kwargs):
+    """Call func, under cProfile if the request asked for it; returns (result, profile summary or None)"""
+    if not profiling_requested():
+        return func(*args, **kwargs), None
+    result, stats = profile_call(func, *args, **kwargs)
+    return result, summarize(stats, directory=app.config['PROFILE_DIR'], label=label.replace('/', '_'))
+
+def run_operation_response(name):
+    """Run a registered operation on the JSON request body and build the API response.
+
+    ?fields=area,polygon.points limits the result to those keys and ?lean=1 leaves out the input echo.
+    Point arrays can be sent and received as packed float64 (see geometry.binary) through the
+    Content-Type and Accept headers. With profiling enabled, ?profile=1 adds a "profile" section.
+    """
+    try:
+        if request.mimetype == BINARY_MIME_TYPE:
+            data = decode_request(request.get_data(cache=False))
+        else:
+            data = request_json()
+        lean = request.args.get('lean', '').lower() in ('1', 'true', 'yes')
+        binary = request.accept_mimetypes.best_match(['application/json', BINARY_MIME_TYPE]) == BINARY_MIME_TYPE
+        # Profiled requests skip the result cache so the profile shows the computation itself
+        result, profile = profiled(name, run_operation, name, data, request.args.get('fields'), lean,
+                                   keep_arrays=binary, use_cache=not profiling_requested())
+        extra = {'profile': profile} if profile is not None else {}
+        if binary:
+            return Response(encode_result(result, **extra), mimetype=BINARY_MIME_TYPE)
+        return jsonify({
+            'success': True,
+            'result': result,
+            **extra
+        })
+    except Exception as e:
+        return error_response(e)
+
+def operation_view(name):
+    def view():
+        return run_operation_response(name)
+    return view
+
+# API Routes: every registered operation is served at /api/<name>, e.g. /api/line/intersection
+for name in OPERATIONS:
+    app.add_url_rule(f'/api/{name}', name.replace('/', '_'), operation_view(name), methods=['POST'])
+
+# Streaming routes: the body is NDJSON, one point object or one array of points per line
+@app.route('/api/stream/polygon/measures', methods=['POST'])
+def stream_polygon_measures():
+    """Area, perimeter and centroid of a polygon of any size, computed in constant memory"""
+    try:
+        return jsonify({
+            'success': True,
+            'result': polygon_measures(request.stream)
+        })
+    except Exception as e:
+        return error_response(e)
+
+@app.route('/api/stream/transform', methods=['POST'])
+def stream_transform():
+    """Apply a transform pipeline to streamed points; the first line is a {"steps": [...]} header"""
+    try:
+        lines = iter_lines(request.stream)
+        transform = read_transform_header(lines)
+    except Exception as e:
+        return error_response(e)
+    return Response(stream_with_context(transform_lines(lines, transform)), mimetype='application/x-ndjson')
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Report hit rate, evictions and bytes held by the operation result cache"""
+    return jsonify({
+        'success': True,
+        'result': RESULT_CACHE.stats()
+    })
+
+@metrics.REGISTRY.collector
+def cache_metrics():
+    stats = RESULT_CACHE.stats()
+    for key, kind, documentation in (
+            ('hits', 'counter', 'Result cache hits'),
+            ('misses', 'counter', 'Result cache misses'),
+            ('evictions', 'counter', 'Result cache entries evicted to stay within limits'),
+            ('expirations', 'counter', 'Result cache entries dropped after their TTL'),
+            ('entries', 'gauge', 'Result cache entries held'),
+            ('bytes', 'gauge', 'Approximate bytes held by the result cache')):
+        name = f'geometry_cache_{key}_total' if kind == 'counter' else f'geometry_cache_{key}'
+        yield f'# HELP {name} {documentation}'
+        yield f'# TYPE {name} {kind}'
+        yield f'{name} {stats[key]}'
+
+@metrics.REGISTRY.collector
+def offload_metrics():
+    stats = OFFLOADER.stats()
+    for key, kind, documentation in (
+            ('offloaded', 'counter', 'Operations computed in the offload process pool'),
+            ('rejected', 'counter', 'Large operations rejected because the offload queue was full'),
+            ('timeouts', 'counter', 'Offloaded operations that ran past their deadline'),
+            ('pending', 'gauge', 'Offloaded operations queued or running')):
+        name = f'geometry_offload_{key}_total' if kind == 'counter' else f'geometry_offload_{key}'
+        yield f'# HELP {name} {documentation}'
+        yield f'# TYPE {name} {kind}'
+        yield f'{name} {stats[key]}'
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Run many operations in one round trip: {"operations": [{"op": "line/intersection", "args": {...}}, ...]}"""
     try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        line = Line(p1, p2)
-        return jsonify({
-            'success': True,
-            'result': line.to_dict()
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/line/slope', methods=['POST'])
-def line_slope():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        line = Line(p1, p2)
-        slope = line.slope()
-        return jsonify({
-            'success': True,
-            'result': {
-                'slope': slope,
-                'line': line.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/line/equation', methods=['POST'])
-def line_equation():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        line = Line(p1, p2)
-        equation = line.equation()
-        return jsonify({
-            'success': True,
-            'result': {
-                'equation': equation,
-                'line': line.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/line/parallel', methods=['POST'])
-def line_parallel():
-    try:
-        data = request.json
-        p1 = Point(data['line1']['point1']['x'], data['line1']['point1']['y'])
-        p2 = Point(data['line1']['point2']['x'], data['line1']['point2']['y'])
-        p3 = Point(data['line2']['point1']['x'], data['line2']['point1']['y'])
-        p4 = Point(data['line2']['point2']['x'], data['line2']['point2']['y'])
-        
-        line1 = Line(p1, p2)
-        line2 = Line(p3, p4)
-        
-        is_parallel = line1.is_parallel(line2)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'is_parallel': is_parallel,
-                'line1': line1.to_dict(),
-                'line2': line2.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/line/perpendicular', methods=['POST'])
-def line_perpendicular():
-    try:
-        data = request.json
-        p1 = Point(data['line1']['point1']['x'], data['line1']['point1']['y'])
-        p2 = Point(data['line1']['point2']['x'], data['line1']['point2']['y'])
-        p3 = Point(data['line2']['point1']['x'], data['line2']['point1']['y'])
-        p4 = Point(data['line2']['point2']['x'], data['line2']['point2']['y'])
-        
-        line1 = Line(p1, p2)
-        line2 = Line(p3, p4)
-        
-        is_perpendicular = line1.is_perpendicular(line2)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'is_perpendicular': is_perpendicular,
-                'line1': line1.to_dict(),
-                'line2': line2.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/line/angle', methods=['POST'])
-def line_angle():
-    try:
-        data = request.json
-        p1 = Point(data['line1']['point1']['x'], data['line1']['point1']['y'])
-        p2 = Point(data['line1']['point2']['x'], data['line1']['point2']['y'])
-        p3 = Point(data['line2']['point1']['x'], data['line2']['point1']['y'])
-        p4 = Point(data['line2']['point2']['x'], data['line2']['point2']['y'])
-        
-        line1 = Line(p1, p2)
-        line2 = Line(p3, p4)
-        
-        angle = line1.angle_with(line2)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'angle': angle,
-                'line1': line1.to_dict(),
-                'line2': line2.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/line/intersection', methods=['POST'])
-def line_intersection():
-    try:
-        data = request.json
-        p1 = Point(data['line1']['point1']['x'], data['line1']['point1']['y'])
-        p2 = Point(data['line1']['point2']['x'], data['line1']['point2']['y'])
-        p3 = Point(data['line2']['point1']['x'], data['line2']['point1']['y'])
-        p4 = Point(data['line2']['point2']['x'], data['line2']['point2']['y'])
-        
-        line1 = Line(p1, p2)
-        line2 = Line(p3, p4)
-        
-        intersection = line1.intersection_with(line2)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'intersection': intersection.to_dict() if intersection else None,
-                'line1': line1.to_dict(),
-                'line2': line2.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/circle/create', methods=['POST'])
-def circle_create():
-    try:
-        data = request.json
-        center = Point(data['center']['x'], data['center']['y'])
-        radius = float(data['radius'])
-        
-        circle = Circle(center, radius)
-        
-        return jsonify({
-            'success': True,
-            'result': circle.to_dict()
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/circle/area', methods=['POST'])
-def circle_area():
-    try:
-        data = request.json
-        center = Point(data['center']['x'], data['center']['y'])
-        radius = float(data['radius'])
-        
-        circle = Circle(center, radius)
-        area = circle.area()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'area': area,
-                'circle': circle.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/circle/circumference', methods=['POST'])
-def circle_circumference():
-    try:
-        data = request.json
-        center = Point(data['center']['x'], data['center']['y'])
-        radius = float(data['radius'])
-        
-        circle = Circle(center, radius)
-        circumference = circle.circumference()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'circumference': circumference,
-                'circle': circle.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/circle/contains', methods=['POST'])
-def circle_contains():
-    try:
-        data = request.json
-        center = Point(data['circle']['center']['x'], data['circle']['center']['y'])
-        radius = float(data['circle']['radius'])
-        point = Point(data['point']['x'], data['point']['y'])
-        
-        circle = Circle(center, radius)
-        contains = circle.contains_point(point)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'contains': contains,
-                'circle': circle.to_dict(),
-                'point': point.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/circle/line_intersection', methods=['POST'])
-def circle_line_intersection():
-    try:
-        data = request.json
-        center = Point(data['circle']['center']['x'], data['circle']['center']['y'])
-        radius = float(data['circle']['radius'])
-        p1 = Point(data['line']['point1']['x'], data['line']['point1']['y'])
-        p2 = Point(data['line']['point2']['x'], data['line']['point2']['y'])
-        
-        circle = Circle(center, radius)
-        line = Line(p1, p2)
-        
-        intersections = circle.intersection_with_line(line)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'intersections': [p.to_dict() for p in intersections],
-                'circle': circle.to_dict(),
-                'line': line.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/triangle/create', methods=['POST'])
-def triangle_create():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        p3 = Point(data['point3']['x'], data['point3']['y'])
-        
-        triangle = Triangle(p1, p2, p3)
-        
-        return jsonify({
-            'success': True,
-            'result': triangle.to_dict()
+        data = request_json()
+        items = data.get('operations') if isinstance(data, dict) else data
+        results, profile = profiled('batch', run_batch, items, use_cache=not profiling_requested())
+        extra = {'profile': profile} if profile is not None else {}
+        return jsonify({
+            'success': True,
+            'results': results,
+            **extra
         })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/triangle/area', methods=['POST'])
-def triangle_area():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        p3 = Point(data['point3']['x'], data['point3']['y'])
-        
-        triangle = Triangle(p1, p2, p3)
-        area = triangle.area()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'area': area,
-                'triangle': triangle.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/triangle/centroid', methods=['POST'])
-def triangle_centroid():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        p3 = Point(data['point3']['x'], data['point3']['y'])
-        
-        triangle = Triangle(p1, p2, p3)
-        centroid = triangle.centroid()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'centroid': centroid.to_dict(),
-                'triangle': triangle.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/triangle/orthocenter', methods=['POST'])
-def triangle_orthocenter():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        p3 = Point(data['point3']['x'], data['point3']['y'])
-        
-        triangle = Triangle(p1, p2, p3)
-        orthocenter = triangle.orthocenter()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'orthocenter': orthocenter.to_dict() if orthocenter else None,
-                'triangle': triangle.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/triangle/circumcenter', methods=['POST'])
-def triangle_circumcenter():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        p3 = Point(data['point3']['x'], data['point3']['y'])
-        
-        triangle = Triangle(p1, p2, p3)
-        circumcenter = triangle.circumcenter()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'circumcenter': circumcenter.to_dict() if circumcenter else None,
-                'triangle': triangle.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/polygon/create', methods=['POST'])
-def polygon_create():
-    try:
-        data = request.json
-        points_data = data['points']
-        points = parse_points(points_data)
-        
-        polygon = Polygon(points)
-        
-        return jsonify({
-            'success': True,
-            'result': polygon.to_dict()
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/polygon/area', methods=['POST'])
-def polygon_area():
-    try:
-        data = request.json
-        points_data = data['points']
-        points = parse_points(points_data)
-        
-        polygon = Polygon(points)
-        area = polygon.area()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'area': area,
-                'polygon': polygon.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-
-@app.route('/api/polygon/perimeter', methods=['POST'])
-def polygon_perimeter():
-    try:
-        data = request.json
-        points_data = data['points']
-        points = parse_points(points_data)
-        
-        polygon = Polygon(points)
-        perimeter = polygon.perimeter()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'perimeter': perimeter,
-                'polygon': polygon.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/polygon/centroid', methods=['POST'])
-def polygon_centroid():
-    try:
-        data = request.json
-        points_data = data['points']
-        points = parse_points(points_data)
-        
-        polygon = Polygon(points)
-        centroid = polygon.centroid()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'centroid': centroid.to_dict(),
-                'polygon': polygon.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/polygon/is_convex', methods=['POST'])
-def polygon_is_convex():
-    try:
-        data = request.json
-        points_data = data['points']
-        points = parse_points(points_data)
-        
-        polygon = Polygon(points)
-        is_convex = polygon.is_convex()
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'is_convex': is_convex,
-                'polygon': polygon.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/transform/translate', methods=['POST'])
-def transform_translate():
-    try:
-        data = request.json
-        points_data = data['points']
-        dx = float(data['dx'])
-        dy = float(data['dy'])
-        
-        points = parse_points(points_data)
-        transformed_points = Transformations.translate_shape(points, dx, dy)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'original_points': [p.to_dict() for p in points],
-                'transformed_points': [p.to_dict() for p in transformed_points],
-                'dx': dx,
-                'dy': dy
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/transform/rotate', methods=['POST'])
-def transform_rotate():
-    try:
-        data = request.json
-        points_data = data['points']
-        center_data = data['center']
-        angle = float(data['angle'])
-        
-        points = parse_points(points_data)
-        center = Point(center_data['x'], center_data['y'])
-        
-        transformed_points = Transformations.rotate_shape(points, center, angle)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'original_points': [p.to_dict() for p in points],
-                'transformed_points': [p.to_dict() for p in transformed_points],
-                'center': center.to_dict(),
-                'angle': angle
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/transform/reflect', methods=['POST'])
-def transform_reflect():
-    try:
-        data = request.json
-        points_data = data['points']
-        line_data = data['line']
-        
-        points = parse_points(points_data)
-        p1 = Point(line_data['point1']['x'], line_data['point1']['y'])
-        p2 = Point(line_data['point2']['x'], line_data['point2']['y'])
-        line = Line(p1, p2)
-        
-        transformed_points = Transformations.reflect_shape(points, line)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'original_points': [p.to_dict() for p in points],
-                'transformed_points': [p.to_dict() for p in transformed_points],
-                'line': line.to_dict()
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/transform/scale', methods=['POST'])
-def transform_scale():
-    try:
-        data = request.json
-        points_data = data['points']
-        center_data = data['center']
-        sx = float(data['sx'])
-        sy = float(data['sy'])
-        
-        points = parse_points(points_data)
-        center = Point(center_data['x'], center_data['y'])
-        
-        transformed_points = Transformations.scale_shape(points, center, sx, sy)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'original_points': [p.to_dict() for p in points],
-                'transformed_points': [p.to_dict() for p in transformed_points],
-                'center': center.to_dict(),
-                'sx': sx,
-                'sy': sy
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/engine/collinear', methods=['POST'])
-def engine_collinear():
-    try:
-        data = request.json
-        p1 = Point(data['point1']['x'], data['point1']['y'])
-        p2 = Point(data['point2']['x'], data['point2']['y'])
-        p3 = Point(data['point3']['x'], data['point3']['y'])
-        
-        is_collinear = GeometryEngine.are_collinear(p1, p2, p3)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'is_collinear': is_collinear,
-                'points': [p1.to_dict(), p2.to_dict(), p3.to_dict()]
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
-
-@app.route('/api/engine/convex_hull', methods=['POST'])
-def engine_convex_hull():
-    try:
-        data = request.json
-        points_data = data['points']
-        points = parse_points(points_data)
-        
-        hull_points = GeometryEngine.convex_hull(points)
-        
-        return jsonify({
-            'success': True,
-            'result': {
-                'original_points': [p.to_dict() for p in points],
-                'hull_points': [p.to_dict() for p in hull_points]
-            }
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 400
+    except Exception as e:
+        return error_response(e)
 
+# Development server with the debugger; serve production traffic with python -m geometry.serve
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
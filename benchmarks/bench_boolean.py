@@ -0,0 +1,87 @@
+"""Benchmark polygon intersection, union and difference as the polygons grow.
+
+Usage: python benchmarks/bench_boolean.py [--sizes 1000 10000 100000] [--waves 50] [--samples 1000]
+
+Both polygons are wavy circles of n vertices, r = 1000 (1 + 0.1 sin(waves * t)), the second
+one shifted and turned so the boundaries cross about 4 * waves times. The overlay is
+compared with what callers did before: estimating the overlap area by sampling
+contains_point on a grid of --samples points over the bounding box. Regular polygons
+show the convex-convex intersection path next to the general overlay.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry import overlay
+from geometry.models import Point, PointArray, Polygon
+
+def wavy(n, waves, cx=0.0, cy=0.0, phase=0.0):
+    angles = [2 * math.pi * i / n for i in range(n)]
+    radii = [1000 * (1 + 0.1 * math.sin(waves * t + phase)) for t in angles]
+    return Polygon(PointArray([cx + r * math.cos(t) for r, t in zip(radii, angles)],
+                              [cy + r * math.sin(t) for r, t in zip(radii, angles)]))
+
+def regular(n, cx=0.0):
+    return Polygon(PointArray([cx + 1000 * math.cos(2 * math.pi * i / n) for i in range(n)],
+                              [1000 * math.sin(2 * math.pi * i / n) for i in range(n)]))
+
+def sampled_overlap(first, second, samples):
+    """Area of the overlap estimated from a grid of contains_point tests"""
+    min_x, min_y, max_x, max_y = first.bounding_box()
+    side = max(1, int(math.sqrt(samples)))
+    hits = 0
+    for i in range(side):
+        for j in range(side):
+            point = Point(min_x + (i + 0.5) * (max_x - min_x) / side, min_y + (j + 0.5) * (max_y - min_y) / side)
+            hits += first.contains_point(point) and second.contains_point(point)
+    return hits / (side * side) * (max_x - min_x) * (max_y - min_y)
+
+def net_area(polygons):
+    return sum(polygon.coords.signed_area() for polygon in polygons)
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def coordinates(polygon):
+    coords = polygon.coords
+    return coords.to_list(coords.xs), coords.to_list(coords.ys)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--waves', type=int, default=50)
+    parser.add_argument('--samples', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'n':>8} {'operation':<13} {'time':>11} {'rings':>6} {'vertices':>9} {'area':>14}")
+    for n in args.sizes:
+        first = wavy(n, args.waves)
+        second = wavy(n, args.waves, 300.0, 100.0, phase=1.0)
+        for operation in overlay.BOOLEAN_OPERATIONS:
+            # Fresh polygons, so the simplicity checks are timed as well
+            elapsed, result = timed(lambda: Polygon(first.coords).boolean(Polygon(second.coords), operation))
+            print(f"{n:>8} {operation:<13} {elapsed * 1e3:>9.1f}ms {len(result):>6} "
+                  f"{sum(len(polygon.coords) for polygon in result):>9} {net_area(result):>14.1f}")
+        exact = net_area(first.intersection(second))
+        elapsed, estimate = timed(lambda: sampled_overlap(first, second, args.samples))
+        print(f"{n:>8} {'sampled':<13} {elapsed * 1e3:>9.1f}ms {'-':>6} {'-':>9} {estimate:>14.1f}"
+              f"  ({abs(estimate - exact) / exact:.2%} off)")
+
+    print()
+    print(f"{'n':>8} {'convex path':>12} {'overlay':>12} {'speedup':>8} {'match':>6}")
+    for n in args.sizes:
+        (ax, ay), (bx, by) = coordinates(regular(n)), coordinates(regular(n, 500.0))
+        fast, convex = timed(lambda: overlay.boolean(ax, ay, bx, by, 'intersection', convex=True))
+        slow, general = timed(lambda: overlay.boolean(ax, ay, bx, by, 'intersection'))
+        area = [sum(overlay._signed_area(ring) for ring in rings) for rings in (convex, general)]
+        print(f"{n:>8} {fast * 1e3:>10.1f}ms {slow * 1e3:>10.1f}ms {slow / fast:>7.1f}x "
+              f"{str(abs(area[0] - area[1]) <= 1e-6 * abs(area[1])):>6}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark GeometryEngine.min_enclosing_circle against trying every circumcircle.
+
+Usage: python benchmarks/bench_enclosing.py [--sizes 10 1000 100000 1000000] [--brute-force-max 30] [--repeat 3]
+
+The brute force baseline is how the smallest enclosing circle was found before:
+build the circle on every pair and every Triangle(...).circumcircle(), and keep
+the smallest one containing all points, O(n^4). It only runs up to
+--brute-force-max points. The 'with hull' column reuses a convex hull computed
+beforehand (its time is shown separately), so only hull vertices are searched.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry.models import Circle, GeometryEngine, Point, PointArray, Triangle
+from workloads import DISTRIBUTIONS
+
+def brute_force(points):
+    """Smallest of the pair and triangle circles that contains every point"""
+    candidates = [Circle(Point((a.x + b.x) / 2, (a.y + b.y) / 2), a.distance_to(b) / 2)
+                  for a, b in itertools.combinations(points, 2) if a.distance_to(b) > 0]
+    for a, b, c in itertools.combinations(points, 3):
+        if not GeometryEngine.are_collinear(a, b, c):
+            candidates.append(Triangle(a, b, c).circumcircle())
+    best = None
+    for circle in candidates:
+        if (best is None or circle.radius < best.radius) and \
+                all(circle.center.distance_to(p) <= circle.radius * (1 + 1e-9) for p in points):
+            best = circle
+    return best
+
+def best_of(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 100000, 1000000])
+    parser.add_argument('--brute-force-max', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'distribution':<12} {'n':>9} {'brute force':>12} {'welzl':>10} {'hull':>10} {'with hull':>10} "
+          f"{'radius':>12} {'match':>6}")
+    for name, generate in DISTRIBUTIONS.items():
+        for n in args.sizes:
+            coords = generate(n, rng)
+            array = PointArray([x for x, _ in coords], [y for _, y in coords])
+
+            welzl_time, circle = best_of(lambda: GeometryEngine.min_enclosing_circle(array), args.repeat)
+            hull_time, hull = best_of(lambda: GeometryEngine.convex_hull(array), args.repeat)
+            reuse_time, reused = best_of(lambda: GeometryEngine.min_enclosing_circle(array, hull), args.repeat)
+            match = abs(circle.radius - reused.radius) <= 1e-9 * circle.radius
+            brute_force_time = '-'
+            if n <= args.brute_force_max:
+                elapsed, expected = best_of(lambda: brute_force([Point(x, y) for x, y in coords]), 1)
+                brute_force_time = f"{elapsed * 1e3:.1f}ms"
+                match = match and abs(circle.radius - expected.radius) <= 1e-9 * expected.radius
+            print(f"{name:<12} {n:>9} {brute_force_time:>12} {welzl_time * 1e3:>8.1f}ms {hull_time * 1e3:>8.1f}ms "
+                  f"{reuse_time * 1e3:>8.1f}ms {circle.radius:>12.3f} {str(match):>6}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark the convex hull engine against the original atan2 Graham scan.
+
+Usage: python benchmarks/bench_hull.py [--sizes 1000 10000 100000] [--repeat 3]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry.models import Point, PointArray, GeometryEngine
+from workloads import DISTRIBUTIONS
+
+def legacy_graham_scan(points):
+    """The Graham scan GeometryEngine.convex_hull used before the hull engine, kept as a reference"""
+    if len(points) <= 2:
+        return points
+    pivot = min(points, key=lambda p: (p.y, p.x))
+
+    def polar_angle(p):
+        if p.x == pivot.x and p.y == pivot.y:
+            return -float('inf')
+        return math.atan2(p.y - pivot.y, p.x - pivot.x)
+
+    sorted_points = sorted(points, key=polar_angle)
+    hull = [sorted_points[0], sorted_points[1]]
+    for i in range(2, len(sorted_points)):
+        while len(hull) > 1:
+            p1, p2, p3 = hull[-2], hull[-1], sorted_points[i]
+            cross = (p2.x - p1.x) * (p3.y - p1.y) - (p2.y - p1.y) * (p3.x - p1.x)
+            if cross <= 0:
+                hull.pop()
+            else:
+                break
+        hull.append(sorted_points[i])
+    return hull
+
+def best_of(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'distribution':<12} {'n':>9} {'legacy':>10} {'monotone':>10} {'quickhull':>10} {'array':>10} {'h':>7} {'match':>6}")
+    for name, generate in DISTRIBUTIONS.items():
+        for n in args.sizes:
+            coords = generate(n, rng)
+            points = [Point(x, y) for x, y in coords]
+            array = PointArray([x for x, _ in coords], [y for _, y in coords])
+
+            legacy_time, legacy = best_of(lambda: legacy_graham_scan(points), args.repeat)
+            mono_time, mono = best_of(lambda: GeometryEngine.convex_hull(points), args.repeat)
+            quick_time, _ = best_of(lambda: GeometryEngine.convex_hull(points, 'quickhull'), args.repeat)
+            array_time, _ = best_of(lambda: GeometryEngine.convex_hull(array), args.repeat)
+
+            match = {(p.x, p.y) for p in legacy} == {(p.x, p.y) for p in mono}
+            print(f"{name:<12} {n:>9} {legacy_time * 1e3:>8.1f}ms {mono_time * 1e3:>8.1f}ms "
+                  f"{quick_time * 1e3:>8.1f}ms {array_time * 1e3:>8.1f}ms {len(mono):>7} {str(match):>6}")
+
+if __name__ == '__main__':
+    main()
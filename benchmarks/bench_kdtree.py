@@ -0,0 +1,92 @@
+"""Benchmark KD-tree nearest-neighbour, radius and closest-pair queries against brute force.
+
+Usage: python benchmarks/bench_kdtree.py [--sizes 1000 10000 100000] [--queries 1000] [--k 5]
+
+Brute force is what callers had to write with Point.distance_to alone: a loop over
+every point per query, and over every pair for the closest pair. It is skipped above
+--brute-limit points (--pair-limit for the closest pair, which is quadratic).
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry.models import Point, GeometryEngine
+from workloads import DISTRIBUTIONS, generate
+
+def brute_nearest(points, query, k):
+    distances = sorted((query.distance_to(point), i) for i, point in enumerate(points))
+    return [i for _, i in distances[:k]]
+
+def brute_within(points, query, radius):
+    return sorted(i for i, point in enumerate(points) if query.distance_to(point) <= radius)
+
+def brute_closest_pair(points):
+    best = math.inf
+    for i in range(len(points)):
+        for j in range(i + 1, len(points)):
+            best = min(best, points[i].distance_to(points[j]))
+    return best
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def row(label, n, fast, brute, match):
+    if brute is None:
+        print(f"{label:<14} {n:>8} {fast * 1e3:>10.1f}ms {'-':>12} {'-':>9} {'-':>6}")
+    else:
+        print(f"{label:<14} {n:>8} {fast * 1e3:>10.1f}ms {brute * 1e3:>10.1f}ms {brute / fast:>8.1f}x {str(match):>6}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--workload', choices=sorted(DISTRIBUTIONS), default='random')
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--brute-limit', type=int, default=100000)
+    parser.add_argument('--pair-limit', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'query':<14} {'n':>8} {'kd-tree':>12} {'brute':>12} {'speedup':>9} {'match':>6}")
+    for n in args.sizes:
+        points = [Point.from_floats(x, y) for x, y in generate(args.workload, n, args.seed)]
+        queries = [Point.from_floats(x, y) for x, y in generate(args.workload, args.queries, args.seed + 1)]
+        # A radius that holds about k points around a query at the average density
+        min_x, min_y = min(p.x for p in points), min(p.y for p in points)
+        max_x, max_y = max(p.x for p in points), max(p.y for p in points)
+        radius = math.sqrt(max((max_x - min_x) * (max_y - min_y), 1e-12) * args.k / (math.pi * n))
+        brute = n <= args.brute_limit
+
+        fast, found = timed(lambda: GeometryEngine.nearest_neighbors(points, queries, args.k))
+        if brute:
+            slow, expected = timed(lambda: [brute_nearest(points, q, args.k) for q in queries])
+            # Equal distances may be ordered differently, so compare the distances
+            match = all(abs(a[1] - points[i].distance_to(q)) < 1e-9
+                        for q, row_found, row_expected in zip(queries, found, expected)
+                        for a, i in zip(row_found, row_expected))
+            row(f'nearest k={args.k}', n, fast, slow, match)
+        else:
+            row(f'nearest k={args.k}', n, fast, None, None)
+
+        fast, found = timed(lambda: GeometryEngine.radius_query(points, queries, radius))
+        if brute:
+            slow, expected = timed(lambda: [brute_within(points, q, radius) for q in queries])
+            row('radius', n, fast, slow, [sorted(i for i, _ in f) for f in found] == expected)
+        else:
+            row('radius', n, fast, None, None)
+
+        fast, (_, _, distance) = timed(lambda: GeometryEngine.closest_pair(points))
+        if n <= args.pair_limit:
+            slow, expected = timed(lambda: brute_closest_pair(points))
+            row('closest pair', n, fast, slow, abs(distance - expected) < 1e-9)
+        else:
+            row('closest pair', n, fast, None, None)
+
+if __name__ == '__main__':
+    main()
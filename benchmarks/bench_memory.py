@@ -0,0 +1,83 @@
+"""Benchmark memory per shape for the slotted models against the original dict-backed ones.
+
+Usage: python benchmarks/bench_memory.py [--count 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry.models import Point, Line, Circle, Polygon, PointArray
+
+@dataclass
+class LegacyPoint:
+    """The dataclass Point the models used before slots, kept as a reference"""
+    x: float
+    y: float
+
+    def __post_init__(self):
+        self.x = float(self.x)
+        self.y = float(self.y)
+
+class LegacyLine:
+    """The dict-backed Line the models used before slots, kept as a reference"""
+    def __init__(self, point1, point2):
+        self.point1 = point1
+        self.point2 = point2
+        self.a = point2.y - point1.y
+        self.b = point1.x - point2.x
+        self.c = point2.x * point1.y - point1.x * point2.y
+
+class LegacyCircle:
+    def __init__(self, center, radius):
+        self.center = center
+        self.radius = float(radius)
+
+def measure(build):
+    """Bytes still allocated after build() returns, with the result kept alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    n = args.count
+    coords = [(rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)) for _ in range(n)]
+    xs, ys = [x for x, _ in coords], [y for _, y in coords]
+    points = [Point.from_floats(x, y) for x, y in coords]
+    legacy_points = [LegacyPoint(x, y) for x, y in coords]
+
+    # Per-shape cost excludes the list holding the shapes
+    container = measure(lambda: [None] * n)
+    rows = [
+        ('Point', 'legacy', measure(lambda: [LegacyPoint(x, y) for x, y in coords]) - container, n),
+        ('Point', 'slots', measure(lambda: [Point(x, y) for x, y in coords]) - container, n),
+        ('Point', 'from_floats', measure(lambda: [Point.from_floats(x, y) for x, y in coords]) - container, n),
+        ('Line', 'legacy', measure(lambda: [LegacyLine(legacy_points[i - 1], legacy_points[i])
+                                            for i in range(n)]) - container, n),
+        ('Line', 'slots', measure(lambda: [Line(points[i - 1], points[i]) for i in range(n)]) - container, n),
+        ('Circle', 'legacy', measure(lambda: [LegacyCircle(p, 1.0) for p in legacy_points]) - container, n),
+        ('Circle', 'slots', measure(lambda: [Circle(p, 1.0) for p in points]) - container, n),
+        ('Polygon vertex', 'point list', measure(lambda: Polygon([Point(x, y) for x, y in coords])), n),
+        ('Polygon vertex', 'PointArray', measure(lambda: Polygon(PointArray(xs, ys))), n),
+    ]
+
+    print(f"{'shape':<15} {'representation':<15} {'bytes/item':>11}")
+    for shape, representation, total, count in rows:
+        print(f"{shape:<15} {representation:<15} {total / count:>11.1f}")
+
+if __name__ == '__main__':
+    main()
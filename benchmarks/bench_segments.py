@@ -0,0 +1,80 @@
+"""Benchmark the Bentley-Ottmann segment sweep against brute-force pairwise tests.
+
+Usage: python benchmarks/bench_segments.py [--sizes 100 1000 10000] [--length 20] [--brute-limit 3000]
+
+Segments are scattered over a 1000 x 1000 square with random directions; --length sets
+their average length and so how many of them cross. Brute force is skipped above
+--brute-limit segments, where it takes minutes.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry.models import Point, Line, GeometryEngine, GeometryError
+
+def random_segments(n, length, rng):
+    segments = []
+    for _ in range(n):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        angle, size = rng.uniform(0, 2 * math.pi), rng.uniform(0.5, 1.5) * length
+        segments.append((Point(x, y), Point(x + size * math.cos(angle), y + size * math.sin(angle))))
+    return segments
+
+def legacy_pairwise(segments):
+    """What callers had to do before the sweep: intersect every pair of lines, then keep the
+    crossings inside both segments' bounding boxes (collinear overlaps are missed)"""
+    pairs = set()
+    lines = [Line(a, b) for a, b in segments]
+    for i in range(len(segments)):
+        for j in range(i + 1, len(segments)):
+            try:
+                point = lines[i].intersection_with(lines[j])
+            except GeometryError:
+                continue
+            if point is None:
+                continue
+            if all(min(a.x, b.x) - 1e-9 <= point.x <= max(a.x, b.x) + 1e-9 and
+                   min(a.y, b.y) - 1e-9 <= point.y <= max(a.y, b.y) + 1e-9
+                   for a, b in (segments[i], segments[j])):
+                pairs.add((i, j))
+    return pairs
+
+def sweep_pairs(segments):
+    intersections, _ = GeometryEngine.segment_intersections(segments)
+    pairs = set()
+    for _, ids in intersections:
+        pairs.update((i, j) for k, i in enumerate(ids) for j in ids[k + 1:])
+    return pairs
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--length', type=float, default=20.0)
+    parser.add_argument('--brute-limit', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'n':>8} {'k':>9} {'sweep':>10} {'pairwise':>10} {'speedup':>8} {'match':>6}")
+    for n in args.sizes:
+        segments = random_segments(n, args.length, rng)
+        sweep_time, found = timed(lambda: sweep_pairs(segments))
+        if n <= args.brute_limit:
+            brute_time, expected = timed(lambda: legacy_pairwise(segments))
+            print(f"{n:>8} {len(found):>9} {sweep_time * 1e3:>8.1f}ms {brute_time * 1e3:>8.1f}ms "
+                  f"{brute_time / sweep_time:>7.1f}x {str(found == expected):>6}")
+        else:
+            print(f"{n:>8} {len(found):>9} {sweep_time * 1e3:>8.1f}ms {'-':>10} {'-':>8} {'-':>6}")
+
+if __name__ == '__main__':
+    main()
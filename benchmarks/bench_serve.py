@@ -0,0 +1,129 @@
+"""Benchmark request throughput of the pre-fork server against the Flask development server.
+
+Usage: python benchmarks/bench_serve.py [--workers 4] [--clients 8] [--duration 10]
+
+Each server runs in its own process and is loaded by --clients client processes that
+send requests back to back on fresh connections. The development server is started
+the way app.py starts it (debugger on, reloader off so it stays one process).
+Requests repeat the same payload, so after the first one each server answers from
+its result cache; the numbers measure request handling more than geometry.
+"""
+import argparse
+import http.client
+import json
+import math
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def payloads(polygon_size):
+    line = {'point1': {'x': 0, 'y': 0}, 'point2': {'x': 4, 'y': 3}}
+    ring = [{'x': 100 * math.cos(2 * math.pi * i / polygon_size), 'y': 100 * math.sin(2 * math.pi * i / polygon_size)}
+            for i in range(polygon_size)]
+    return {
+        'line/equation': json.dumps(line),
+        f'polygon/area ({polygon_size} vertices)': json.dumps({'points': ring}),
+    }
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_for(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+def start_dev_server(port):
+    code = f"from app import app; app.run(host='127.0.0.1', port={port}, debug=True, use_reloader=False)"
+    return subprocess.Popen([sys.executable, '-c', code], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def start_prefork_server(port, workers):
+    command = [sys.executable, '-m', 'geometry.serve', '--host', '127.0.0.1', '--port', str(port),
+               '--workers', str(workers)]
+    return subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def client(port, path, body, duration, queue):
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            connection.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            if response.status != 200:
+                errors += 1
+                continue
+        except OSError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    queue.put((latencies, errors))
+
+def load(port, path, body, clients, duration):
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=client, args=(port, path, body, duration, queue))
+                 for _ in range(clients)]
+    for process in processes:
+        process.start()
+    latencies, errors = [], 0
+    for _ in processes:
+        samples, failed = queue.get()
+        latencies.extend(samples)
+        errors += failed
+    for process in processes:
+        process.join()
+    latencies.sort()
+    return {
+        'requests_per_second': len(latencies) / duration,
+        'p50_ms': statistics.median(latencies) * 1e3 if latencies else float('nan'),
+        'p99_ms': latencies[int(0.99 * (len(latencies) - 1))] * 1e3 if latencies else float('nan'),
+        'errors': errors
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of load per server and payload')
+    parser.add_argument('--polygon-size', type=int, default=2000)
+    args = parser.parse_args()
+
+    servers = {
+        'dev server': start_dev_server,
+        f'pre-fork x{args.workers}': lambda port: start_prefork_server(port, args.workers),
+    }
+    print(f"{'server':<16} {'payload':<30} {'req/s':>9} {'p50':>9} {'p99':>9} {'errors':>7}")
+    for server_name, start in servers.items():
+        port = free_port()
+        process = start(port)
+        try:
+            wait_for(port)
+            for payload_name, body in payloads(args.polygon_size).items():
+                path = '/api/' + payload_name.split(' ')[0]
+                result = load(port, path, body, args.clients, args.duration)
+                print(f"{server_name:<16} {payload_name:<30} {result['requests_per_second']:>9.1f} "
+                      f"{result['p50_ms']:>7.2f}ms {result['p99_ms']:>7.2f}ms {result['errors']:>7}")
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+
+if __name__ == '__main__':
+    main()
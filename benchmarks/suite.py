@@ -0,0 +1,810 @@
+"""Time every geometry.models method and every API route across workloads and input sizes.
+
+Usage: python benchmarks/suite.py [--sizes 10 100 1000 10000] [--workloads random circle]
+                                  [--filter REGEX] [--output results.json]
+                                  [--baseline benchmarks/baseline.json] [--threshold 0.25]
+                                  [--case-threshold 'POST /api/index/.*=0.5'] [--save-baseline]
+
+Model methods on fixed-size shapes (Line.slope, Triangle.area, ...) are timed over n
+shapes built from consecutive workload points; methods on point sets and polygons get
+all n points at once. Routes are called through the Flask test client with the result
+cache disabled; routes whose payload does not grow with the input are timed per request
+and recorded at size 1. Memoized methods are timed on freshly built shapes, so their
+numbers include construction (timed on its own as Class.__init__).
+
+Results are written as JSON. With a baseline, every (case, workload, size) slower than
+the baseline by more than its threshold is reported and the exit status is 1.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry.index import SpatialIndex
+from geometry.models import (
+    Point, PointArray, Line, Circle, Triangle, Polygon, AffineTransform, Transformations, GeometryEngine,
+    GeometryError
+)
+from geometry.hull import HULL_METHODS
+from geometry.prepared import PreparedPolygon
+from workloads import DISTRIBUTIONS, generate
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# Slowdowns below this many seconds are treated as noise whatever the ratio
+DEFAULT_MIN_DELTA = 5e-5
+
+# Classes whose public methods must all have a case
+MODEL_CLASSES = (Point, PointArray, Line, Circle, Triangle, Polygon, PreparedPolygon,
+                 AffineTransform, Transformations, GeometryEngine)
+
+class Bench(NamedTuple):
+    # Timed callable, and an untimed callable run before each call to reset state
+    run: Callable[[], Any]
+    setup: Optional[Callable[[], Any]] = None
+    # Size to record the result under; None records the requested input size
+    size: Optional[int] = None
+
+class Case(NamedTuple):
+    name: str
+    prepare: Callable[[List[Tuple[float, float]]], Bench]
+
+CASES: Dict[str, Case] = {}
+
+def case(*names: str):
+    """Register a function (coords, name) -> Bench as the case of each name"""
+    def decorator(func):
+        for name in names:
+            CASES[name] = Case(name, lambda coords, name=name: func(coords, name))
+        return func
+    return decorator
+
+def each(func: Callable[..., Any], items: List[tuple]) -> Bench:
+    """Call func(*args) for every item it accepts; degenerate items are left out up front"""
+    valid = []
+    for args in items:
+        try:
+            func(*args)
+        except (GeometryError, ZeroDivisionError, ValueError):
+            continue
+        valid.append(args)
+
+    def run():
+        for args in valid:
+            func(*args)
+    return Bench(run)
+
+def to_points(coords) -> List[Point]:
+    return [Point.from_floats(x, y) for x, y in coords]
+
+def to_array(coords) -> PointArray:
+    return PointArray([x for x, _ in coords], [y for _, y in coords])
+
+def pairs(points: List[Point]) -> List[Tuple[Point, Point]]:
+    return list(zip(points, points[1:] + points[:1]))
+
+def triples(points: List[Point]) -> List[Tuple[Point, Point, Point]]:
+    return list(zip(points, points[1:] + points[:1], points[2:] + points[:2]))
+
+def method_name(name: str) -> str:
+    return name.split('.', 1)[1].split('[')[0]
+
+def member(obj, name: str):
+    """Call a method, or read a (memoized) property, of obj"""
+    value = getattr(obj, name)
+    return value() if callable(value) else value
+
+# Model cases
+@case('Point.__init__')
+def _(coords, name):
+    return each(Point, coords)
+
+@case('Point.from_floats')
+def _(coords, name):
+    return each(Point.from_floats, coords)
+
+@case('Point.distance_to', 'Point.midpoint')
+def _(coords, name):
+    method = method_name(name)
+    return each(lambda a, b: getattr(a, method)(b), pairs(to_points(coords)))
+
+@case('Point.section_formula')
+def _(coords, name):
+    return each(lambda a, b: a.section_formula(b, 2.0), pairs(to_points(coords)))
+
+@case('Point.to_dict')
+def _(coords, name):
+    return each(Point.to_dict, [(p,) for p in to_points(coords)])
+
+@case('PointArray.__init__')
+def _(coords, name):
+    xs, ys = [x for x, _ in coords], [y for _, y in coords]
+    return Bench(lambda: PointArray(xs, ys))
+
+@case('PointArray.from_points')
+def _(coords, name):
+    points = to_points(coords)
+    return Bench(lambda: PointArray.from_points(points))
+
+@case('PointArray.from_dicts')
+def _(coords, name):
+    dicts = [{'x': x, 'y': y} for x, y in coords]
+    return Bench(lambda: PointArray.from_dicts(dicts))
+
+@case('PointArray.to_list')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: PointArray.to_list(array.xs))
+
+@case('PointArray.to_points', 'PointArray.to_dicts', 'PointArray.bounding_box', 'PointArray.signed_area',
+      'PointArray.ring_perimeter', 'PointArray.ring_centroid', 'PointArray.turn_crosses',
+      'PointArray.has_repeated_vertex')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(getattr(array, method_name(name)))
+
+@case('PointArray.take')
+def _(coords, name):
+    array = to_array(coords)
+    indices = list(range(0, len(array), 2))
+    return Bench(lambda: array.take(indices))
+
+@case('PointArray.distance_to')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: array.distance_to(Point(1.0, 2.0)))
+
+@case('PointArray.distances', 'PointArray.midpoints')
+def _(coords, name):
+    array, other = to_array(coords), to_array(coords[1:] + coords[:1])
+    method = getattr(array, method_name(name))
+    return Bench(lambda: method(other))
+
+@case('PointArray.section')
+def _(coords, name):
+    array, other = to_array(coords), to_array(coords[1:] + coords[:1])
+    return Bench(lambda: array.section(other, 2.0))
+
+@case('PointArray.translate')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: array.translate(3.0, -4.0))
+
+@case('PointArray.rotate')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: array.rotate(Point(1.0, 1.0), 30.0))
+
+@case('PointArray.scale')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: array.scale(Point(1.0, 1.0), 2.0, 0.5))
+
+@case('PointArray.reflect')
+def _(coords, name):
+    array = to_array(coords)
+    line = Line(Point(0.0, 1.0), Point(2.0, 3.0))
+    return Bench(lambda: array.reflect(line))
+
+@case('PointArray.transform')
+def _(coords, name):
+    array = to_array(coords)
+    transform = AffineTransform.rotation(Point(1.0, 1.0), 30.0).then(AffineTransform.translation(3.0, -4.0))
+    return Bench(lambda: array.transform(transform))
+
+@case('Line.__init__')
+def _(coords, name):
+    return each(Line, pairs(to_points(coords)))
+
+@case('Line.slope', 'Line.equation', 'Line.length', 'Line.bounding_box', 'Line.to_dict')
+def _(coords, name):
+    method = method_name(name)
+    return each(lambda a, b: getattr(Line(a, b), method)(), pairs(to_points(coords)))
+
+@case('Line.is_parallel', 'Line.is_perpendicular', 'Line.angle_with', 'Line.intersection_with')
+def _(coords, name):
+    method = method_name(name)
+    return each(lambda a, b, c: getattr(Line(a, b), method)(Line(b, c)), triples(to_points(coords)))
+
+@case('Line.point_on_line')
+def _(coords, name):
+    return each(lambda a, b, c: Line(a, b).point_on_line(c), triples(to_points(coords)))
+
+def circles(points: List[Point]) -> List[Tuple[Point, float]]:
+    # Radius from the distance to the next point, so circles overlap their neighbours
+    return [(a, a.distance_to(b) or 1.0) for a, b in pairs(points)]
+
+@case('Circle.__init__')
+def _(coords, name):
+    return each(Circle, circles(to_points(coords)))
+
+@case('Circle.equation', 'Circle.area', 'Circle.circumference', 'Circle.bounding_box', 'Circle.to_dict')
+def _(coords, name):
+    method = method_name(name)
+    return each(lambda center, radius: getattr(Circle(center, radius), method)(), circles(to_points(coords)))
+
+@case('Circle.contains_point', 'Circle.tangent_lines')
+def _(coords, name):
+    method = method_name(name)
+    points = to_points(coords)
+    items = [(center, radius / 2, point) for (center, radius), point in zip(circles(points), points[1:] + points[:1])]
+    return each(lambda center, radius, point: getattr(Circle(center, radius), method)(point), items)
+
+@case('Circle.intersection_with_line')
+def _(coords, name):
+    points = to_points(coords)
+    items = [(center, radius, b, c) for (center, radius), (_, b, c) in zip(circles(points), triples(points))]
+    return each(lambda center, radius, b, c: Circle(center, radius).intersection_with_line(Line(b, c)), items)
+
+@case('Circle.intersection_with_circle')
+def _(coords, name):
+    items = circles(to_points(coords))
+    items = [first + second for first, second in zip(items, items[1:] + items[:1])]
+    return each(lambda c1, r1, c2, r2: Circle(c1, r1).intersection_with_circle(Circle(c2, r2)), items)
+
+@case('Triangle.__init__')
+def _(coords, name):
+    return each(Triangle, triples(to_points(coords)))
+
+@case('Triangle.sides', 'Triangle.area', 'Triangle.perimeter', 'Triangle.centroid', 'Triangle.orthocenter',
+      'Triangle.circumcenter', 'Triangle.incenter', 'Triangle.circumcircle', 'Triangle.incircle',
+      'Triangle.bounding_box', 'Triangle.to_dict')
+def _(coords, name):
+    method = method_name(name)
+    return each(lambda a, b, c: member(Triangle(a, b, c), method), triples(to_points(coords)))
+
+@case('Triangle.contains_point')
+def _(coords, name):
+    points = to_points(coords)
+    items = [triple + (point,) for triple, point in zip(triples(points), points[3:] + points[:3])]
+    return each(lambda a, b, c, point: Triangle(a, b, c).contains_point(point), items)
+
+@case('Polygon.__init__')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: Polygon(array))
+
+@case('Polygon.points', 'Polygon.sides', 'Polygon.area', 'Polygon.perimeter', 'Polygon.centroid',
+      'Polygon.is_convex', 'Polygon.prepare', 'Polygon.bounding_box', 'Polygon.to_dict')
+def _(coords, name):
+    array, method = to_array(coords), method_name(name)
+    return Bench(lambda: member(Polygon(array), method))
+
+def star_ring(coords) -> PointArray:
+    # The points in angular order around their centroid: a simple ring for most workloads,
+    # so the simplicity test sweeps all of it instead of stopping at an early crossing
+    # Repeated points would become consecutive vertices, which a polygon rejects
+    points = to_points(dict.fromkeys((x, y) for x, y in coords))
+    cx, cy = sum(p.x for p in points) / len(points), sum(p.y for p in points) / len(points)
+    points.sort(key=lambda p: (math.atan2(p.y - cy, p.x - cx), math.hypot(p.x - cx, p.y - cy)))
+    return PointArray.from_points(points)
+
+@case('Polygon.is_simple', 'Polygon.self_intersections', 'Polygon.triangulate')
+def _(coords, name):
+    array, method = star_ring(coords), method_name(name)
+    return Bench(lambda: member(Polygon(array), method))
+
+def overlapping_rings(coords) -> Tuple[PointArray, PointArray]:
+    # A star ring and a copy stretched along x and squashed along y around the same center.
+    # Both are star-shaped around it, so their boundaries cross at most once per wedge
+    # between vertex directions instead of every spike crossing every other.
+    first = star_ring(coords)
+    xs, ys = first.to_list(first.xs), first.to_list(first.ys)
+    center = Point(sum(xs) / len(xs), sum(ys) / len(ys))
+    return first, first.transform(AffineTransform.scaling(center, 1.2, 0.8))
+
+@case('Polygon.boolean', 'Polygon.intersection', 'Polygon.union', 'Polygon.difference')
+def _(coords, name):
+    (first, second), method = overlapping_rings(coords), method_name(name)
+    args = (Polygon(second), 'union') if method == 'boolean' else (Polygon(second),)
+    return Bench(lambda: getattr(Polygon(first), method)(*args))
+
+@case('Polygon.contains_point')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: Polygon(array).contains_point(Point(0.5, 0.5)))
+
+@case('PreparedPolygon.__init__')
+def _(coords, name):
+    polygon = Polygon(to_array(coords))
+    return Bench(lambda: PreparedPolygon(polygon))
+
+@case('PreparedPolygon.contains_point', 'PreparedPolygon.contains_points')
+def _(coords, name):
+    prepared = Polygon(to_array(coords)).prepare()
+    points = to_points(coords)
+    # Probe points halfway between consecutive vertices, a mix of inside and outside
+    probes = [a.midpoint(b) for a, b in zip(points, points[len(points) // 2:] + points)]
+    if name.endswith('contains_points'):
+        array = PointArray.from_points(probes)
+        return Bench(lambda: prepared.contains_points(array))
+    return each(prepared.contains_point, [(probe,) for probe in probes])
+
+@case('AffineTransform.__init__')
+def _(coords, name):
+    return each(lambda x, y: AffineTransform(1.0, 0.0, x, 0.0, 1.0, y), coords)
+
+@case('AffineTransform.identity', 'AffineTransform.reflection_x', 'AffineTransform.reflection_y')
+def _(coords, name):
+    return each(getattr(AffineTransform, method_name(name)), [()] * len(coords))
+
+@case('AffineTransform.translation')
+def _(coords, name):
+    return each(AffineTransform.translation, coords)
+
+@case('AffineTransform.rotation')
+def _(coords, name):
+    return each(lambda point: AffineTransform.rotation(point, 30.0), [(p,) for p in to_points(coords)])
+
+@case('AffineTransform.scaling')
+def _(coords, name):
+    return each(lambda point: AffineTransform.scaling(point, 2.0, 0.5), [(p,) for p in to_points(coords)])
+
+@case('AffineTransform.reflection')
+def _(coords, name):
+    return each(lambda a, b: AffineTransform.reflection(Line(a, b)), pairs(to_points(coords)))
+
+@case('AffineTransform.compose')
+def _(coords, name):
+    transforms = [AffineTransform.translation(x, y) for x, y in coords]
+    return Bench(lambda: AffineTransform.compose(transforms))
+
+@case('AffineTransform.coefficients', 'AffineTransform.matrix', 'AffineTransform.to_dict')
+def _(coords, name):
+    method = method_name(name)
+    transforms = [(AffineTransform.translation(x, y),) for x, y in coords]
+    return each(lambda transform: getattr(transform, method)(), transforms)
+
+@case('AffineTransform.then')
+def _(coords, name):
+    transforms = [AffineTransform.translation(x, y) for x, y in coords]
+    return each(AffineTransform.then, list(zip(transforms, transforms[1:] + transforms[:1])))
+
+@case('AffineTransform.apply')
+def _(coords, name):
+    transform = AffineTransform.rotation(Point(1.0, 1.0), 30.0)
+    return each(transform.apply, [(p,) for p in to_points(coords)])
+
+@case('AffineTransform.apply_shape')
+def _(coords, name):
+    transform, array = AffineTransform.rotation(Point(1.0, 1.0), 30.0), to_array(coords)
+    return Bench(lambda: transform.apply_shape(array))
+
+POINT_TRANSFORMS = {
+    'translate': (3.0, -4.0),
+    'rotate': (Point(1.0, 1.0), 30.0),
+    'reflect_over_x': (),
+    'reflect_over_y': (),
+    'reflect_over_line': (Line(Point(0.0, 1.0), Point(2.0, 3.0)),),
+    'scale': (Point(1.0, 1.0), 2.0, 0.5),
+}
+
+@case(*(f'Transformations.{method}' for method in POINT_TRANSFORMS))
+def _(coords, name):
+    method = method_name(name)
+    func, extra = getattr(Transformations, method), POINT_TRANSFORMS[method]
+    return each(lambda point: func(point, *extra), [(p,) for p in to_points(coords)])
+
+@case('Transformations.translate_shape', 'Transformations.rotate_shape', 'Transformations.reflect_shape',
+      'Transformations.scale_shape')
+def _(coords, name):
+    method = method_name(name)
+    func = getattr(Transformations, method)
+    extra = POINT_TRANSFORMS['reflect_over_line' if method == 'reflect_shape' else method[:-len('_shape')]]
+    array = to_array(coords)
+    return Bench(lambda: func(array, *extra))
+
+@case('GeometryEngine.are_collinear', 'GeometryEngine.create_triangle')
+def _(coords, name):
+    return each(getattr(GeometryEngine, method_name(name)), triples(to_points(coords)))
+
+@case('GeometryEngine.distance_point_to_line')
+def _(coords, name):
+    return each(lambda a, b, c: GeometryEngine.distance_point_to_line(c, Line(a, b)), triples(to_points(coords)))
+
+@case('GeometryEngine.angle_between_lines')
+def _(coords, name):
+    return each(lambda a, b, c: GeometryEngine.angle_between_lines(Line(a, b), Line(b, c)),
+                triples(to_points(coords)))
+
+@case('GeometryEngine.is_point_inside_polygon')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: GeometryEngine.is_point_inside_polygon(Point(0.5, 0.5), Polygon(array)))
+
+@case(*(f'GeometryEngine.convex_hull[{method}]' for method in HULL_METHODS))
+def _(coords, name):
+    array, method = to_array(coords), name[name.index('[') + 1:-1]
+    return Bench(lambda: GeometryEngine.convex_hull(array, method))
+
+@case('GeometryEngine.create_point')
+def _(coords, name):
+    return each(GeometryEngine.create_point, coords)
+
+@case('GeometryEngine.create_line')
+def _(coords, name):
+    return each(GeometryEngine.create_line, pairs(to_points(coords)))
+
+@case('GeometryEngine.create_circle')
+def _(coords, name):
+    return each(GeometryEngine.create_circle, circles(to_points(coords)))
+
+@case('GeometryEngine.create_polygon')
+def _(coords, name):
+    points = to_points(coords)
+    return Bench(lambda: GeometryEngine.create_polygon(points))
+
+def segments(points: List[Point]) -> List[Tuple[Point, Point]]:
+    # Disjoint consecutive pairs, so n points give n / 2 segments
+    return list(zip(points[0::2], points[1::2]))
+
+@case('GeometryEngine.segment_intersections')
+def _(coords, name):
+    items = segments(to_points(coords))
+    return Bench(lambda: GeometryEngine.segment_intersections(items))
+
+def probe_radius(coords) -> float:
+    # Distance from the first point to its fifth nearest, so a query matches a handful of points
+    x0, y0 = coords[0]
+    distances = sorted(math.hypot(x - x0, y - y0) for x, y in coords)
+    return distances[min(5, len(distances) - 1)]
+
+@case('GeometryEngine.nearest_neighbors', 'GeometryEngine.radius_query')
+def _(coords, name):
+    # Every point is also a query, in reverse order
+    array, queries = to_array(coords), to_array(coords[::-1])
+    if name.endswith('nearest_neighbors'):
+        return Bench(lambda: GeometryEngine.nearest_neighbors(array, queries, 5))
+    radius = probe_radius(coords)
+    return Bench(lambda: GeometryEngine.radius_query(array, queries, radius))
+
+@case('GeometryEngine.closest_pair')
+def _(coords, name):
+    array = to_array(coords)
+    return Bench(lambda: GeometryEngine.closest_pair(array))
+
+@case('GeometryEngine.delaunay', 'GeometryEngine.voronoi', 'GeometryEngine.min_enclosing_circle')
+def _(coords, name):
+    array, method = to_array(coords), method_name(name)
+    return Bench(lambda: getattr(GeometryEngine, method)(array))
+
+# Route cases
+def client():
+    from app import app
+    return app.test_client()
+
+def point_dicts(coords) -> List[dict]:
+    return [{'x': x, 'y': y} for x, y in coords]
+
+def post(path: str, payload, setup=None, size=None) -> Bench:
+    http = client()
+    body = json.dumps(payload)
+
+    def run():
+        response = http.post(path, data=body, content_type='application/json')
+        if response.status_code != 200:
+            raise GeometryError(f"{path} answered {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return Bench(run, setup, size)
+
+def fixed_payload(coords) -> Dict[str, Any]:
+    # Values for the fields of operations that take a fixed number of shapes
+    (x1, y1), (x2, y2), (x3, y3) = (coords * 3)[:3]
+    p1, p2, p3 = {'x': x1, 'y': y1}, {'x': x2 + 1.0, 'y': y2}, {'x': x3, 'y': y3 + 2.0}
+    return {
+        'point': p1, 'point1': p1, 'point2': p2, 'point3': p3, 'center': p1,
+        'ratio': 2.0, 'radius': 5.0, 'dx': 3.0, 'dy': -4.0, 'angle': 30.0, 'sx': 2.0, 'sy': 0.5,
+        'line': {'point1': p1, 'point2': p2}, 'line1': {'point1': p1, 'point2': p2},
+        'line2': {'point1': p2, 'point2': p3}, 'circle': {'center': p1, 'radius': 5.0},
+    }
+
+FIXED_ROUTES = ('point/distance', 'point/midpoint', 'point/section', 'line/create', 'line/slope',
+                'line/equation', 'line/parallel', 'line/perpendicular', 'line/angle', 'line/intersection',
+                'circle/create', 'circle/area', 'circle/circumference', 'circle/contains',
+                'circle/line_intersection', 'triangle/create', 'triangle/area', 'triangle/centroid',
+                'triangle/orthocenter', 'triangle/circumcenter', 'engine/collinear')
+
+@case(*(f'POST /api/{name}' for name in FIXED_ROUTES))
+def _(coords, name):
+    operation = name[len('POST /api/'):]
+    from geometry.operations import OPERATIONS
+    payload = {key: value for key, value in fixed_payload(coords).items() if key in OPERATIONS[operation].schema}
+    return post(name[len('POST '):], payload, size=1)
+
+@case('POST /api/polygon/create', 'POST /api/polygon/area', 'POST /api/polygon/perimeter',
+      'POST /api/polygon/centroid', 'POST /api/polygon/is_convex', 'POST /api/engine/convex_hull',
+      'POST /api/transform/translate', 'POST /api/transform/rotate', 'POST /api/transform/reflect',
+      'POST /api/transform/scale')
+def _(coords, name):
+    payload = fixed_payload(coords)
+    payload['points'] = point_dicts(coords)
+    return post(name[len('POST '):], payload)
+
+@case('POST /api/engine/segment_intersections')
+def _(coords, name):
+    points = point_dicts(coords)
+    items = [{'point1': a, 'point2': b} for a, b in zip(points[0::2], points[1::2])]
+    return post('/api/engine/segment_intersections', {'segments': items})
+
+@case('POST /api/polygon/is_simple', 'POST /api/polygon/triangulate')
+def _(coords, name):
+    return post(name[len('POST '):], {'points': star_ring(coords).to_dicts()})
+
+@case('POST /api/polygon/boolean')
+def _(coords, name):
+    first, second = overlapping_rings(coords)
+    return post('/api/polygon/boolean', {'polygon1': first.to_dicts(), 'polygon2': second.to_dicts(),
+                                         'operation': 'union'})
+
+@case('POST /api/engine/delaunay', 'POST /api/engine/voronoi', 'POST /api/engine/min_enclosing_circle')
+def _(coords, name):
+    return post(name[len('POST '):], {'points': point_dicts(coords)})
+
+@case('POST /api/engine/nearest', 'POST /api/engine/radius_query', 'POST /api/engine/closest_pair')
+def _(coords, name):
+    points = point_dicts(coords)
+    payloads = {
+        'POST /api/engine/nearest': {'points': points, 'queries': points[::-1], 'k': 5},
+        'POST /api/engine/radius_query': {'points': points, 'queries': points[::-1], 'radius': probe_radius(coords)},
+        'POST /api/engine/closest_pair': {'points': points}
+    }
+    return post(name[len('POST '):], payloads[name])
+
+@case('POST /api/polygon/contains_points')
+def _(coords, name):
+    points = point_dicts(coords)
+    return post('/api/polygon/contains_points', {'points': points, 'test_points': points[::-1]})
+
+@case('POST /api/transform/pipeline')
+def _(coords, name):
+    steps = [
+        {'type': 'translate', 'dx': 3.0, 'dy': -4.0},
+        {'type': 'rotate', 'center': {'x': 1.0, 'y': 1.0}, 'angle': 30.0},
+        {'type': 'scale', 'center': {'x': 0.0, 'y': 0.0}, 'sx': 2.0, 'sy': 0.5},
+    ]
+    return post('/api/transform/pipeline', {'points': point_dicts(coords), 'steps': steps})
+
+def indexed_circles(coords) -> List[dict]:
+    return [{'id': i, 'type': 'circle', 'center': {'x': x, 'y': y}, 'radius': 5.0} for i, (x, y) in enumerate(coords)]
+
+def load_index(coords):
+    # Build the benchmark index directly, outside the timed request
+    from geometry.operations import INDEXES, parse_shape
+    shapes = [(shape['id'], parse_shape(shape)) for shape in indexed_circles(coords)]
+    INDEXES['bench'] = SpatialIndex.bulk_load(shapes)
+
+@case('POST /api/index/build')
+def _(coords, name):
+    return post('/api/index/build', {'name': 'bench', 'shapes': indexed_circles(coords)})
+
+@case('POST /api/index/insert')
+def _(coords, name):
+    half = len(coords) // 2
+    shapes = indexed_circles(coords)[half:]
+    return post('/api/index/insert', {'name': 'bench', 'shapes': shapes}, setup=lambda: load_index(coords[:half]))
+
+@case('POST /api/index/delete')
+def _(coords, name):
+    ids = list(range(0, len(coords), 2))
+    return post('/api/index/delete', {'name': 'bench', 'ids': ids}, setup=lambda: load_index(coords))
+
+@case('POST /api/index/query_point', 'POST /api/index/query_window', 'POST /api/index/nearest')
+def _(coords, name):
+    load_index(coords)
+    x, y = coords[0]
+    payload = {
+        'name': 'bench', 'point': {'x': x, 'y': y}, 'k': 5,
+        'window': {'min_x': x - 50, 'min_y': y - 50, 'max_x': x + 50, 'max_y': y + 50},
+    }
+    return post(name[len('POST '):], payload)
+
+@case('POST /api/batch')
+def _(coords, name):
+    from geometry.operations import MAX_BATCH_SIZE
+    points = point_dicts(coords[:MAX_BATCH_SIZE + 1])
+    operations = [{'op': 'point/distance', 'args': {'point1': a, 'point2': b}}
+                  for a, b in zip(points, points[1:] + points[:1])][:MAX_BATCH_SIZE]
+    return post('/api/batch', {'operations': operations}, size=min(len(coords), MAX_BATCH_SIZE))
+
+def post_stream(path: str, lines: List[str]) -> Bench:
+    http = client()
+    body = '\n'.join(lines).encode()
+
+    def run():
+        response = http.post(path, data=body, content_type='application/x-ndjson')
+        response.get_data()
+        if response.status_code != 200:
+            raise GeometryError(f"{path} answered {response.status_code}")
+    return Bench(run)
+
+@case('POST /api/stream/polygon/measures')
+def _(coords, name):
+    return post_stream('/api/stream/polygon/measures', [json.dumps(p) for p in point_dicts(coords)])
+
+@case('POST /api/stream/transform')
+def _(coords, name):
+    header = json.dumps({'steps': [{'type': 'rotate', 'center': {'x': 1.0, 'y': 1.0}, 'angle': 30.0}]})
+    return post_stream('/api/stream/transform', [header] + [json.dumps(p) for p in point_dicts(coords)])
+
+@case('GET /', 'GET /report', 'GET /api/cache/stats', 'GET /metrics')
+def _(coords, name):
+    http, path = client(), name[len('GET '):]
+
+    def run():
+        response = http.get(path)
+        if response.status_code != 200:
+            raise GeometryError(f"{path} answered {response.status_code}")
+    return Bench(run, size=1)
+
+def uncovered() -> List[str]:
+    """Public model methods and app routes that have no case"""
+    missing = []
+    for cls in MODEL_CLASSES:
+        for attribute, value in vars(cls).items():
+            if (attribute.startswith('_') and attribute != '__init__') or not callable(
+                    getattr(value, '__func__', value)) or isinstance(value, property):
+                continue
+            if attribute == '__init__' and cls in (Transformations, GeometryEngine):
+                continue
+            name = f'{cls.__name__}.{attribute}'
+            if name not in CASES and not any(key.startswith(name + '[') for key in CASES):
+                missing.append(name)
+    from app import app
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == 'static' or '<' in rule.rule:
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if f'{method} {rule.rule}' not in CASES:
+                missing.append(f'{method} {rule.rule}')
+    return missing
+
+def measure(bench: Bench, repeat: int, min_time: float) -> Tuple[float, float, int]:
+    """Best and median seconds per call, over at least repeat calls and min_time seconds"""
+    samples = []
+    spent = 0.0
+    while len(samples) < repeat or (spent < min_time and len(samples) < 1000):
+        if bench.setup is not None:
+            bench.setup()
+        start = time.perf_counter()
+        bench.run()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        spent += elapsed
+    return min(samples), statistics.median(samples), len(samples)
+
+def run_suite(sizes: List[int], workloads: List[str], pattern: Optional[str], repeat: int,
+              min_time: float, seed: int, log=print) -> List[dict]:
+    from geometry.operations import RESULT_CACHE
+    # Time the computation, not cache lookups
+    RESULT_CACHE.max_entries = 0
+    RESULT_CACHE.clear()
+
+    selected = [c for c in CASES.values() if pattern is None or re.search(pattern, c.name)]
+    results = []
+    for workload in workloads:
+        for n in sizes:
+            coords = generate(workload, n, seed)
+            recorded = set()
+            for bench_case in selected:
+                try:
+                    bench = bench_case.prepare(coords)
+                    size = n if bench.size is None else bench.size
+                    if (bench_case.name, size) in recorded:
+                        continue  # Size-independent case, already timed for this workload
+                    recorded.add((bench_case.name, size))
+                    best, median, runs = measure(bench, repeat, min_time)
+                except Exception as e:
+                    results.append({'case': bench_case.name, 'workload': workload, 'size': n,
+                                    'error': f'{type(e).__name__}: {e}'})
+                    log(f"{bench_case.name:<48} {workload:<10} {n:>8}  error: {e}")
+                    continue
+                results.append({'case': bench_case.name, 'workload': workload, 'size': size,
+                                'seconds': best, 'median': median, 'runs': runs})
+                log(f"{bench_case.name:<48} {workload:<10} {size:>8} {best * 1e3:>11.3f}ms {median * 1e3:>11.3f}ms")
+    return results
+
+def environment() -> dict:
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'numpy': numpy_version,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+def parse_case_thresholds(values: List[str]) -> List[Tuple[re.Pattern, float]]:
+    thresholds = []
+    for value in values:
+        pattern, _, threshold = value.rpartition('=')
+        if not pattern:
+            raise argparse.ArgumentTypeError(f"Expected PATTERN=THRESHOLD, got {value!r}")
+        thresholds.append((re.compile(pattern), float(threshold)))
+    return thresholds
+
+def compare(results: List[dict], baseline: List[dict], threshold: float,
+            case_thresholds: List[Tuple[re.Pattern, float]] = (), min_delta: float = DEFAULT_MIN_DELTA) -> List[dict]:
+    """Entries slower than the baseline by more than their threshold (a fraction, 0.25 = 25%)"""
+    reference = {(r['case'], r['workload'], r['size']): r['seconds'] for r in baseline if 'seconds' in r}
+    regressions = []
+    for result in results:
+        key = (result['case'], result['workload'], result['size'])
+        if 'seconds' not in result or key not in reference:
+            continue
+        limit = threshold
+        for pattern, value in case_thresholds:
+            if pattern.search(result['case']):
+                limit = value
+        before, after = reference[key], result['seconds']
+        if after > before * (1 + limit) and after - before > min_delta:
+            regressions.append(dict(result, baseline=before, ratio=after / before if before else math.inf,
+                                    threshold=limit))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--workloads', nargs='+', choices=sorted(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    parser.add_argument('--filter', help='only run cases whose name matches this regular expression')
+    parser.add_argument('--repeat', type=int, default=5, help='minimum number of timed calls per entry')
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimum seconds spent timing each entry')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='results file to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown, as a fraction')
+    parser.add_argument('--case-threshold', action='append', default=[], metavar='PATTERN=THRESHOLD',
+                        help='allowed slowdown for cases matching PATTERN (repeatable, last match wins)')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help='ignore slowdowns smaller than this many seconds')
+    parser.add_argument('--list', action='store_true', help='list the cases and anything not covered, then exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name in CASES:
+            print(name)
+        for name in uncovered():
+            print(f'not covered: {name}')
+        return 0
+
+    case_thresholds = parse_case_thresholds(args.case_threshold)
+    print(f"{'case':<48} {'workload':<10} {'n':>8} {'best':>13} {'median':>13}")
+    results = run_suite(args.sizes, args.workloads, args.filter, args.repeat, args.min_time, args.seed)
+    report = {'environment': environment(), 'sizes': args.sizes, 'seed': args.seed, 'results': results}
+
+    for name in uncovered():
+        print(f'warning: no benchmark case for {name}', file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=1)
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --save-baseline to create one')
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline['results'], args.threshold, case_thresholds, args.min_delta)
+    for r in regressions:
+        print(f"REGRESSION {r['case']} {r['workload']} n={r['size']}: {r['baseline'] * 1e3:.3f}ms -> "
+              f"{r['seconds'] * 1e3:.3f}ms ({r['ratio']:.2f}x, threshold {1 + r['threshold']:.2f}x)")
+    print(f'{len(regressions)} regression(s) against {args.baseline}')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
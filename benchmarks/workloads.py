@@ -0,0 +1,49 @@
+"""Synthetic point sets shared by the benchmark scripts.
+
+Every generator takes (n, rng) and returns n (x, y) tuples.
+"""
+import math
+import random
+from typing import Callable, Dict, List, Tuple
+
+Coords = List[Tuple[float, float]]
+
+def uniform(n: int, rng: random.Random) -> Coords:
+    """Points spread uniformly over a 2000 x 2000 square"""
+    return [(rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)) for _ in range(n)]
+
+def clustered(n: int, rng: random.Random) -> Coords:
+    """Points in a handful of tight Gaussian clusters"""
+    centers = [(rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)) for _ in range(8)]
+    coords = []
+    for _ in range(n):
+        cx, cy = rng.choice(centers)
+        coords.append((rng.gauss(cx, 25), rng.gauss(cy, 25)))
+    return coords
+
+def circle_boundary(n: int, rng: random.Random) -> Coords:
+    """Points on a circle of radius 1000, in angular order so they also form a convex ring"""
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(n))
+    return [(1000 * math.cos(t), 1000 * math.sin(t)) for t in angles]
+
+def collinear(n: int, rng: random.Random) -> Coords:
+    """Degenerate input: points on the line y = x / 2 + 3, a quarter of them repeated"""
+    coords = []
+    for i in range(n):
+        if i % 4 == 3:
+            coords.append(coords[rng.randrange(i)])
+        else:
+            x = float(rng.randint(-1000, 1000))
+            coords.append((x, x / 2 + 3))
+    return coords
+
+DISTRIBUTIONS: Dict[str, Callable[[int, random.Random], Coords]] = {
+    'random': uniform,
+    'clustered': clustered,
+    'circle': circle_boundary,
+    'collinear': collinear,
+}
+
+def generate(name: str, n: int, seed: int = 0) -> Coords:
+    """The named workload at size n; the same seed always gives the same points"""
+    return DISTRIBUTIONS[name](n, random.Random(f'{name}:{n}:{seed}'))
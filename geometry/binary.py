@@ -0,0 +1,130 @@
+"""Packed float64 transport for point arrays.
+
+A message is a fixed header, a JSON metadata block and a body of
+little-endian float64 (x, y) pairs:
+
+    magic    4 bytes   b'GPF1'
+    meta_len uint32    length of the JSON block, padded to a multiple of 8
+    count    uint64    total number of points in the body
+    meta     JSON      other arguments, plus "arrays": {"name": count, ...}
+    body     count * 16 bytes
+
+The arrays listed in "arrays" are stored one after the other in the body, in
+the order they are listed; without "arrays" the whole body is "points".
+Decoding maps the body with NumPy frombuffer (or a memoryview cast without
+NumPy), so the x and y buffers are strided views of the request bytes.
+"""
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, Tuple
+
+from geometry.models import GeometryError, PointArray
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, bodies are unpacked into array('d') buffers instead
+    np = None
+
+MIME_TYPE = 'application/octet-stream'
+MAGIC = b'GPF1'
+HEADER = struct.Struct('<4sIQ')
+
+
+class BinaryFormatError(GeometryError):
+    """Exception for malformed binary messages"""
+    code = 'invalid_binary'
+
+
+def pack(meta: dict, arrays: Dict[str, PointArray]) -> bytes:
+    """Encode metadata and named point arrays as one binary message"""
+    meta = dict(meta, arrays={name: len(points) for name, points in arrays.items()})
+    encoded = json.dumps(meta, separators=(',', ':'), default=_nested_array).encode()
+    encoded += b' ' * (-len(encoded) % 8)  # Keep the body 8-byte aligned
+    count = sum(len(points) for points in arrays.values())
+    parts = [HEADER.pack(MAGIC, len(encoded), count), encoded]
+    for points in arrays.values():
+        parts.append(_pairs(points))
+    return b''.join(parts)
+
+
+def _nested_array(value):
+    # Point arrays below the top level of the metadata are written out as point lists
+    if isinstance(value, PointArray):
+        return value.to_dicts()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _pairs(points: PointArray) -> bytes:
+    # Interleave the x and y buffers into little-endian (x, y) pairs
+    if np is not None:
+        pairs = np.empty(2 * len(points), dtype='<f8')
+        pairs[0::2] = points.xs
+        pairs[1::2] = points.ys
+        return pairs.tobytes()
+    pairs = array('d', bytes(16 * len(points)))
+    pairs[0::2] = points.xs
+    pairs[1::2] = points.ys
+    if sys.byteorder != 'little':
+        pairs.byteswap()
+    return pairs.tobytes()
+
+
+def unpack(buffer) -> Tuple[dict, Dict[str, PointArray]]:
+    """Decode a binary message into its metadata and named point arrays"""
+    buffer = memoryview(buffer)
+    if len(buffer) < HEADER.size:
+        raise BinaryFormatError("Binary message is shorter than its header")
+    magic, meta_len, count = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise BinaryFormatError("Binary message does not start with the GPF1 magic bytes")
+    offset = HEADER.size + meta_len
+    if len(buffer) != offset + 16 * count:
+        raise BinaryFormatError(f"Binary body does not hold the {count} points declared in the header")
+    try:
+        meta = json.loads(bytes(buffer[HEADER.size:offset])) if meta_len else {}
+    except ValueError:
+        raise BinaryFormatError("Binary message metadata is not valid JSON")
+    if not isinstance(meta, dict):
+        raise BinaryFormatError("Binary message metadata must be a JSON object")
+
+    sizes = meta.pop('arrays', None) or {'points': count}
+    if not isinstance(sizes, dict) or not all(isinstance(size, int) and not isinstance(size, bool) and size >= 0
+                                              for size in sizes.values()):
+        raise BinaryFormatError('"arrays" in the metadata must map array names to non-negative point counts')
+    if sum(sizes.values()) != count:
+        raise BinaryFormatError("Array sizes in the metadata do not add up to the point count")
+
+    if np is not None:
+        flat = np.frombuffer(buffer, dtype='<f8', count=2 * count, offset=offset)
+    else:
+        flat = array('d')
+        flat.frombytes(buffer[offset:])
+        if sys.byteorder != 'little':
+            flat.byteswap()
+
+    arrays, start = {}, 0
+    for name, size in sizes.items():
+        block = flat[2 * start:2 * (start + size)]
+        arrays[name] = PointArray(block[0::2], block[1::2])
+        start += size
+    return meta, arrays
+
+
+def decode_request(body) -> dict:
+    """Operation payload from a binary request: the metadata with the point arrays filled in"""
+    meta, arrays = unpack(body)
+    meta.update(arrays)
+    return meta
+
+
+def encode_result(result: dict, **meta) -> bytes:
+    """Binary response for an operation result; top-level point arrays go in the body,
+    nested ones stay in the metadata as point lists.
+
+    Extra keyword arguments are added to the metadata next to "result".
+    """
+    arrays = {key: value for key, value in result.items() if isinstance(value, PointArray)}
+    rest = {key: value for key, value in result.items() if key not in arrays}
+    return pack(dict(meta, success=True, result=rest), arrays)
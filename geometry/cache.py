@@ -0,0 +1,158 @@
+"""Bounded in-process cache for operation results.
+
+Results are keyed by a hash of the operation name and its canonicalized
+payload: numbers are compared as floats and object keys are sorted, so
+equivalent requests share an entry. Payload keys holding polygon rings can
+be declared rotation-invariant, in which case the ring is rotated to start
+at its smallest vertex before hashing. Entries are evicted least recently
+used first once the entry or byte limit is reached, and expire after a TTL.
+"""
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 600.0
+
+# Returned by ResultCache.get when there is no live entry for the key
+MISS = object()
+
+
+def _normalize(value):
+    # JSON-like value with numbers as floats, so 1 and 1.0 hash alike
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+
+def canonical_ring(points: List[dict]) -> List[Tuple[float, float]]:
+    """Vertices of a ring rotated to start at the smallest (x, y) vertex"""
+    ring = [(float(p['x']), float(p['y'])) for p in points]
+    if not ring:
+        return ring
+    smallest = min(ring)
+    # Duplicate vertices can tie, the lexicographically smallest rotation wins
+    return min(ring[i:] + ring[:i] for i, vertex in enumerate(ring) if vertex == smallest)
+
+
+def canonical_key(name: str, data: Any, rings: Iterable[str] = (), variant: Any = None) -> str:
+    """Hash of an operation and its normalized payload; ring keys ignore vertex rotation.
+
+    variant distinguishes results of the same input that are shaped differently.
+    """
+    normalized = _normalize(data)
+    if isinstance(data, dict):
+        for ring in rings:
+            if ring in data:
+                normalized[ring] = canonical_ring(data[ring])
+    encoded = json.dumps([name, normalized, _normalize(variant)], sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+def estimate_size(value) -> int:
+    """Approximate bytes held by a JSON-like value"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(v) for v in value)
+    return size
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a TTL and limits on entry count and bytes held.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: Optional[float] = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str):
+        """Return the cached value for key, or MISS"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value) -> bool:
+        """Cache a value, evicting least recently used entries to stay within limits"""
+        if not self.enabled:
+            return False
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return False
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """Hit rate, evictions and bytes held, for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl
+            }
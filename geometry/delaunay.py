@@ -0,0 +1,388 @@
+"""Delaunay triangulation and Voronoi diagram of a point set.
+
+Points are inserted one at a time with the Bowyer-Watson algorithm: the
+triangles whose circumcircle contains the new point are removed, and the hole
+they leave is filled with triangles joining its boundary to the new point.
+Points go in a biased randomized insertion order (BRIO): random rounds that
+double in size, each sorted along a Hilbert curve. Each point is then
+located by walking from the last triangle created, which is nearby, so the
+whole triangulation takes O(n log n) expected time.
+
+The outside of the convex hull is covered by ghost triangles that join each
+hull edge to a vertex at infinity. Points outside the current hull then need
+no special case, and no bounding super-triangle is needed (its corners would
+distort the triangles near the hull). The orientation and in-circle tests are
+evaluated in floating point and redone exactly in integer arithmetic when the
+float result is within its error bound, so degenerate inputs (collinear or
+cocircular points, grids) still give a valid triangulation. Duplicate points
+are triangulated once, under their first index.
+
+Like the hull engine, everything works on coordinate buffers and answers
+with point indices.
+"""
+import math
+import random
+from fractions import Fraction
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Vertex index of the point at infinity in ghost triangles
+GHOST = -1
+# Error bounds of the floating-point orientation and in-circle determinants (Shewchuk)
+_EPSILON = 2.0 ** -53
+_ORIENT_BOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+_INCIRCLE_BOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+# Points are placed on a 2^16 x 2^16 grid to be sorted along the Hilbert curve
+HILBERT_ORDER = 16
+# The first BRIO round holds at most this many points
+BRIO_FIRST_ROUND = 64
+
+
+class Triangulation(NamedTuple):
+    """Triangles as counter-clockwise point index triples, and for each the triangle across
+    the edge opposite each of its vertices (-1 on the convex hull)"""
+    triangles: List[Tuple[int, int, int]]
+    neighbors: List[Tuple[int, int, int]]
+
+
+class VoronoiCell(NamedTuple):
+    """Voronoi vertex indices around a site, counter-clockwise. An unbounded cell also has two
+    ray directions: its boundary leaves the first vertex along the first ray and the last
+    vertex along the second. Bounded cells have no rays."""
+    vertices: List[int]
+    rays: List[Tuple[float, float]]
+
+
+class VoronoiDiagram(NamedTuple):
+    """Voronoi vertex coordinates (vertex t is the circumcenter of Delaunay triangle t) and
+    the cell of each input point"""
+    xs: List[float]
+    ys: List[float]
+    cells: List[VoronoiCell]
+
+
+def _integers(*values: float) -> List[int]:
+    # The values as exact integers, all scaled by the same power of two. Floats are dyadic
+    # rationals, so this is exact, and the signs of the (homogeneous) predicates are unchanged.
+    ratios = [value.as_integer_ratio() for value in values]
+    scale = max(denominator for _, denominator in ratios)
+    return [numerator * (scale // denominator) for numerator, denominator in ratios]
+
+
+def orient(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+    """Positive if a, b, c turn counter-clockwise, negative if clockwise, zero if collinear.
+
+    The sign is exact; the magnitude is twice the triangle's area unless the points are
+    nearly collinear.
+    """
+    left = (bx - ax) * (cy - ay)
+    right = (by - ay) * (cx - ax)
+    det = left - right
+    if abs(det) > _ORIENT_BOUND * (abs(left) + abs(right)):
+        return det
+    ax, ay, bx, by, cx, cy = _integers(ax, ay, bx, by, cx, cy)
+    exact = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return float((exact > 0) - (exact < 0))
+
+
+def incircle(ax: float, ay: float, bx: float, by: float, cx: float, cy: float, dx: float, dy: float) -> float:
+    """Positive if d lies inside the circle through the counter-clockwise triangle a, b, c,
+    negative if outside, zero if on it (exact sign)"""
+    adx, ady, bdx, bdy, cdx, cdy = ax - dx, ay - dy, bx - dx, by - dy, cx - dx, cy - dy
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    alift, blift, clift = adx * adx + ady * ady, bdx * bdx + bdy * bdy, cdx * cdx + cdy * cdy
+    det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady)
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift + (abs(cdxady) + abs(adxcdy)) * blift
+                 + (abs(adxbdy) + abs(bdxady)) * clift)
+    if abs(det) > _INCIRCLE_BOUND * permanent:
+        return det
+    ax, ay, bx, by, cx, cy, dx, dy = _integers(ax, ay, bx, by, cx, cy, dx, dy)
+    adx, ady, bdx, bdy, cdx, cdy = ax - dx, ay - dy, bx - dx, by - dy, cx - dx, cy - dy
+    exact = ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+             + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+    return float((exact > 0) - (exact < 0))
+
+
+def circumcenter(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> Optional[Tuple[float, float]]:
+    """Center of the circle through a, b and c in closed form, or None if they are collinear"""
+    # Work relative to a, which keeps the products small for points far from the origin
+    rbx, rby, rcx, rcy = bx - ax, by - ay, cx - ax, cy - ay
+    d = 2.0 * (rbx * rcy - rby * rcx)
+    if d == 0:
+        # Rounding can cancel the determinant of a thin triangle; redo it exactly
+        ax, ay, bx, by, cx, cy = map(Fraction, (ax, ay, bx, by, cx, cy))
+        rbx, rby, rcx, rcy = bx - ax, by - ay, cx - ax, cy - ay
+        d = 2 * (rbx * rcy - rby * rcx)
+        if d == 0:
+            return None
+    b2, c2 = rbx * rbx + rby * rby, rcx * rcx + rcy * rcy
+    return float(ax + (rcy * b2 - rby * c2) / d), float(ay + (rbx * c2 - rcx * b2) / d)
+
+
+def _floats(values: Sequence[float]) -> List[float]:
+    return values.tolist() if hasattr(values, 'tolist') else [float(v) for v in values]
+
+
+def _hilbert_key(x: int, y: int) -> int:
+    # Position of grid cell (x, y) along the Hilbert curve filling the 2^HILBERT_ORDER grid
+    key = 0
+    s = 1 << (HILBERT_ORDER - 1)
+    while s:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        key += s * s * ((3 * rx) ^ ry)
+        if not ry:
+            if rx:
+                x, y = s - 1 - x, s - 1 - y
+            x, y = y, x
+        s >>= 1
+    return key
+
+
+def insertion_order(xs: List[float], ys: List[float], indices: List[int], seed: int = 0) -> List[int]:
+    """The indices in biased randomized insertion order, each round sorted along a Hilbert curve"""
+    if not indices:
+        return []
+    min_x, max_x = min(xs[i] for i in indices), max(xs[i] for i in indices)
+    min_y, max_y = min(ys[i] for i in indices), max(ys[i] for i in indices)
+    scale = ((1 << HILBERT_ORDER) - 1) / max(max_x - min_x, max_y - min_y, 1e-300)
+    keys = {i: _hilbert_key(int((xs[i] - min_x) * scale), int((ys[i] - min_y) * scale)) for i in indices}
+    # A fixed seed keeps the output of a given input the same on every call
+    shuffled = list(indices)
+    random.Random(seed).shuffle(shuffled)
+    rounds = []
+    end = len(shuffled)
+    while end > BRIO_FIRST_ROUND:
+        rounds.append(shuffled[end // 2:end])
+        end //= 2
+    rounds.append(shuffled[:end])
+    order = []
+    for points in reversed(rounds):
+        order.extend(sorted(points, key=keys.__getitem__))
+    return order
+
+
+def triangulate(xs: Sequence[float], ys: Sequence[float]) -> Triangulation:
+    """Delaunay triangulation of the points (xs[i], ys[i]); empty if they are all collinear"""
+    xs, ys = _floats(xs), _floats(ys)
+    if len(xs) != len(ys):
+        raise ValueError("x and y sequences must have the same length")
+    first: Dict[Tuple[float, float], int] = {}
+    for i, point in enumerate(zip(xs, ys)):
+        first.setdefault(point, i)
+    mesh = _Mesh(xs, ys)
+    order = insertion_order(xs, ys, list(first.values()))
+    if not mesh.start(order):
+        return Triangulation([], [])
+    for p in order[3:]:
+        mesh.insert(p)
+    return mesh.result()
+
+
+class _Mesh:
+    # Triangles live in flat lists: the vertices of triangle t are v[3t:3t + 3], counter-clockwise,
+    # and n[3t + k] is the triangle across the edge opposite v[3t + k]. Ghost triangles keep
+    # GHOST in their last vertex. Slots of deleted triangles are reused.
+
+    def __init__(self, xs: List[float], ys: List[float]):
+        self.xs, self.ys = xs, ys
+        self.v: List[int] = []
+        self.n: List[int] = []
+        self.alive: List[bool] = []
+        self.free: List[int] = []
+        self.last = 0
+
+    def new(self) -> int:
+        if self.free:
+            t = self.free.pop()
+            self.alive[t] = True
+            return t
+        self.v.extend((0, 0, 0))
+        self.n.extend((0, 0, 0))
+        self.alive.append(True)
+        return len(self.alive) - 1
+
+    def start(self, order: List[int]) -> bool:
+        # Build the first triangle and its three ghosts from the first three points not on one
+        # line, moving them to the front of order; False if there are no such points
+        xs, ys = self.xs, self.ys
+        if len(order) < 3:
+            return False
+        a, b = order[0], order[1]
+        for k in range(2, len(order)):
+            c = order[k]
+            turn = orient(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c])
+            if turn:
+                break
+        else:
+            return False
+        order[2], order[k] = order[k], order[2]
+        if turn < 0:
+            b, c = c, b
+        t = self.new()
+        self.v[3 * t:3 * t + 3] = (a, b, c)
+        ghosts = {}
+        for k, (u, w) in enumerate(((b, c), (c, a), (a, b))):
+            # The ghost across edge u -> w of the first triangle runs w -> u
+            g = self.new()
+            self.v[3 * g:3 * g + 3] = (w, u, GHOST)
+            self.n[3 * g + 2] = t
+            self.n[3 * t + k] = g
+            ghosts[w] = g
+        for g in ghosts.values():
+            w, u = self.v[3 * g], self.v[3 * g + 1]
+            # Edge u -> infinity borders the ghost starting at u, and infinity -> w the one ending at w
+            self.n[3 * g] = ghosts[u]
+            self.n[3 * ghosts[u] + 1] = g
+        self.last = t
+        return True
+
+    def conflict(self, t: int, px: float, py: float) -> bool:
+        # Does the new point invalidate triangle t (lie inside its circumcircle)?
+        xs, ys, v = self.xs, self.ys, self.v
+        a, b, c = v[3 * t], v[3 * t + 1], v[3 * t + 2]
+        if c == GHOST:
+            # A ghost's "circumcircle" is the open half-plane beyond its hull edge, plus the edge itself
+            turn = orient(xs[a], ys[a], xs[b], ys[b], px, py)
+            if turn:
+                return turn > 0
+            return min(xs[a], xs[b]) < px < max(xs[a], xs[b]) or min(ys[a], ys[b]) < py < max(ys[a], ys[b])
+        return incircle(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], px, py) > 0
+
+    def locate(self, px: float, py: float) -> int:
+        # Walk from the last triangle created towards the point; returns a triangle in conflict with it
+        xs, ys, v, n = self.xs, self.ys, self.v, self.n
+        t = self.last
+        while True:
+            if v[3 * t + 2] == GHOST:
+                if self.conflict(t, px, py):
+                    return t
+                t = n[3 * t + 2]
+                continue
+            base = 3 * t
+            for k in range(3):
+                a, b = v[base + (k + 1) % 3], v[base + (k + 2) % 3]
+                if orient(xs[a], ys[a], xs[b], ys[b], px, py) < 0:
+                    t = n[base + k]
+                    break
+            else:
+                # The triangle contains the point, which is then strictly inside its circumcircle
+                return t
+
+    def insert(self, p: int):
+        xs, ys, v, n = self.xs, self.ys, self.v, self.n
+        px, py = xs[p], ys[p]
+        seed = self.locate(px, py)
+        # The triangles in conflict form a star-shaped cavity around the point; collect its
+        # boundary edges u -> w (cavity on their left) with the triangle outside each
+        cavity = {seed}
+        stack = [seed]
+        boundary = []
+        while stack:
+            t = stack.pop()
+            for k in range(3):
+                outer = n[3 * t + k]
+                if outer in cavity:
+                    continue
+                if self.conflict(outer, px, py):
+                    cavity.add(outer)
+                    stack.append(outer)
+                else:
+                    # Also note which of the outer triangle's slots points back into the cavity
+                    base = 3 * outer
+                    slot = base + (0 if n[base] == t else 1 if n[base + 1] == t else 2)
+                    boundary.append((v[3 * t + (k + 1) % 3], v[3 * t + (k + 2) % 3], outer, slot))
+        for t in cavity:
+            self.alive[t] = False
+            self.free.append(t)
+
+        # Join every boundary edge to the point. Around the cavity, the triangle on edge u -> w
+        # meets the one starting at w and the one ending at u.
+        starting, ending, created = {}, {}, []
+        for u, w, outer, slot in boundary:
+            t = self.new()
+            n[slot] = t
+            starting[u] = t
+            ending[w] = t
+            created.append((t, u, w, outer))
+        for t, u, w, outer in created:
+            vertices, neighbors = (u, w, p), (starting[w], ending[u], outer)
+            # Keep the point at infinity last in ghost triangles
+            if u == GHOST:
+                vertices, neighbors = vertices[1:] + vertices[:1], neighbors[1:] + neighbors[:1]
+            elif w == GHOST:
+                vertices, neighbors = vertices[2:] + vertices[:2], neighbors[2:] + neighbors[:2]
+            v[3 * t:3 * t + 3] = vertices
+            n[3 * t:3 * t + 3] = neighbors
+            if vertices[2] != GHOST:
+                self.last = t
+
+    def result(self) -> Triangulation:
+        v, n = self.v, self.n
+        real = [t for t in range(len(self.alive)) if self.alive[t] and v[3 * t + 2] != GHOST]
+        number = {t: i for i, t in enumerate(real)}
+        triangles = [(v[3 * t], v[3 * t + 1], v[3 * t + 2]) for t in real]
+        neighbors = [tuple(number.get(n[3 * t + k], -1) for k in range(3)) for t in real]
+        return Triangulation(triangles, neighbors)
+
+
+def voronoi(xs: Sequence[float], ys: Sequence[float], triangulation: Optional[Triangulation] = None) -> VoronoiDiagram:
+    """Voronoi diagram of the points, from their Delaunay triangulation (computed if not given).
+
+    Duplicate points share the cell of their first occurrence.
+    """
+    xs, ys = _floats(xs), _floats(ys)
+    if triangulation is None:
+        triangulation = triangulate(xs, ys)
+    triangles, neighbors = triangulation
+    if not triangles:
+        raise ValueError("A Voronoi diagram needs at least three points that are not collinear")
+    centers = [circumcenter(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) for a, b, c in triangles]
+    incident: Dict[int, int] = {}
+    for t, corners in enumerate(triangles):
+        for site in corners:
+            incident.setdefault(site, t)
+
+    def outward(a: int, b: int) -> Tuple[float, float]:
+        # Unit normal on the right of hull edge a -> b, pointing away from the triangulation
+        dx, dy = xs[b] - xs[a], ys[b] - ys[a]
+        length = math.hypot(dx, dy)
+        # Adding 0.0 turns -0.0 into 0.0
+        return dy / length + 0.0, -dx / length + 0.0
+
+    cells: List[Optional[VoronoiCell]] = [None] * len(xs)
+    first: Dict[Tuple[float, float], int] = {}
+    for site in range(len(xs)):
+        original = first.setdefault((xs[site], ys[site]), site)
+        if original != site:
+            cells[site] = cells[original]
+            continue
+        # In triangle (site, a, b), the next triangle clockwise around the site is across edge
+        # site-a and the next counter-clockwise one across edge b-site
+        start = t = incident[site]
+        while True:
+            corners = triangles[t]
+            previous = neighbors[t][(corners.index(site) + 2) % 3]
+            if previous < 0 or previous == start:
+                break
+            t = previous
+        bounded = previous == start
+        if bounded:
+            t = start
+        around = []
+        while True:
+            around.append(t)
+            corners = triangles[t]
+            following = neighbors[t][(corners.index(site) + 1) % 3]
+            if following < 0 or following == around[0]:
+                break
+            t = following
+        rays = []
+        if not bounded:
+            corners = triangles[around[0]]
+            rays.append(outward(site, corners[(corners.index(site) + 1) % 3]))
+            corners = triangles[around[-1]]
+            rays.append(outward(corners[(corners.index(site) + 2) % 3], site))
+        cells[site] = VoronoiCell(around, rays)
+    return VoronoiDiagram([c[0] for c in centers], [c[1] for c in centers], cells)
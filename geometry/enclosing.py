@@ -0,0 +1,132 @@
+"""Minimum enclosing circle of a point set.
+
+Welzl's algorithm in its iterative form: the points are shuffled and added
+one at a time, and whenever a point falls outside the current circle, the
+smallest circle with that point on its boundary is rebuilt from the points
+before it. Circles through one, two or three boundary points are solved in
+closed form. With the random order a rebuild is rare enough that the whole
+search takes O(n) expected time, whatever the input order.
+
+Only convex hull vertices can lie on the circle, so with NumPy installed the
+points strictly inside the extreme octagon (see hull.akl_toussaint_mask) are
+dropped first. Callers that already have the hull can pass just its vertices.
+Like the other engines, this works on coordinate buffers and answers with
+point indices.
+"""
+import math
+import random
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from geometry import hull
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, every point goes through the search instead
+    np = None
+
+# A point counts as inside when its squared distance from the center exceeds the squared
+# radius by at most this fraction, so rounding does not trigger needless rebuilds
+RELATIVE_TOLERANCE = 1e-12
+
+
+class EnclosingCircle(NamedTuple):
+    x: float
+    y: float
+    radius: float
+    # Indices of the one to three points that fix the circle
+    support: Tuple[int, ...]
+
+
+def _floats(values: Sequence[float]) -> List[float]:
+    return values.tolist() if hasattr(values, 'tolist') else [float(v) for v in values]
+
+
+def min_enclosing_circle(xs: Sequence[float], ys: Sequence[float], seed: Optional[int] = None,
+                         prefilter: bool = True) -> EnclosingCircle:
+    """Smallest circle containing every point (xs[i], ys[i]), in O(n) expected time
+
+    seed fixes the random insertion order; the circle itself does not depend on it.
+    """
+    n = len(xs)
+    if len(ys) != n:
+        raise ValueError("x and y sequences must have the same length")
+    if n == 0:
+        raise ValueError("At least one point is needed")
+    if np is not None and n >= hull.PREFILTER_MIN_POINTS:
+        # Small inputs are cheaper on lists than with NumPy's per-call overhead
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        order = np.arange(n)
+        if prefilter:
+            order = np.flatnonzero(hull.akl_toussaint_mask(xs, ys))
+        order = order[np.random.default_rng(seed).permutation(len(order))]
+        px, py, scan = xs[order], ys[order], _scan_arrays
+    else:
+        order = list(range(n))
+        random.Random(seed).shuffle(order)
+        xs, ys = _floats(xs), _floats(ys)
+        px, py, scan = [xs[k] for k in order], [ys[k] for k in order], _scan_lists
+    m = len(order)
+    scale = 1 + RELATIVE_TOLERANCE
+
+    # scan(start, stop, ...) finds the first point in that range outside the current circle
+    cx, cy, r2, support = float(px[0]), float(py[0]), 0.0, (0,)
+    i = scan(px, py, 1, m, cx, cy, 0.0)
+    while i < m:
+        # Point i lies on the circle of the first i + 1 points
+        x, y = float(px[i]), float(py[i])
+        cx, cy, r2, support = x, y, 0.0, (i,)
+        j = scan(px, py, 0, i, cx, cy, 0.0)
+        while j < i:
+            # ... and so does point j
+            qx, qy = float(px[j]), float(py[j])
+            cx, cy = (x + qx) / 2, (y + qy) / 2
+            r2, support = (x - cx) ** 2 + (y - cy) ** 2, (i, j)
+            k = scan(px, py, 0, j, cx, cy, r2 * scale)
+            while k < j:
+                # ... and point k fixes the rest
+                cx, cy, r2, support = _through_three(px, py, i, j, k)
+                k = scan(px, py, k + 1, j, cx, cy, r2 * scale)
+            j = scan(px, py, j + 1, i, cx, cy, r2 * scale)
+        i = scan(px, py, i + 1, m, cx, cy, r2 * scale)
+
+    return EnclosingCircle(cx, cy, math.sqrt(r2), tuple(int(order[p]) for p in support))
+
+
+def _scan_lists(px: List[float], py: List[float], start: int, stop: int, cx: float, cy: float, limit: float) -> int:
+    # First index in [start, stop) farther than sqrt(limit) from (cx, cy), or stop
+    for t in range(start, stop):
+        dx, dy = px[t] - cx, py[t] - cy
+        if dx * dx + dy * dy > limit:
+            return t
+    return stop
+
+
+def _scan_arrays(px, py, start: int, stop: int, cx: float, cy: float, limit: float) -> int:
+    # Same as _scan_lists on NumPy arrays, in growing blocks since the next miss is usually near
+    size = 256
+    while start < stop:
+        end = min(start + size, stop)
+        dx, dy = px[start:end] - cx, py[start:end] - cy
+        outside = np.flatnonzero(dx * dx + dy * dy > limit)
+        if len(outside):
+            return start + int(outside[0])
+        start, size = end, size * 4
+    return stop
+
+
+def _through_three(px, py, i: int, j: int, k: int) -> Tuple[float, float, float, Tuple[int, ...]]:
+    # Circumcircle of three points. Collinear points (possible only through rounding here)
+    # get the circle on their farthest pair instead.
+    px, py = [float(px[i]), float(px[j]), float(px[k])], [float(py[i]), float(py[j]), float(py[k])]
+    ax, ay = px[0], py[0]
+    bx, by, cx, cy = px[1] - ax, py[1] - ay, px[2] - ax, py[2] - ay
+    d = 2 * (bx * cy - by * cx)
+    if d == 0:
+        a, b = max(((0, 1), (0, 2), (1, 2)), key=lambda pair: (px[pair[0]] - px[pair[1]]) ** 2
+                                                               + (py[pair[0]] - py[pair[1]]) ** 2)
+        x, y = (px[a] + px[b]) / 2, (py[a] + py[b]) / 2
+        return x, y, (px[a] - x) ** 2 + (py[a] - y) ** 2, ((i, j, k)[a], (i, j, k)[b])
+    b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+    ux, uy = (cy * b2 - by * c2) / d, (bx * c2 - cx * b2) / d
+    return ax + ux, ay + uy, ux * ux + uy * uy, (i, j, k)
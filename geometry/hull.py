@@ -0,0 +1,224 @@
+"""Convex hull engine working on coordinate buffers.
+
+Every function takes parallel x and y sequences (NumPy arrays or plain
+sequences) and returns hull vertex indices, so callers decide whether to
+map them back to Point objects or to a PointArray.
+"""
+from typing import List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python paths are used instead
+    np = None
+
+HULL_METHODS = ('monotone', 'quickhull')
+
+# Below this many points the Akl-Toussaint pre-filter costs more than it saves
+PREFILTER_MIN_POINTS = 64
+
+def convex_hull_indices(xs: Sequence[float], ys: Sequence[float], method: str = 'monotone',
+                        prefilter: bool = True) -> List[int]:
+    """Indices of the convex hull vertices in counter-clockwise order.
+
+    The hull starts at the lowest point (leftmost on ties). Duplicate and
+    collinear boundary points are excluded. 'monotone' runs Andrew's monotone
+    chain in O(n log n); 'quickhull' is output-sensitive and fastest when the
+    hull has few vertices compared to the input.
+    """
+    if method not in HULL_METHODS:
+        raise ValueError(f"Unknown convex hull method: {method}")
+    n = len(xs)
+    if n == 0:
+        return []
+
+    if np is not None:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        candidates = np.arange(n)
+        if prefilter and n >= PREFILTER_MIN_POINTS:
+            candidates = candidates[akl_toussaint_mask(xs, ys)]
+        if method == 'quickhull':
+            hull = _quickhull_numpy(xs, ys, candidates)
+        else:
+            order = candidates[np.lexsort((ys[candidates], xs[candidates]))]
+            first, last = order[0], order[-1]
+            cross = (xs[last] - xs[first]) * (ys[order] - ys[first]) - (ys[last] - ys[first]) * (xs[order] - xs[first])
+            hull = _monotone_chain(xs.tolist(), ys.tolist(), order[cross <= 0].tolist(), order[cross >= 0].tolist())
+    else:
+        candidates = list(range(n))
+        if prefilter and n >= PREFILTER_MIN_POINTS:
+            keep = akl_toussaint_mask(xs, ys)
+            candidates = [i for i in candidates if keep[i]]
+        if method == 'quickhull':
+            hull = _quickhull_python(xs, ys, candidates)
+        else:
+            order = sorted(candidates, key=lambda i: (xs[i], ys[i]))
+            hull = _monotone_chain(xs, ys, *_split_by_chord(xs, ys, order))
+
+    # Start at the lowest (then leftmost) vertex, like the original Graham scan
+    start = min(range(len(hull)), key=lambda k: (ys[hull[k]], xs[hull[k]]))
+    return [int(i) for i in hull[start:] + hull[:start]]
+
+def akl_toussaint_mask(xs: Sequence[float], ys: Sequence[float]):
+    """Mask of points that may be hull vertices (False for points strictly inside the extreme octagon)"""
+    octagon = _extreme_octagon(xs, ys)
+    if np is not None:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if len(octagon) < 3:
+            return np.ones(len(xs), dtype=bool)
+        inside = np.ones(len(xs), dtype=bool)
+        for k in range(len(octagon)):
+            i, j = octagon[k], octagon[(k + 1) % len(octagon)]
+            inside &= (xs[j] - xs[i]) * (ys - ys[i]) - (ys[j] - ys[i]) * (xs - xs[i]) > 0
+        return ~inside
+
+    if len(octagon) < 3:
+        return [True] * len(xs)
+    edges = [(xs[i], ys[i], xs[j] - xs[i], ys[j] - ys[i])
+             for i, j in zip(octagon, octagon[1:] + octagon[:1])]
+    return [not all(ex * (y - y0) - ey * (x - x0) > 0 for x0, y0, ex, ey in edges)
+            for x, y in zip(xs, ys)]
+
+def _extreme_octagon(xs, ys) -> List[int]:
+    # Support points in the 8 compass directions, listed counter-clockwise from the bottom
+    n = len(xs)
+    if np is not None:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        s, d = xs + ys, xs - ys
+        extremes = [np.argmin(ys), np.argmax(d), np.argmax(xs), np.argmax(s),
+                    np.argmax(ys), np.argmin(d), np.argmin(xs), np.argmin(s)]
+    else:
+        r = range(n)
+        extremes = [min(r, key=lambda i: ys[i]), max(r, key=lambda i: xs[i] - ys[i]),
+                    max(r, key=lambda i: xs[i]), max(r, key=lambda i: xs[i] + ys[i]),
+                    max(r, key=lambda i: ys[i]), min(r, key=lambda i: xs[i] - ys[i]),
+                    min(r, key=lambda i: xs[i]), min(r, key=lambda i: xs[i] + ys[i])]
+
+    octagon = []
+    for i in extremes:
+        i = int(i)
+        if not octagon or (xs[i], ys[i]) != (xs[octagon[-1]], ys[octagon[-1]]):
+            octagon.append(i)
+    while len(octagon) > 1 and (xs[octagon[0]], ys[octagon[0]]) == (xs[octagon[-1]], ys[octagon[-1]]):
+        octagon.pop()
+    return octagon
+
+def _split_by_chord(xs, ys, order: List[int]):
+    # Split (x, y)-sorted indices into the points on or below and on or above the chord
+    # between the extreme points, so each half-chain only scans its own side
+    first, last = order[0], order[-1]
+    ax, ay = xs[first], ys[first]
+    ex, ey = xs[last] - ax, ys[last] - ay
+    lower_side, upper_side = [], []
+    for k in order:
+        cross = ex * (ys[k] - ay) - ey * (xs[k] - ax)
+        if cross <= 0:
+            lower_side.append(k)
+        if cross >= 0:
+            upper_side.append(k)
+    return lower_side, upper_side
+
+def _monotone_chain(xs, ys, lower_side: List[int], upper_side: List[int]) -> List[int]:
+    # Andrew's monotone chain over the two sides of the chord, both sorted by (x, y)
+    lower = _half_chain(xs, ys, lower_side)
+    upper = _half_chain(xs, ys, reversed(upper_side))
+    hull = lower[:-1] + upper[:-1]
+    if not hull:
+        # All points coincide
+        return lower_side[:1]
+    return hull
+
+def _half_chain(xs, ys, indices) -> List[int]:
+    chain, cx, cy = [], [], []
+    for k in indices:
+        x3, y3 = xs[k], ys[k]
+        if chain and x3 == cx[-1] and y3 == cy[-1]:
+            continue  # Duplicate of the previous point
+        while len(chain) >= 2:
+            x1, y1, x2, y2 = cx[-2], cy[-2], cx[-1], cy[-1]
+            if (x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1) <= 0:
+                chain.pop()
+                cx.pop()
+                cy.pop()
+            else:
+                break
+        chain.append(k)
+        cx.append(x3)
+        cy.append(y3)
+    return chain
+
+# Sub-problems smaller than this are split with scalar code, where NumPy call overhead dominates
+QUICKHULL_VECTOR_MIN_POINTS = 256
+
+def _quickhull_numpy(xs, ys, candidates) -> List[int]:
+    # Iterative QuickHull; each stack entry emits a hull vertex or splits an edge
+    cx, cy = xs[candidates], ys[candidates]
+    order = np.lexsort((cy, cx))
+    a, b = int(candidates[order[0]]), int(candidates[order[-1]])
+    if xs[a] == xs[b] and ys[a] == ys[b]:
+        return [a]
+
+    xl, yl = xs.tolist(), ys.tolist()
+    hull = []
+    stack = [('edge', b, a, candidates), ('vertex', b), ('edge', a, b, candidates), ('vertex', a)]
+    while stack:
+        entry = stack.pop()
+        if entry[0] == 'vertex':
+            hull.append(entry[1])
+            continue
+        _, i, j, points = entry
+        if len(points) < QUICKHULL_VECTOR_MIN_POINTS:
+            farthest, outside = _farthest_outside(xl, yl, i, j, points.tolist() if hasattr(points, 'tolist') else points)
+        else:
+            # Points strictly to the right of i -> j lie outside the current hull
+            cross = (xl[j] - xl[i]) * (ys[points] - yl[i]) - (yl[j] - yl[i]) * (xs[points] - xl[i])
+            mask = cross < 0
+            if not mask.any():
+                continue
+            outside, cross = points[mask], cross[mask]
+            # Of the points farthest from the edge, the last one along i -> j is a hull vertex
+            tied = outside[cross == cross.min()]
+            along = (xl[j] - xl[i]) * (xs[tied] - xl[i]) + (yl[j] - yl[i]) * (ys[tied] - yl[i])
+            farthest = int(tied[np.argmax(along)])
+        if farthest is None:
+            continue
+        stack.extend([('edge', farthest, j, outside), ('vertex', farthest), ('edge', i, farthest, outside)])
+    return hull
+
+def _quickhull_python(xs, ys, candidates: List[int]) -> List[int]:
+    a = min(candidates, key=lambda i: (xs[i], ys[i]))
+    b = max(candidates, key=lambda i: (xs[i], ys[i]))
+    if xs[a] == xs[b] and ys[a] == ys[b]:
+        return [a]
+
+    hull = []
+    stack = [('edge', b, a, candidates), ('vertex', b), ('edge', a, b, candidates), ('vertex', a)]
+    while stack:
+        entry = stack.pop()
+        if entry[0] == 'vertex':
+            hull.append(entry[1])
+            continue
+        _, i, j, points = entry
+        farthest, outside = _farthest_outside(xs, ys, i, j, points)
+        if farthest is None:
+            continue
+        stack.extend([('edge', farthest, j, outside), ('vertex', farthest), ('edge', i, farthest, outside)])
+    return hull
+
+def _farthest_outside(xs, ys, i: int, j: int, points: List[int]):
+    # Points strictly to the right of i -> j, and the one farthest from the edge. Of equally
+    # far points the last one along i -> j is taken, the others may lie between hull vertices.
+    ex, ey, x0, y0 = xs[j] - xs[i], ys[j] - ys[i], xs[i], ys[i]
+    outside = []
+    farthest, best, best_along = None, 0.0, 0.0
+    for k in points:
+        cross = ex * (ys[k] - y0) - ey * (xs[k] - x0)
+        if cross < 0:
+            outside.append(k)
+            if cross <= best:
+                along = ex * (xs[k] - x0) + ey * (ys[k] - y0)
+                if cross < best or along > best_along:
+                    farthest, best, best_along = k, cross, along
+    return farthest, outside
@@ -0,0 +1,358 @@
+"""R-tree spatial index over the bounding boxes of geometry shapes.
+
+The tree is bulk loaded with Sort-Tile-Recursive (STR) packing and supports
+Guttman-style insert and delete afterwards. Queries prune by bounding box
+first and then run the exact shape test only on the surviving candidates.
+"""
+import heapq
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from geometry.models import Point, Line, Circle, Triangle, Polygon, GeometryError
+
+Shape = Union[Polygon, Circle, Triangle, Line]
+BBox = Tuple[float, float, float, float]
+
+class SpatialIndexError(GeometryError):
+    """Exception for spatial index errors"""
+    code = 'index_error'
+
+
+# Bounding box helpers
+def _union(a: BBox, b: BBox) -> BBox:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def _union_all(boxes: Iterable[BBox]) -> BBox:
+    boxes = list(boxes)
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+def _area(b: BBox) -> float:
+    return (b[2] - b[0]) * (b[3] - b[1])
+
+def _intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+def _contains_xy(b: BBox, x: float, y: float) -> bool:
+    return b[0] <= x <= b[2] and b[1] <= y <= b[3]
+
+def _min_distance(b: BBox, x: float, y: float) -> float:
+    dx = max(b[0] - x, 0.0, x - b[2])
+    dy = max(b[1] - y, 0.0, y - b[3])
+    return math.hypot(dx, dy)
+
+
+# Exact shape tests
+def _segment_distance(x: float, y: float, x1: float, y1: float, x2: float, y2: float) -> float:
+    dx, dy = x2 - x1, y2 - y1
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length_sq))
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+def _segment_intersects_box(x1: float, y1: float, x2: float, y2: float, b: BBox) -> bool:
+    # Liang-Barsky clipping of the segment against the box
+    t0, t1 = 0.0, 1.0
+    dx, dy = x2 - x1, y2 - y1
+    for p, q in ((-dx, x1 - b[0]), (dx, b[2] - x1), (-dy, y1 - b[1]), (dy, b[3] - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+            if t0 > t1:
+                return False
+    return True
+
+def _ring(shape: Shape) -> List[Tuple[float, float]]:
+    if isinstance(shape, Triangle):
+        return [(shape.p1.x, shape.p1.y), (shape.p2.x, shape.p2.y), (shape.p3.x, shape.p3.y)]
+    coords = shape.coords
+    return list(zip(coords.to_list(coords.xs), coords.to_list(coords.ys)))
+
+def _ring_edges(shape: Shape):
+    ring = _ring(shape)
+    return zip(ring, ring[1:] + ring[:1])
+
+def shape_contains(shape: Shape, point: Point) -> bool:
+    """Check if a shape contains a point (for a line, if the point lies on the segment)"""
+    if isinstance(shape, Line):
+        return _segment_distance(point.x, point.y, shape.point1.x, shape.point1.y,
+                                 shape.point2.x, shape.point2.y) < 1e-10
+    return shape.contains_point(point)
+
+def shape_intersects_window(shape: Shape, window: BBox) -> bool:
+    """Check if a shape intersects an axis-aligned rectangle"""
+    if isinstance(shape, Line):
+        return _segment_intersects_box(shape.point1.x, shape.point1.y, shape.point2.x, shape.point2.y, window)
+    if isinstance(shape, Circle):
+        nearest_x = min(max(shape.center.x, window[0]), window[2])
+        nearest_y = min(max(shape.center.y, window[1]), window[3])
+        return math.hypot(nearest_x - shape.center.x, nearest_y - shape.center.y) <= shape.radius
+    # Polygons and triangles: an edge crosses the window, or the window lies inside the shape
+    for (x1, y1), (x2, y2) in _ring_edges(shape):
+        if _segment_intersects_box(x1, y1, x2, y2, window):
+            return True
+    return shape.contains_point(Point(window[0], window[1]))
+
+def shape_distance(shape: Shape, point: Point) -> float:
+    """Distance from a point to a shape (zero when the shape contains the point)"""
+    if isinstance(shape, Line):
+        return _segment_distance(point.x, point.y, shape.point1.x, shape.point1.y,
+                                 shape.point2.x, shape.point2.y)
+    if isinstance(shape, Circle):
+        return max(0.0, shape.center.distance_to(point) - shape.radius)
+    if shape.contains_point(point):
+        return 0.0
+    return min(_segment_distance(point.x, point.y, x1, y1, x2, y2)
+               for (x1, y1), (x2, y2) in _ring_edges(shape))
+
+
+class _Entry:
+    __slots__ = ('id', 'bbox', 'shape')
+
+    def __init__(self, shape_id: Hashable, shape: Shape):
+        self.id = shape_id
+        self.bbox = shape.bounding_box()
+        self.shape = shape
+
+
+class _Node:
+    __slots__ = ('leaf', 'children', 'bbox', 'parent')
+
+    def __init__(self, leaf: bool, children: list):
+        self.leaf = leaf
+        self.children = children
+        self.parent = None
+        for child in children:
+            if not leaf:
+                child.parent = self
+        self.bbox = _union_all(c.bbox for c in children) if children else None
+
+    def refresh_bbox(self):
+        self.bbox = _union_all(c.bbox for c in self.children) if self.children else None
+
+
+class SpatialIndex:
+    """R-tree over Polygon, Circle, Triangle and Line shapes keyed by a caller-supplied id"""
+
+    def __init__(self, max_entries: int = 16):
+        if max_entries < 4:
+            raise SpatialIndexError("max_entries must be at least 4")
+        self.max_entries = max_entries
+        self.min_entries = max(2, int(max_entries * 0.4))
+        self.root = _Node(True, [])
+        self._entries: Dict[Hashable, _Entry] = {}
+
+    @classmethod
+    def bulk_load(cls, items: Iterable[Tuple[Hashable, Shape]], max_entries: int = 16) -> 'SpatialIndex':
+        """Build an index from (id, shape) pairs using Sort-Tile-Recursive packing"""
+        index = cls(max_entries)
+        entries = []
+        for shape_id, shape in items:
+            if shape_id in index._entries:
+                raise SpatialIndexError(f"Duplicate shape id: {shape_id}")
+            entry = _Entry(shape_id, shape)
+            index._entries[shape_id] = entry
+            entries.append(entry)
+        if entries:
+            nodes = index._pack(entries, leaf=True)
+            while len(nodes) > 1:
+                nodes = index._pack(nodes, leaf=False)
+            index.root = nodes[0]
+        return index
+
+    def _pack(self, items: list, leaf: bool) -> List[_Node]:
+        # One STR level: sort by x centre into vertical slices, then by y centre within each slice
+        m = self.max_entries
+        node_count = math.ceil(len(items) / m)
+        slice_size = math.ceil(math.sqrt(node_count)) * m
+        items = sorted(items, key=lambda it: it.bbox[0] + it.bbox[2])
+        nodes = []
+        for s in range(0, len(items), slice_size):
+            vertical_slice = sorted(items[s:s + slice_size], key=lambda it: it.bbox[1] + it.bbox[3])
+            for k in range(0, len(vertical_slice), m):
+                nodes.append(_Node(leaf, vertical_slice[k:k + m]))
+        return nodes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, shape_id: Hashable) -> bool:
+        return shape_id in self._entries
+
+    def get(self, shape_id: Hashable) -> Optional[Shape]:
+        """Return the shape stored under an id"""
+        entry = self._entries.get(shape_id)
+        return entry.shape if entry else None
+
+    def insert(self, shape_id: Hashable, shape: Shape):
+        """Add a shape to the index"""
+        if shape_id in self._entries:
+            raise SpatialIndexError(f"Duplicate shape id: {shape_id}")
+        entry = _Entry(shape_id, shape)
+        self._entries[shape_id] = entry
+        self._insert_entry(entry)
+
+    def _insert_entry(self, entry: _Entry):
+        node = self.root
+        while not node.leaf:
+            node = min(node.children, key=lambda c: (_area(_union(c.bbox, entry.bbox)) - _area(c.bbox), _area(c.bbox)))
+        node.children.append(entry)
+        self._adjust(node)
+
+    def _adjust(self, node: _Node):
+        # Walk up from a modified node, splitting overflowing nodes and refreshing boxes
+        while node is not None:
+            if len(node.children) > self.max_entries:
+                sibling = self._split(node)
+                if node.parent is None:
+                    self.root = _Node(False, [node, sibling])
+                    return
+                sibling.parent = node.parent
+                node.parent.children.append(sibling)
+            node.refresh_bbox()
+            node = node.parent
+
+    def _split(self, node: _Node) -> _Node:
+        # Quadratic split: seed with the most wasteful pair, then assign by enlargement preference
+        children = node.children
+        worst, seeds = -math.inf, (0, 1)
+        for i in range(len(children)):
+            for j in range(i + 1, len(children)):
+                waste = _area(_union(children[i].bbox, children[j].bbox)) - _area(children[i].bbox) - _area(children[j].bbox)
+                if waste > worst:
+                    worst, seeds = waste, (i, j)
+        group_a, group_b = [children[seeds[0]]], [children[seeds[1]]]
+        box_a, box_b = group_a[0].bbox, group_b[0].bbox
+        remaining = [c for k, c in enumerate(children) if k not in seeds]
+        while remaining:
+            if len(group_a) + len(remaining) == self.min_entries:
+                group_a.extend(remaining)
+                break
+            if len(group_b) + len(remaining) == self.min_entries:
+                group_b.extend(remaining)
+                break
+            child = remaining.pop()
+            grow_a = _area(_union(box_a, child.bbox)) - _area(box_a)
+            grow_b = _area(_union(box_b, child.bbox)) - _area(box_b)
+            if (grow_a, _area(box_a), len(group_a)) <= (grow_b, _area(box_b), len(group_b)):
+                group_a.append(child)
+                box_a = _union(box_a, child.bbox)
+            else:
+                group_b.append(child)
+                box_b = _union(box_b, child.bbox)
+        node.children = group_a
+        sibling = _Node(node.leaf, group_b)
+        if not node.leaf:
+            for child in group_a:
+                child.parent = node
+        node.refresh_bbox()
+        return sibling
+
+    def delete(self, shape_id: Hashable) -> bool:
+        """Remove a shape from the index; returns False if the id is unknown"""
+        entry = self._entries.pop(shape_id, None)
+        if entry is None:
+            return False
+        leaf = self._find_leaf(self.root, entry)
+        leaf.children.remove(entry)
+        self._condense(leaf)
+        return True
+
+    def _find_leaf(self, node: _Node, entry: _Entry) -> Optional[_Node]:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.leaf:
+                if any(child is entry for child in node.children):
+                    return node
+            else:
+                stack.extend(c for c in node.children if _intersects(c.bbox, entry.bbox))
+        raise SpatialIndexError("Index is inconsistent: entry not found in tree")
+
+    def _condense(self, node: _Node):
+        # Remove underfull nodes on the path to the root and reinsert their entries
+        orphans = []
+        while node.parent is not None:
+            parent = node.parent
+            if len(node.children) < self.min_entries:
+                parent.children.remove(node)
+                orphans.extend(self._leaf_entries(node))
+            else:
+                node.refresh_bbox()
+            node = parent
+        node.refresh_bbox()
+        if not self.root.leaf and len(self.root.children) == 1:
+            self.root = self.root.children[0]
+            self.root.parent = None
+        if not self.root.children:
+            self.root = _Node(True, [])
+        for entry in orphans:
+            self._insert_entry(entry)
+
+    @staticmethod
+    def _leaf_entries(node: _Node) -> List[_Entry]:
+        entries, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            if node.leaf:
+                entries.extend(node.children)
+            else:
+                stack.extend(node.children)
+        return entries
+
+    def _candidates(self, test) -> Iterable[_Entry]:
+        # Entries whose bounding boxes pass a box predicate
+        if self.root.bbox is None:
+            return
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not test(node.bbox):
+                continue
+            if node.leaf:
+                for entry in node.children:
+                    if test(entry.bbox):
+                        yield entry
+            else:
+                stack.extend(node.children)
+
+    def query_point(self, point: Point) -> List[Hashable]:
+        """Ids of the shapes that contain a point"""
+        x, y = point.x, point.y
+        return [entry.id for entry in self._candidates(lambda b: _contains_xy(b, x, y))
+                if shape_contains(entry.shape, point)]
+
+    def query_window(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[Hashable]:
+        """Ids of the shapes that intersect an axis-aligned rectangle"""
+        if min_x > max_x or min_y > max_y:
+            raise SpatialIndexError("Window minimum must not exceed its maximum")
+        window = (min_x, min_y, max_x, max_y)
+        return [entry.id for entry in self._candidates(lambda b: _intersects(b, window))
+                if shape_intersects_window(entry.shape, window)]
+
+    def nearest(self, point: Point, k: int = 1) -> List[Tuple[Hashable, float]]:
+        """The k shapes closest to a point as (id, distance) pairs, nearest first"""
+        if self.root.bbox is None or k <= 0:
+            return []
+        x, y = point.x, point.y
+        counter = 0
+        heap = [(_min_distance(self.root.bbox, x, y), counter, self.root, False)]
+        results = []
+        # Best-first search: boxes are keyed by their lower bound, entries by their exact distance
+        while heap and len(results) < k:
+            distance, _, item, exact = heapq.heappop(heap)
+            if exact:
+                results.append((item.id, distance))
+            elif isinstance(item, _Entry):
+                counter += 1
+                heapq.heappush(heap, (shape_distance(item.shape, point), counter, item, True))
+            else:
+                for child in item.children:
+                    counter += 1
+                    heapq.heappush(heap, (_min_distance(child.bbox, x, y), counter, child, False))
+        return results
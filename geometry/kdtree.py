@@ -0,0 +1,191 @@
+"""KD-tree and closest-pair search over coordinate buffers.
+
+Like the hull engine, everything here takes parallel x and y sequences
+(NumPy arrays or plain sequences) and answers with point indices, so callers
+decide how to map them back to Point objects or a PointArray.
+
+The tree is built once from the whole point set: each node splits its points
+at the median of the coordinate with the wider spread, down to leaves of at
+most leaf_size points. Nodes keep the bounding box of their points, and
+queries skip every node whose box is farther away than the current answer.
+Nodes and points live in flat lists, with each leaf's points stored
+contiguously, which keeps the pure-Python query loops tight.
+"""
+import heapq
+import math
+from typing import List, Optional, Sequence, Tuple
+
+DEFAULT_LEAF_SIZE = 16
+# Below this many points the closest-pair recursion compares every pair directly
+_BRUTE_FORCE_SIZE = 3
+
+
+def _floats(values: Sequence[float]) -> List[float]:
+    return values.tolist() if hasattr(values, 'tolist') else [float(v) for v in values]
+
+
+class KDTree:
+    """Static 2-d tree over a set of points, referred to by their index in the input"""
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float], leaf_size: int = DEFAULT_LEAF_SIZE):
+        xs, ys = _floats(xs), _floats(ys)
+        if len(xs) != len(ys):
+            raise ValueError("x and y sequences must have the same length")
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be at least 1")
+        order = list(range(len(xs)))
+        # Per node: range of its points in the reordered arrays, children (-1 for a leaf) and box
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.lefts: List[int] = []
+        self.rights: List[int] = []
+        self.boxes: List[Tuple[float, float, float, float]] = []
+        if order:
+            stack = [(self._add_node(0, len(order)), 0, len(order))]
+            while stack:
+                node, lo, hi = stack.pop()
+                members = order[lo:hi]
+                node_xs = [xs[i] for i in members]
+                node_ys = [ys[i] for i in members]
+                box = (min(node_xs), min(node_ys), max(node_xs), max(node_ys))
+                self.boxes[node] = box
+                if hi - lo <= leaf_size:
+                    continue
+                key = xs.__getitem__ if box[2] - box[0] >= box[3] - box[1] else ys.__getitem__
+                members.sort(key=key)
+                order[lo:hi] = members
+                mid = (lo + hi) // 2
+                left, right = self._add_node(lo, mid), self._add_node(mid, hi)
+                self.lefts[node], self.rights[node] = left, right
+                stack.append((left, lo, mid))
+                stack.append((right, mid, hi))
+        self.index = order
+        self.xs = [xs[i] for i in order]
+        self.ys = [ys[i] for i in order]
+
+    def _add_node(self, lo: int, hi: int) -> int:
+        self.starts.append(lo)
+        self.ends.append(hi)
+        self.lefts.append(-1)
+        self.rights.append(-1)
+        self.boxes.append((0.0, 0.0, 0.0, 0.0))
+        return len(self.starts) - 1
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _box_distance2(self, node: int, x: float, y: float) -> float:
+        # Squared distance from (x, y) to the box of a node (zero inside it)
+        min_x, min_y, max_x, max_y = self.boxes[node]
+        dx = max(min_x - x, 0.0, x - max_x)
+        dy = max(min_y - y, 0.0, y - max_y)
+        return dx * dx + dy * dy
+
+    def nearest(self, x: float, y: float, k: int = 1) -> List[Tuple[int, float]]:
+        """The k points closest to (x, y) as (index, distance) pairs, nearest first (ties by index)"""
+        if k <= 0 or not self.index:
+            return []
+        xs, ys, index = self.xs, self.ys, self.index
+        starts, ends, lefts, rights = self.starts, self.ends, self.lefts, self.rights
+        # Max-heap of the best candidates so far as (-squared distance, -index); the worst is on top
+        best: List[Tuple[float, int]] = []
+        # Best-first search over nodes keyed by the squared distance to their box
+        nodes = [(0.0, 0)]
+        while nodes:
+            bound, node = heapq.heappop(nodes)
+            if len(best) == k and bound > -best[0][0]:
+                break
+            left = lefts[node]
+            if left < 0:
+                for p in range(starts[node], ends[node]):
+                    dx, dy = xs[p] - x, ys[p] - y
+                    candidate = (-(dx * dx + dy * dy), -index[p])
+                    if len(best) < k:
+                        heapq.heappush(best, candidate)
+                    elif candidate > best[0]:
+                        heapq.heapreplace(best, candidate)
+                continue
+            for child in (left, rights[node]):
+                distance2 = self._box_distance2(child, x, y)
+                if len(best) < k or distance2 <= -best[0][0]:
+                    heapq.heappush(nodes, (distance2, child))
+        return [(-i, math.sqrt(-d2)) for d2, i in sorted(best, reverse=True)]
+
+    def within(self, x: float, y: float, radius: float) -> List[Tuple[int, float]]:
+        """Points at most radius away from (x, y) as (index, distance) pairs, nearest first (ties by index)"""
+        if radius < 0 or not self.index:
+            return []
+        xs, ys, index = self.xs, self.ys, self.index
+        starts, ends, lefts, rights = self.starts, self.ends, self.lefts, self.rights
+        radius2 = radius * radius
+        found = []
+        nodes = [0]
+        while nodes:
+            node = nodes.pop()
+            if self._box_distance2(node, x, y) > radius2:
+                continue
+            left = lefts[node]
+            if left >= 0:
+                nodes.append(left)
+                nodes.append(rights[node])
+                continue
+            for p in range(starts[node], ends[node]):
+                dx, dy = xs[p] - x, ys[p] - y
+                distance2 = dx * dx + dy * dy
+                if distance2 <= radius2:
+                    found.append((distance2, index[p]))
+        found.sort()
+        return [(i, math.sqrt(d2)) for d2, i in found]
+
+
+def closest_pair(xs: Sequence[float], ys: Sequence[float]) -> Optional[Tuple[int, int, float]]:
+    """The two closest points as (i, j, distance) with i < j, or None for fewer than two points.
+
+    Classic divide and conquer in O(n log n): split at the median x, solve both halves,
+    then compare only the points in the strip around the split line, in y order.
+    """
+    xs, ys = _floats(xs), _floats(ys)
+    if len(xs) != len(ys):
+        raise ValueError("x and y sequences must have the same length")
+    if len(xs) < 2:
+        return None
+    by_y = ys.__getitem__
+    order = sorted(range(len(xs)), key=lambda i: (xs[i], ys[i]))
+    # Squared distance of the best pair so far, and the pair
+    best = [math.inf, -1, -1]
+
+    def consider(i: int, j: int):
+        dx, dy = xs[i] - xs[j], ys[i] - ys[j]
+        distance2 = dx * dx + dy * dy
+        if distance2 < best[0]:
+            best[:] = distance2, i, j
+
+    def solve(lo: int, hi: int) -> List[int]:
+        # Finds the closest pair among order[lo:hi] and returns those points sorted by y
+        if hi - lo <= _BRUTE_FORCE_SIZE:
+            members = order[lo:hi]
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    consider(members[a], members[b])
+            members.sort(key=by_y)
+            return members
+        mid = (lo + hi) // 2
+        split_x = xs[order[mid]]
+        # Both halves are sorted by y, so this sort is a linear merge of two runs
+        merged = solve(lo, mid) + solve(mid, hi)
+        merged.sort(key=by_y)
+        width = math.sqrt(best[0])
+        strip = [i for i in merged if abs(xs[i] - split_x) < width]
+        for a in range(len(strip)):
+            i, yi = strip[a], ys[strip[a]]
+            for b in range(a + 1, len(strip)):
+                j = strip[b]
+                if ys[j] - yi >= width:
+                    break
+                consider(i, j)
+                width = math.sqrt(best[0])
+        return merged
+
+    solve(0, len(order))
+    _, i, j = best
+    return min(i, j), max(i, j), math.sqrt(best[0])
@@ -0,0 +1,195 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+Counters and histograms keep one value (or bucket list) per label
+combination behind a lock, so recording a sample is a dict lookup, a
+bisect and a few additions. instrument_models() optionally wraps the public
+methods of the heavier model classes with latency histograms.
+"""
+import bisect
+import functools
+import inspect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds in seconds for latency histograms
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds in bytes for payload size histograms
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonically increasing value per label combination"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        """Add amount to the counter of the given label values"""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, total in items:
+            lines.append(f'{self.name}{_format_labels(self.labels, values)} {_format_value(total)}')
+        return lines
+
+
+class Histogram:
+    """Bucketed distribution of observed values per label combination"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        """Record one observation for the given label values"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(label_values)
+            if counts is None:
+                counts = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def count(self, *label_values: str) -> int:
+        counts = self._values.get(label_values)
+        return sum(counts[:-1]) if counts else 0
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((values, list(counts)) for values, counts in self._values.items())
+        for values, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, values)} {_format_value(counts[-1])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, values)} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together, plus collectors that produce lines on demand"""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func: Callable[[], Iterable[str]]):
+        """Register a function returning exposition lines for values owned elsewhere"""
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            lines.extend(collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'geometry_http_requests_total', 'HTTP requests handled, by route, method and status',
+    ('route', 'method', 'status'))
+HTTP_ERRORS = REGISTRY.counter(
+    'geometry_http_errors_total', 'HTTP requests that failed, by route and error code',
+    ('route', 'code'))
+HTTP_LATENCY = REGISTRY.histogram(
+    'geometry_http_request_duration_seconds', 'Time to build the response, by route',
+    ('route',))
+HTTP_PAYLOAD = REGISTRY.histogram(
+    'geometry_http_request_size_bytes', 'Request body size, by route',
+    ('route',), SIZE_BUCKETS)
+MODEL_LATENCY = REGISTRY.histogram(
+    'geometry_model_method_duration_seconds', 'Time spent in instrumented model methods',
+    ('method',))
+
+
+def timed(label: str, func: Callable, histogram: Histogram = MODEL_LATENCY) -> Callable:
+    """Wrap func so every call is recorded in histogram under label"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start, label)
+    wrapper.__timed__ = True
+    return wrapper
+
+
+def instrument_class(cls, histogram: Histogram = MODEL_LATENCY):
+    """Time every public method, staticmethod and classmethod defined on cls (idempotent)"""
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith('_'):
+            continue
+        label = f'{cls.__name__}.{name}'
+        if isinstance(attribute, staticmethod):
+            if not getattr(attribute.__func__, '__timed__', False):
+                setattr(cls, name, staticmethod(timed(label, attribute.__func__, histogram)))
+        elif isinstance(attribute, classmethod):
+            if not getattr(attribute.__func__, '__timed__', False):
+                setattr(cls, name, classmethod(timed(label, attribute.__func__, histogram)))
+        elif inspect.isfunction(attribute) and not getattr(attribute, '__timed__', False):
+            setattr(cls, name, timed(label, attribute, histogram))
+
+
+def instrument_models(histogram: Histogram = MODEL_LATENCY):
+    """Add timing hooks to GeometryEngine, Polygon, Triangle and Transformations"""
+    from geometry.models import GeometryEngine, Polygon, Triangle, Transformations
+
+    for cls in (GeometryEngine, Polygon, Triangle, Transformations):
+        instrument_class(cls, histogram)
@@ -1,43 +1,117 @@
+import functools
 import math
-from typing import List, Tuple, Union, Optional
-from dataclasses import dataclass
+from array import array
+from typing import Callable, Dict, Iterable, List, Tuple, Union, Optional
+
+from geometry import delaunay, enclosing, hull, kdtree, overlay, sweep, triangulate
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, PointArray falls back to array('d') buffers
+    np = None
 
 class GeometryError(Exception):
     """Base exception for all geometry errors"""
-    pass
+    code = 'geometry_error'
 
 class PointError(GeometryError):
     """Exception for point-related errors"""
-    pass
+    code = 'invalid_point'
 
 class LineError(GeometryError):
     """Exception for line-related errors"""
-    pass
+    code = 'invalid_line'
 
 class CircleError(GeometryError):
     """Exception for circle-related errors"""
-    pass
+    code = 'invalid_circle'
 
 class TriangleError(GeometryError):
     """Exception for triangle-related errors"""
-    pass
+    code = 'invalid_triangle'
 
 class PolygonError(GeometryError):
     """Exception for polygon-related errors"""
-    pass
+    code = 'invalid_polygon'
+
+# Model classes are immutable: constructors assign their slots through these directly
+_set = object.__setattr__
+_new = object.__new__
+
+def memoized(method):
+    """Compute a zero-argument method once per shape and cache the result"""
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self):
+        cache = self._cache
+        if cache is None:
+            # The cache dict is only allocated once something is cached
+            cache = {}
+            _set(self, '_cache', cache)
+        if name not in cache:
+            cache[name] = method(self)
+        return cache[name]
+    return wrapper
+
+class CachedShape:
+    """Base class for immutable shapes whose derived values are computed lazily and cached"""
+    __slots__ = ('_cache',)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+    
+    @staticmethod
+    def _select(getters: Dict[str, Callable[[], object]], fields: Optional[Iterable[str]]) -> dict:
+        # Evaluate only the getters of the requested fields (all of them when fields is None)
+        if fields is None:
+            return {key: getter() for key, getter in getters.items()}
+        unknown = [key for key in fields if key not in getters]
+        if unknown:
+            raise GeometryError(f"Unknown field: {unknown[0]}")
+        return {key: getter() for key, getter in getters.items() if key in fields}
 
-@dataclass
 class Point:
-    x: float
-    y: float
+    __slots__ = ('x', 'y')
     
-    def __post_init__(self):
+    def __init__(self, x: float, y: float):
         try:
-            self.x = float(self.x)
-            self.y = float(self.y)
-        except ValueError:
+            _set(self, 'x', float(x))
+            _set(self, 'y', float(y))
+        except (TypeError, ValueError):
             raise PointError("Coordinates must be numeric values")
     
+    @classmethod
+    def from_floats(cls, x: float, y: float) -> 'Point':
+        """Create a point from coordinates that are already floats, skipping validation"""
+        point = _new(cls)
+        _set(point, 'x', x)
+        _set(point, 'y', y)
+        return point
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Point objects are immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Point objects are immutable")
+    
+    def __reduce__(self):
+        return (Point.from_floats, (self.x, self.y))
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+    
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+    
+    def __repr__(self) -> str:
+        return f"Point(x={self.x!r}, y={self.y!r})"
+    
     def distance_to(self, other: 'Point') -> float:
         """Calculate distance between two points"""
         try:
@@ -48,7 +122,7 @@ class Point:
     def midpoint(self, other: 'Point') -> 'Point':
         """Calculate midpoint between two points"""
         try:
-            return Point((self.x + other.x) / 2, (self.y + other.y) / 2)
+            return Point.from_floats((self.x + other.x) / 2, (self.y + other.y) / 2)
         except Exception as e:
             raise PointError(f"Error calculating midpoint: {str(e)}")
     
@@ -61,7 +135,7 @@ class Point:
             # For internal division (m:n)
             x = (ratio * other.x + self.x) / (ratio + 1)
             y = (ratio * other.y + self.y) / (ratio + 1)
-            return Point(x, y)
+            return Point.from_floats(x, y)
         except Exception as e:
             raise PointError(f"Error in section formula: {str(e)}")
     
@@ -70,18 +144,230 @@ class Point:
         return {"x": self.x, "y": self.y}
 
 
-class Line:
+class PointArray:
+    """Columnar array of points stored as float64 x and y buffers.
+
+    Buffers are NumPy arrays when NumPy is installed and array('d') otherwise.
+    All bulk operations work on the buffers directly without creating a Point per vertex.
+    """
+    __slots__ = ('xs', 'ys')
+
+    def __init__(self, xs, ys):
+        try:
+            if np is not None:
+                # Existing float64 buffers, including strided views, are used without a copy
+                self.xs = np.asarray(xs, dtype=np.float64)
+                self.ys = np.asarray(ys, dtype=np.float64)
+            else:
+                self.xs = xs if isinstance(xs, array) and xs.typecode == 'd' else array('d', map(float, xs))
+                self.ys = ys if isinstance(ys, array) and ys.typecode == 'd' else array('d', map(float, ys))
+        except (TypeError, ValueError):
+            raise PointError("Coordinates must be numeric values")
+        if len(self.xs) != len(self.ys):
+            raise PointError("x and y buffers must have the same length")
+
+    @classmethod
+    def from_points(cls, points: List[Point]) -> 'PointArray':
+        """Build a point array from a list of Point objects"""
+        return cls([p.x for p in points], [p.y for p in points])
+
+    @classmethod
+    def from_dicts(cls, data: List[dict]) -> 'PointArray':
+        """Build a point array from a list of {"x": .., "y": ..} dictionaries"""
+        try:
+            return cls([float(p.get('x', 0)) for p in data], [float(p.get('y', 0)) for p in data])
+        except (AttributeError, TypeError, ValueError):
+            raise PointError("Invalid point coordinates")
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index: int) -> Point:
+        return Point.from_floats(float(self.xs[index]), float(self.ys[index]))
+
+    def __iter__(self):
+        return map(Point.from_floats, self.to_list(self.xs), self.to_list(self.ys))
+
+    @staticmethod
+    def to_list(buffer) -> List[float]:
+        """Convert a coordinate buffer to a list of Python floats"""
+        return buffer.tolist()
+
+    def to_points(self) -> List[Point]:
+        """Convert to a list of Point objects"""
+        return list(self)
+
+    def to_dicts(self) -> List[dict]:
+        """Convert to a list of dictionaries for JSON serialization"""
+        return [{"x": x, "y": y} for x, y in zip(self.to_list(self.xs), self.to_list(self.ys))]
+
+    def take(self, indices: List[int]) -> 'PointArray':
+        """Return the points at the given indices"""
+        if np is not None:
+            indices = np.asarray(indices, dtype=np.intp)
+            return PointArray(self.xs[indices], self.ys[indices])
+        return PointArray(array('d', [self.xs[i] for i in indices]), array('d', [self.ys[i] for i in indices]))
+
+    def _map(self, fx, fy) -> 'PointArray':
+        # Pure-Python fallback: apply per-coordinate functions without building Points
+        xs, ys = self.xs, self.ys
+        return PointArray(array('d', map(fx, xs, ys)), array('d', map(fy, xs, ys)))
+
+    def distance_to(self, point: Point):
+        """Distance from every point to a single point"""
+        try:
+            if np is not None:
+                return np.hypot(self.xs - point.x, self.ys - point.y)
+            px, py = point.x, point.y
+            return array('d', map(lambda x, y: math.hypot(x - px, y - py), self.xs, self.ys))
+        except Exception as e:
+            raise PointError(f"Error calculating distance: {str(e)}")
+
+    def distances(self, other: 'PointArray'):
+        """Element-wise distance between the points of two arrays"""
+        try:
+            if len(self) != len(other):
+                raise ValueError("Point arrays must have the same length")
+            if np is not None:
+                return np.hypot(self.xs - other.xs, self.ys - other.ys)
+            return array('d', map(lambda x1, y1, x2, y2: math.hypot(x1 - x2, y1 - y2),
+                                  self.xs, self.ys, other.xs, other.ys))
+        except Exception as e:
+            raise PointError(f"Error calculating distance: {str(e)}")
+
+    def midpoints(self, other: 'PointArray') -> 'PointArray':
+        """Element-wise midpoints between the points of two arrays"""
+        return self.section(other, 1.0)
+
+    def section(self, other: 'PointArray', ratio: float) -> 'PointArray':
+        """Element-wise section formula, dividing each segment in ratio m:n where ratio = m/n"""
+        try:
+            if ratio < 0:
+                raise ValueError("Ratio must be positive")
+            if len(self) != len(other):
+                raise ValueError("Point arrays must have the same length")
+            if np is not None:
+                return PointArray((ratio * other.xs + self.xs) / (ratio + 1),
+                                  (ratio * other.ys + self.ys) / (ratio + 1))
+            return PointArray(array('d', map(lambda a, b: (ratio * b + a) / (ratio + 1), self.xs, other.xs)),
+                              array('d', map(lambda a, b: (ratio * b + a) / (ratio + 1), self.ys, other.ys)))
+        except Exception as e:
+            raise PointError(f"Error in section formula: {str(e)}")
+
+    def bounding_box(self) -> Tuple[float, float, float, float]:
+        """Return (min_x, min_y, max_x, max_y) of the points"""
+        if len(self) == 0:
+            raise PointError("Cannot compute the bounding box of an empty point array")
+        if np is not None:
+            return (float(self.xs.min()), float(self.ys.min()), float(self.xs.max()), float(self.ys.max()))
+        return (min(self.xs), min(self.ys), max(self.xs), max(self.ys))
+
+    def translate(self, dx: float, dy: float) -> 'PointArray':
+        """Translate every point by (dx, dy)"""
+        if np is not None:
+            return PointArray(self.xs + dx, self.ys + dy)
+        return self._map(lambda x, y: x + dx, lambda x, y: y + dy)
+
+    def rotate(self, center: Point, angle_deg: float) -> 'PointArray':
+        """Rotate every point around a center by angle in degrees"""
+        return self.transform(AffineTransform.rotation(center, angle_deg))
+
+    def scale(self, center: Point, sx: float, sy: float) -> 'PointArray':
+        """Scale every point from a center by factors sx and sy"""
+        return self.transform(AffineTransform.scaling(center, sx, sy))
+
+    def reflect(self, line: 'Line') -> 'PointArray':
+        """Reflect every point over a line"""
+        return self.transform(AffineTransform.reflection(line))
+
+    def transform(self, transform: 'AffineTransform') -> 'PointArray':
+        """Apply an affine transform to every point in a single pass"""
+        a, b, c, d, e, f = transform.coefficients()
+        if np is not None:
+            return PointArray(a * self.xs + b * self.ys + c, d * self.xs + e * self.ys + f)
+        return self._map(lambda x, y: a * x + b * y + c, lambda x, y: d * x + e * y + f)
+
+    def _next(self):
+        # Coordinates shifted by one vertex, i.e. the end point of each closed-ring edge
+        if np is not None:
+            return np.roll(self.xs, -1), np.roll(self.ys, -1)
+        return self.xs[1:] + self.xs[:1], self.ys[1:] + self.ys[:1]
+
+    def signed_area(self) -> float:
+        """Signed area of the closed ring through the points (positive when counter-clockwise)"""
+        nx, ny = self._next()
+        if np is not None:
+            return float(np.dot(self.xs, ny) - np.dot(nx, self.ys)) / 2.0
+        return math.fsum(map(lambda x1, y1, x2, y2: x1 * y2 - x2 * y1, self.xs, self.ys, nx, ny)) / 2.0
+
+    def ring_perimeter(self) -> float:
+        """Length of the closed ring through the points"""
+        nx, ny = self._next()
+        if np is not None:
+            return float(np.hypot(nx - self.xs, ny - self.ys).sum())
+        return math.fsum(map(lambda x1, y1, x2, y2: math.hypot(x2 - x1, y2 - y1), self.xs, self.ys, nx, ny))
+
+    def ring_centroid(self) -> Point:
+        """Area centroid of the closed ring through the points"""
+        nx, ny = self._next()
+        if np is not None:
+            factor = self.xs * ny - nx * self.ys
+            area6 = 3.0 * float(factor.sum())
+            return Point.from_floats(float(((self.xs + nx) * factor).sum()) / area6,
+                                     float(((self.ys + ny) * factor).sum()) / area6)
+        factors = list(map(lambda x1, y1, x2, y2: x1 * y2 - x2 * y1, self.xs, self.ys, nx, ny))
+        area6 = 3.0 * math.fsum(factors)
+        return Point.from_floats(math.fsum(map(lambda x1, x2, f: (x1 + x2) * f, self.xs, nx, factors)) / area6,
+                                 math.fsum(map(lambda y1, y2, f: (y1 + y2) * f, self.ys, ny, factors)) / area6)
+
+    def turn_crosses(self):
+        """Cross product of consecutive edge vectors at every vertex of the closed ring"""
+        nx, ny = self._next()
+        if np is not None:
+            ex, ey = nx - self.xs, ny - self.ys
+            return ex * np.roll(ey, -1) - ey * np.roll(ex, -1)
+        ex = [x2 - x1 for x1, x2 in zip(self.xs, nx)]
+        ey = [y2 - y1 for y1, y2 in zip(self.ys, ny)]
+        return [dx1 * dy2 - dy1 * dx2
+                for dx1, dy1, dx2, dy2 in zip(ex, ey, ex[1:] + ex[:1], ey[1:] + ey[:1])]
+
+    def has_repeated_vertex(self) -> bool:
+        """Check if any two consecutive vertices of the closed ring coincide"""
+        nx, ny = self._next()
+        if np is not None:
+            return bool(np.any((self.xs == nx) & (self.ys == ny)))
+        return any(x1 == x2 and y1 == y2 for x1, y1, x2, y2 in zip(self.xs, self.ys, nx, ny))
+
+
+class Line(CachedShape):
+    __slots__ = ('point1', 'point2', 'a', 'b', 'c')
+    
     def __init__(self, point1: Point, point2: Point):
         if point1.x == point2.x and point1.y == point2.y:
             raise LineError("Cannot create a line with identical points")
-        self.point1 = point1
-        self.point2 = point2
+        self._init(point1, point2)
+    
+    @classmethod
+    def _from_distinct_points(cls, point1: Point, point2: Point) -> 'Line':
+        # Skip the identical-points check for endpoints already known to differ
+        line = _new(cls)
+        line._init(point1, point2)
+        return line
+    
+    def _init(self, point1: Point, point2: Point):
+        _set(self, 'point1', point1)
+        _set(self, 'point2', point2)
         
         # Calculate line equation in the form ax + by + c = 0
-        self.a = self.point2.y - self.point1.y
-        self.b = self.point1.x - self.point2.x
-        self.c = self.point2.x * self.point1.y - self.point1.x * self.point2.y
+        _set(self, 'a', point2.y - point1.y)
+        _set(self, 'b', point1.x - point2.x)
+        _set(self, 'c', point2.x * point1.y - point1.x * point2.y)
+        _set(self, '_cache', None)
     
+    def __reduce__(self):
+        return (Line, (self.point1, self.point2))
+    
+    @memoized
     def slope(self) -> Optional[float]:
         """Calculate slope of the line"""
         try:
@@ -91,6 +377,7 @@ class Line:
         except Exception as e:
             raise LineError(f"Error calculating slope: {str(e)}")
     
+    @memoized
     def equation(self) -> str:
         """Return the equation of the line in the form ax + by + c = 0"""
         try:
@@ -111,6 +398,7 @@ class Line:
         except Exception as e:
             raise LineError(f"Error generating equation: {str(e)}")
     
+    @memoized
     def length(self) -> float:
         """Calculate length of the line segment"""
         try:
@@ -205,23 +493,34 @@ class Line:
         except Exception as e:
             raise LineError(f"Error finding intersection: {str(e)}")
     
-    def to_dict(self) -> dict:
-        """Convert line to dictionary for JSON serialization"""
-        return {
-            "point1": self.point1.to_dict(),
-            "point2": self.point2.to_dict(),
-            "equation": self.equation(),
-            "slope": self.slope(),
-            "length": self.length()
-        }
+    def bounding_box(self) -> Tuple[float, float, float, float]:
+        """Return (min_x, min_y, max_x, max_y) of the line segment"""
+        return (min(self.point1.x, self.point2.x), min(self.point1.y, self.point2.y),
+                max(self.point1.x, self.point2.x), max(self.point1.y, self.point2.y))
+    
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> dict:
+        """Convert line to dictionary for JSON serialization, computing only the given fields"""
+        return self._select({
+            "point1": self.point1.to_dict,
+            "point2": self.point2.to_dict,
+            "equation": self.equation,
+            "slope": self.slope,
+            "length": self.length
+        }, fields)
 
 
-class Circle:
+class Circle(CachedShape):
+    __slots__ = ('center', 'radius')
+    
     def __init__(self, center: Point, radius: float):
         if radius <= 0:
             raise CircleError("Radius must be positive")
-        self.center = center
-        self.radius = float(radius)
+        _set(self, 'center', center)
+        _set(self, 'radius', float(radius))
+        _set(self, '_cache', None)
+    
+    def __reduce__(self):
+        return (Circle, (self.center, self.radius))
     
     def equation(self) -> str:
         """Return the equation of the circle in the form (x-h)² + (y-k)² = r²"""
@@ -392,33 +691,51 @@ class Circle:
         except Exception as e:
             raise CircleError(f"Error finding intersection with circle: {str(e)}")
     
-    def to_dict(self) -> dict:
-        """Convert circle to dictionary for JSON serialization"""
-        return {
-            "center": self.center.to_dict(),
-            "radius": self.radius,
-            "equation": self.equation(),
-            "area": self.area(),
-            "circumference": self.circumference()
-        }
+    def bounding_box(self) -> Tuple[float, float, float, float]:
+        """Return (min_x, min_y, max_x, max_y) of the circle"""
+        return (self.center.x - self.radius, self.center.y - self.radius,
+                self.center.x + self.radius, self.center.y + self.radius)
+    
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> dict:
+        """Convert circle to dictionary for JSON serialization, computing only the given fields"""
+        return self._select({
+            "center": self.center.to_dict,
+            "radius": lambda: self.radius,
+            "equation": self.equation,
+            "area": self.area,
+            "circumference": self.circumference
+        }, fields)
 
 
-class Triangle:
+class Triangle(CachedShape):
+    __slots__ = ('p1', 'p2', 'p3')
+    
     def __init__(self, p1: Point, p2: Point, p3: Point):
         # Check if points are collinear
         area = 0.5 * abs(p1.x * (p2.y - p3.y) + p2.x * (p3.y - p1.y) + p3.x * (p1.y - p2.y))
         if area < 1e-10:
             raise TriangleError("Points are collinear, cannot form a triangle")
         
-        self.p1 = p1
-        self.p2 = p2
-        self.p3 = p3
-        self.sides = [
-            Line(p1, p2),
-            Line(p2, p3),
-            Line(p3, p1)
+        _set(self, 'p1', p1)
+        _set(self, 'p2', p2)
+        _set(self, 'p3', p3)
+        _set(self, '_cache', None)
+    
+    def __reduce__(self):
+        return (Triangle, (self.p1, self.p2, self.p3))
+    
+    @property
+    @memoized
+    def sides(self) -> List[Line]:
+        """Sides p1-p2, p2-p3 and p3-p1, created on first access"""
+        # Vertices of a non-degenerate triangle are distinct
+        return [
+            Line._from_distinct_points(self.p1, self.p2),
+            Line._from_distinct_points(self.p2, self.p3),
+            Line._from_distinct_points(self.p3, self.p1)
         ]
     
+    @memoized
     def area(self) -> float:
         """Calculate area of the triangle using the cross product method"""
         try:
@@ -430,6 +747,7 @@ class Triangle:
         except Exception as e:
             raise TriangleError(f"Error calculating area: {str(e)}")
     
+    @memoized
     def perimeter(self) -> float:
         """Calculate perimeter of the triangle"""
         try:
@@ -437,6 +755,7 @@ class Triangle:
         except Exception as e:
             raise TriangleError(f"Error calculating perimeter: {str(e)}")
     
+    @memoized
     def centroid(self) -> Point:
         """Calculate centroid of the triangle"""
         try:
@@ -446,6 +765,7 @@ class Triangle:
         except Exception as e:
             raise TriangleError(f"Error calculating centroid: {str(e)}")
     
+    @memoized
     def orthocenter(self) -> Point:
         """Calculate orthocenter of the triangle (intersection of altitudes)"""
         try:
@@ -453,7 +773,7 @@ class Triangle:
             # For each side, create a perpendicular line through the opposite vertex
             
             # Altitude from p1 to side p2-p3
-            side1 = Line(self.p2, self.p3)
+            side1 = self.sides[1]
             if side1.slope() is None:  # Vertical line
                 alt1 = Line(self.p1, Point(self.p2.x, self.p1.y))
             elif side1.slope() == 0:  # Horizontal line
@@ -466,7 +786,7 @@ class Triangle:
                 alt1 = Line(self.p1, Point(x, y))
             
             # Altitude from p2 to side p1-p3
-            side2 = Line(self.p1, self.p3)
+            side2 = self.sides[2]
             if side2.slope() is None:  # Vertical line
                 alt2 = Line(self.p2, Point(self.p1.x, self.p2.y))
             elif side2.slope() == 0:  # Horizontal line
@@ -483,44 +803,17 @@ class Triangle:
         except Exception as e:
             raise TriangleError(f"Error calculating orthocenter: {str(e)}")
     
+    @memoized
     def circumcenter(self) -> Point:
         """Calculate circumcenter of the triangle (center of circumscribed circle)"""
         try:
-            # Create perpendicular bisectors of each side
-            
-            # Bisector of side p1-p2
-            mid1 = self.p1.midpoint(self.p2)
-            side1 = Line(self.p1, self.p2)
-            if side1.slope() is None:  # Vertical line
-                bis1 = Line(mid1, Point(mid1.x + 1, mid1.y))
-            elif side1.slope() == 0:  # Horizontal line
-                bis1 = Line(mid1, Point(mid1.x, mid1.y + 1))
-            else:
-                perp_slope = -1 / side1.slope()
-                # Point on bisector
-                x = mid1.x + 1
-                y = mid1.y + perp_slope
-                bis1 = Line(mid1, Point(x, y))
-            
-            # Bisector of side p2-p3
-            mid2 = self.p2.midpoint(self.p3)
-            side2 = Line(self.p2, self.p3)
-            if side2.slope() is None:  # Vertical line
-                bis2 = Line(mid2, Point(mid2.x + 1, mid2.y))
-            elif side2.slope() == 0:  # Horizontal line
-                bis2 = Line(mid2, Point(mid2.x, mid2.y + 1))
-            else:
-                perp_slope = -1 / side2.slope()
-                # Point on bisector
-                x = mid2.x + 1
-                y = mid2.y + perp_slope
-                bis2 = Line(mid2, Point(x, y))
-            
-            # Find intersection of two bisectors
-            return bis1.intersection_with(bis2)
+            # Closed form; the constructor rejected collinear points, so the center exists
+            return Point.from_floats(*delaunay.circumcenter(self.p1.x, self.p1.y, self.p2.x, self.p2.y,
+                                                            self.p3.x, self.p3.y))
         except Exception as e:
             raise TriangleError(f"Error calculating circumcenter: {str(e)}")
     
+    @memoized
     def incenter(self) -> Point:
         """Calculate incenter of the triangle (center of inscribed circle)"""
         try:
@@ -536,6 +829,7 @@ class Triangle:
         except Exception as e:
             raise TriangleError(f"Error calculating incenter: {str(e)}")
     
+    @memoized
     def circumcircle(self) -> Circle:
         """Calculate circumscribed circle of the triangle"""
         try:
@@ -545,6 +839,7 @@ class Triangle:
         except Exception as e:
             raise TriangleError(f"Error calculating circumcircle: {str(e)}")
     
+    @memoized
     def incircle(self) -> Circle:
         """Calculate inscribed circle of the triangle"""
         try:
@@ -560,140 +855,317 @@ class Triangle:
         except Exception as e:
             raise TriangleError(f"Error calculating incircle: {str(e)}")
     
-    def to_dict(self) -> dict:
-        """Convert triangle to dictionary for JSON serialization"""
-        return {
-            "points": [self.p1.to_dict(), self.p2.to_dict(), self.p3.to_dict()],
-            "area": self.area(),
-            "perimeter": self.perimeter(),
-            "centroid": self.centroid().to_dict(),
-            "orthocenter": self.orthocenter().to_dict() if self.orthocenter() else None,
-            "circumcenter": self.circumcenter().to_dict() if self.circumcenter() else None,
-            "incenter": self.incenter().to_dict()
-        }
-
-
-class Polygon:
-    def __init__(self, points: List[Point]):
+    def contains_point(self, point: Point) -> bool:
+        """Check if a point lies inside or on the triangle"""
+        try:
+            d1 = (self.p2.x - self.p1.x) * (point.y - self.p1.y) - (self.p2.y - self.p1.y) * (point.x - self.p1.x)
+            d2 = (self.p3.x - self.p2.x) * (point.y - self.p2.y) - (self.p3.y - self.p2.y) * (point.x - self.p2.x)
+            d3 = (self.p1.x - self.p3.x) * (point.y - self.p3.y) - (self.p1.y - self.p3.y) * (point.x - self.p3.x)
+            has_neg = d1 < 0 or d2 < 0 or d3 < 0
+            has_pos = d1 > 0 or d2 > 0 or d3 > 0
+            return not (has_neg and has_pos)
+        except Exception as e:
+            raise TriangleError(f"Error checking if point is in triangle: {str(e)}")
+    
+    def bounding_box(self) -> Tuple[float, float, float, float]:
+        """Return (min_x, min_y, max_x, max_y) of the triangle"""
+        xs = (self.p1.x, self.p2.x, self.p3.x)
+        ys = (self.p1.y, self.p2.y, self.p3.y)
+        return (min(xs), min(ys), max(xs), max(ys))
+    
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> dict:
+        """Convert triangle to dictionary for JSON serialization, computing only the given fields"""
+        return self._select({
+            "points": lambda: [self.p1.to_dict(), self.p2.to_dict(), self.p3.to_dict()],
+            "area": self.area,
+            "perimeter": self.perimeter,
+            "centroid": lambda: self.centroid().to_dict(),
+            "orthocenter": lambda: self.orthocenter().to_dict() if self.orthocenter() else None,
+            "circumcenter": lambda: self.circumcenter().to_dict() if self.circumcenter() else None,
+            "incenter": lambda: self.incenter().to_dict()
+        }, fields)
+
+
+class Polygon(CachedShape):
+    __slots__ = ('coords',)
+    
+    def __init__(self, points: Union[List[Point], PointArray]):
         if len(points) < 3:
             raise PolygonError("A polygon must have at least 3 points")
-        self.points = points
-        self.sides = []
-        
-        # Create sides
-        for i in range(len(points)):
-            self.sides.append(Line(points[i], points[(i + 1) % len(points)]))
+        if isinstance(points, PointArray):
+            _set(self, 'coords', points)
+            _set(self, '_cache', None)
+        else:
+            _set(self, 'coords', PointArray.from_points(points))
+            _set(self, '_cache', {'points': list(points)})
+        if self.coords.has_repeated_vertex():
+            raise LineError("Cannot create a line with identical points")
+    
+    def __reduce__(self):
+        return (Polygon, (self.coords,))
+    
+    @property
+    @memoized
+    def points(self) -> List[Point]:
+        """Vertices as Point objects, created on first access for array input"""
+        return self.coords.to_points()
+    
+    @property
+    @memoized
+    def sides(self) -> List[Line]:
+        """Edges as Line objects, created on first access"""
+        # Consecutive vertices were checked to differ in __init__
+        points = self.points
+        return [Line._from_distinct_points(points[i], points[(i + 1) % len(points)]) for i in range(len(points))]
     
+    @memoized
     def area(self) -> float:
         """Calculate area of the polygon using the Shoelace formula"""
         try:
-            n = len(self.points)
-            area = 0.0
-            
-            for i in range(n):
-                j = (i + 1) % n
-                area += self.points[i].x * self.points[j].y
-                area -= self.points[j].x * self.points[i].y
-            
-            return abs(area) / 2.0
+            return abs(self.coords.signed_area())
         except Exception as e:
             raise PolygonError(f"Error calculating area: {str(e)}")
     
+    @memoized
     def perimeter(self) -> float:
         """Calculate perimeter of the polygon"""
         try:
-            return sum(side.length() for side in self.sides)
+            return self.coords.ring_perimeter()
         except Exception as e:
             raise PolygonError(f"Error calculating perimeter: {str(e)}")
     
+    @memoized
     def centroid(self) -> Point:
         """Calculate centroid of the polygon"""
         try:
-            n = len(self.points)
-            area = self.area()
-            
-            cx = 0.0
-            cy = 0.0
-            
-            for i in range(n):
-                j = (i + 1) % n
-                factor = self.points[i].x * self.points[j].y - self.points[j].x * self.points[i].y
-                cx += (self.points[i].x + self.points[j].x) * factor
-                cy += (self.points[i].y + self.points[j].y) * factor
-            
-            cx /= 6 * area
-            cy /= 6 * area
-            
-            return Point(cx, cy)
+            centroid = self.coords.ring_centroid()
+            if self.coords.signed_area() < 0:
+                # The centroid has always been divided by the unsigned area, which
+                # reflects it through the origin for clockwise polygons
+                return Point.from_floats(-centroid.x, -centroid.y)
+            return centroid
         except Exception as e:
             raise PolygonError(f"Error calculating centroid: {str(e)}")
     
+    @memoized
     def is_convex(self) -> bool:
         """Check if the polygon is convex"""
         try:
-            n = len(self.points)
-            if n < 3:
-                return False
-            
-            # For a convex polygon, all cross products should have the same sign
-            sign = 0
-            
-            for i in range(n):
-                j = (i + 1) % n
-                k = (i + 2) % n
-                
-                # Calculate cross product
-                dx1 = self.points[j].x - self.points[i].x
-                dy1 = self.points[j].y - self.points[i].y
-                dx2 = self.points[k].x - self.points[j].x
-                dy2 = self.points[k].y - self.points[j].y
-                
-                cross = dx1 * dy2 - dy1 * dx2
-                
-                if cross != 0:
-                    if sign == 0:
-                        sign = 1 if cross > 0 else -1
-                    elif (cross > 0 and sign < 0) or (cross < 0 and sign > 0):
-                        return False
-            
-            return True
+            # For a convex polygon, all non-zero cross products should have the same sign
+            crosses = self.coords.turn_crosses()
+            if np is not None:
+                return not (bool(np.any(crosses > 0)) and bool(np.any(crosses < 0)))
+            return not (any(c > 0 for c in crosses) and any(c < 0 for c in crosses))
         except Exception as e:
             raise PolygonError(f"Error checking convexity: {str(e)}")
     
+    @memoized
+    def is_simple(self) -> bool:
+        """Check that no edges cross or touch, other than consecutive edges at their shared vertex (Shamos-Hoey sweep)"""
+        try:
+            xs, ys = self.coords.to_list(self.coords.xs), self.coords.to_list(self.coords.ys)
+            return not sweep.ring_crossings(xs, ys, first_only=True)
+        except Exception as e:
+            raise PolygonError(f"Error checking simplicity: {str(e)}")
+    
+    @memoized
+    def self_intersections(self) -> List[Tuple[int, int]]:
+        """Pairs of edges that cross or touch, where edge i runs from vertex i to vertex i + 1"""
+        # The early-exit test settles simple polygons; only the others need the full sweep
+        if self.is_simple():
+            return []
+        try:
+            xs, ys = self.coords.to_list(self.coords.xs), self.coords.to_list(self.coords.ys)
+            return sweep.ring_crossings(xs, ys)
+        except Exception as e:
+            raise PolygonError(f"Error finding self-intersections: {str(e)}")
+    
+    @memoized
+    def triangulate(self) -> List[Tuple[int, int, int]]:
+        """Split the polygon into n - 2 triangles, given as counter-clockwise vertex index triples"""
+        if not self.is_simple():
+            raise PolygonError("Cannot triangulate a self-intersecting polygon")
+        try:
+            xs, ys = self.coords.to_list(self.coords.xs), self.coords.to_list(self.coords.ys)
+            return triangulate.triangulate_polygon(xs, ys)
+        except Exception as e:
+            raise PolygonError(f"Error triangulating polygon: {str(e)}")
+    
+    def boolean(self, other: 'Polygon', operation: str) -> List['Polygon']:
+        """Intersection, union or difference (self minus other) with another simple polygon.
+
+        The result is a list of polygons: outer boundaries run counter-clockwise and holes,
+        if any, clockwise. Shapes touching at a single point come back as separate polygons.
+        """
+        if operation not in overlay.BOOLEAN_OPERATIONS:
+            raise PolygonError(f"Unknown boolean operation: {operation}")
+        if not self.is_simple() or not other.is_simple():
+            raise PolygonError("Boolean operations need polygons that do not intersect themselves")
+        try:
+            coords, other_coords = self.coords, other.coords
+            rings = overlay.boolean(coords.to_list(coords.xs), coords.to_list(coords.ys),
+                                    other_coords.to_list(other_coords.xs), other_coords.to_list(other_coords.ys),
+                                    operation, convex=self.is_convex() and other.is_convex())
+            return [Polygon(PointArray([x for x, _ in ring], [y for _, y in ring])) for ring in rings]
+        except Exception as e:
+            raise PolygonError(f"Error computing polygon {operation}: {str(e)}")
+    
+    def intersection(self, other: 'Polygon') -> List['Polygon']:
+        """Regions covered by both polygons"""
+        return self.boolean(other, 'intersection')
+    
+    def union(self, other: 'Polygon') -> List['Polygon']:
+        """Regions covered by either polygon"""
+        return self.boolean(other, 'union')
+    
+    def difference(self, other: 'Polygon') -> List['Polygon']:
+        """Regions covered by this polygon but not the other"""
+        return self.boolean(other, 'difference')
+    
     def contains_point(self, point: Point) -> bool:
         """Check if a point is inside the polygon using ray casting algorithm"""
         try:
-            n = len(self.points)
+            px, py = point.x, point.y
+            xs, ys = self.coords.to_list(self.coords.xs), self.coords.to_list(self.coords.ys)
             inside = False
             
-            # Ray casting algorithm
-            for i in range(n):
-                j = (i + 1) % n
-                
-                # Check if point is on an edge
-                edge = Line(self.points[i], self.points[j])
-                if edge.point_on_line(point):
+            # Ray casting algorithm over the edges (x1, y1) -> (x2, y2)
+            for x1, y1, x2, y2 in zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1]):
+                # Check if point is on the edge segment
+                if abs((x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)) < 1e-10 and \
+                   min(x1, x2) <= px <= max(x1, x2) and min(y1, y2) <= py <= max(y1, y2):
                     return True
                 
                 # Check if ray from point crosses edge
-                if ((self.points[i].y > point.y) != (self.points[j].y > point.y)) and \
-                   (point.x < (self.points[j].x - self.points[i].x) * (point.y - self.points[i].y) / 
-                             (self.points[j].y - self.points[i].y) + self.points[i].x):
+                if ((y1 > py) != (y2 > py)) and (px < (x2 - x1) * (py - y1) / (y2 - y1) + x1):
                     inside = not inside
             
             return inside
         except Exception as e:
             raise PolygonError(f"Error checking if point is inside polygon: {str(e)}")
     
+    @memoized
+    def prepare(self) -> 'PreparedPolygon':
+        """Return a PreparedPolygon for fast repeated point queries (built once and cached)"""
+        from geometry.prepared import PreparedPolygon
+        return PreparedPolygon(self)
+    
+    def bounding_box(self) -> Tuple[float, float, float, float]:
+        """Return (min_x, min_y, max_x, max_y) of the polygon"""
+        return self.coords.bounding_box()
+    
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> dict:
+        """Convert polygon to dictionary for JSON serialization, computing only the given fields"""
+        return self._select({
+            "points": self.coords.to_dicts,
+            "area": self.area,
+            "perimeter": self.perimeter,
+            "centroid": lambda: self.centroid().to_dict(),
+            "is_convex": self.is_convex
+        }, fields)
+
+
+class AffineTransform:
+    """2D affine transform stored as the top two rows of a 3x3 matrix
+
+    | a  b  c |
+    | d  e  f |
+    | 0  0  1 |
+    """
+    __slots__ = ('a', 'b', 'c', 'd', 'e', 'f')
+
+    def __init__(self, a: float = 1.0, b: float = 0.0, c: float = 0.0,
+                 d: float = 0.0, e: float = 1.0, f: float = 0.0):
+        self.a, self.b, self.c = float(a), float(b), float(c)
+        self.d, self.e, self.f = float(d), float(e), float(f)
+
+    @classmethod
+    def identity(cls) -> 'AffineTransform':
+        """Transform that leaves every point unchanged"""
+        return cls()
+
+    @classmethod
+    def translation(cls, dx: float, dy: float) -> 'AffineTransform':
+        """Translation by (dx, dy)"""
+        return cls(1.0, 0.0, dx, 0.0, 1.0, dy)
+
+    @classmethod
+    def rotation(cls, center: Point, angle_deg: float) -> 'AffineTransform':
+        """Rotation around a center by angle in degrees"""
+        angle_rad = math.radians(angle_deg)
+        cos_a, sin_a = math.cos(angle_rad), math.sin(angle_rad)
+        cx, cy = center.x, center.y
+        return cls(cos_a, -sin_a, cx - cos_a * cx + sin_a * cy,
+                   sin_a, cos_a, cy - sin_a * cx - cos_a * cy)
+
+    @classmethod
+    def scaling(cls, center: Point, sx: float, sy: float) -> 'AffineTransform':
+        """Scaling from a center by factors sx and sy"""
+        return cls(sx, 0.0, center.x - sx * center.x, 0.0, sy, center.y - sy * center.y)
+
+    @classmethod
+    def reflection(cls, line: 'Line') -> 'AffineTransform':
+        """Reflection over a line ax + by + c = 0"""
+        a, b, c = line.a, line.b, line.c
+        norm = a * a + b * b
+        return cls(1 - 2 * a * a / norm, -2 * a * b / norm, -2 * a * c / norm,
+                   -2 * a * b / norm, 1 - 2 * b * b / norm, -2 * b * c / norm)
+
+    @classmethod
+    def reflection_x(cls) -> 'AffineTransform':
+        """Reflection over the x-axis"""
+        return cls(1.0, 0.0, 0.0, 0.0, -1.0, 0.0)
+
+    @classmethod
+    def reflection_y(cls) -> 'AffineTransform':
+        """Reflection over the y-axis"""
+        return cls(-1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+
+    @classmethod
+    def compose(cls, transforms: List['AffineTransform']) -> 'AffineTransform':
+        """Fuse a sequence of transforms, applied first to last, into one transform"""
+        result = cls.identity()
+        for transform in transforms:
+            result = result.then(transform)
+        return result
+
+    def coefficients(self) -> Tuple[float, float, float, float, float, float]:
+        """Return (a, b, c, d, e, f)"""
+        return self.a, self.b, self.c, self.d, self.e, self.f
+
+    def matrix(self) -> List[List[float]]:
+        """Return the full 3x3 matrix"""
+        return [[self.a, self.b, self.c], [self.d, self.e, self.f], [0.0, 0.0, 1.0]]
+
+    def then(self, other: 'AffineTransform') -> 'AffineTransform':
+        """Transform that applies self first and other second"""
+        return other @ self
+
+    def __matmul__(self, other: 'AffineTransform') -> 'AffineTransform':
+        # Matrix product: (self @ other) applies other first and self second
+        return AffineTransform(
+            self.a * other.a + self.b * other.d,
+            self.a * other.b + self.b * other.e,
+            self.a * other.c + self.b * other.f + self.c,
+            self.d * other.a + self.e * other.d,
+            self.d * other.b + self.e * other.e,
+            self.d * other.c + self.e * other.f + self.f
+        )
+
+    def apply(self, point: Point) -> Point:
+        """Apply the transform to a single point"""
+        return Point.from_floats(self.a * point.x + self.b * point.y + self.c,
+                                 self.d * point.x + self.e * point.y + self.f)
+
+    def apply_shape(self, points: Union[List[Point], PointArray]) -> Union[List[Point], PointArray]:
+        """Apply the transform to a shape (list of points or point array)"""
+        if isinstance(points, PointArray):
+            return points.transform(self)
+        return [self.apply(p) for p in points]
+
     def to_dict(self) -> dict:
-        """Convert polygon to dictionary for JSON serialization"""
-        return {
-            "points": [p.to_dict() for p in self.points],
-            "area": self.area(),
-            "perimeter": self.perimeter(),
-            "centroid": self.centroid().to_dict(),
-            "is_convex": self.is_convex()
-        }
+        """Convert transform to dictionary for JSON serialization"""
+        return {"matrix": self.matrix()}
 
 
 class Transformations:
@@ -706,9 +1178,11 @@ class Transformations:
             raise GeometryError(f"Error in translation: {str(e)}")
     
     @staticmethod
-    def translate_shape(points: List[Point], dx: float, dy: float) -> List[Point]:
-        """Translate a shape (list of points) by (dx, dy)"""
+    def translate_shape(points: Union[List[Point], PointArray], dx: float, dy: float) -> Union[List[Point], PointArray]:
+        """Translate a shape (list of points or point array) by (dx, dy)"""
         try:
+            if isinstance(points, PointArray):
+                return points.translate(dx, dy)
             return [Transformations.translate(p, dx, dy) for p in points]
         except Exception as e:
             raise GeometryError(f"Error in shape translation: {str(e)}")
@@ -733,10 +1207,10 @@ class Transformations:
             raise GeometryError(f"Error in rotation: {str(e)}")
     
     @staticmethod
-    def rotate_shape(points: List[Point], center: Point, angle_deg: float) -> List[Point]:
-        """Rotate a shape (list of points) around a center by angle in degrees"""
+    def rotate_shape(points: Union[List[Point], PointArray], center: Point, angle_deg: float) -> Union[List[Point], PointArray]:
+        """Rotate a shape (list of points or point array) around a center by angle in degrees"""
         try:
-            return [Transformations.rotate(p, center, angle_deg) for p in points]
+            return AffineTransform.rotation(center, angle_deg).apply_shape(points)
         except Exception as e:
             raise GeometryError(f"Error in shape rotation: {str(e)}")
     
@@ -790,10 +1264,10 @@ class Transformations:
             raise GeometryError(f"Error in reflection over line: {str(e)}")
     
     @staticmethod
-    def reflect_shape(points: List[Point], line: Line) -> List[Point]:
-        """Reflect a shape (list of points) over a line"""
+    def reflect_shape(points: Union[List[Point], PointArray], line: Line) -> Union[List[Point], PointArray]:
+        """Reflect a shape (list of points or point array) over a line"""
         try:
-            return [Transformations.reflect_over_line(p, line) for p in points]
+            return AffineTransform.reflection(line).apply_shape(points)
         except Exception as e:
             raise GeometryError(f"Error in shape reflection: {str(e)}")
     
@@ -815,14 +1289,21 @@ class Transformations:
             raise GeometryError(f"Error in scaling: {str(e)}")
     
     @staticmethod
-    def scale_shape(points: List[Point], center: Point, sx: float, sy: float) -> List[Point]:
-        """Scale a shape (list of points) from a center by factors sx and sy"""
+    def scale_shape(points: Union[List[Point], PointArray], center: Point, sx: float, sy: float) -> Union[List[Point], PointArray]:
+        """Scale a shape (list of points or point array) from a center by factors sx and sy"""
         try:
-            return [Transformations.scale(p, center, sx, sy) for p in points]
+            return AffineTransform.scaling(center, sx, sy).apply_shape(points)
         except Exception as e:
             raise GeometryError(f"Error in shape scaling: {str(e)}")
 
 
+def _coordinates(points: Union[List[Point], PointArray]) -> Tuple[List[float], List[float]]:
+    # x and y coordinates as lists of floats, for the engines working on coordinate buffers
+    if isinstance(points, PointArray):
+        return points.to_list(points.xs), points.to_list(points.ys)
+    return [p.x for p in points], [p.y for p in points]
+
+
 class GeometryEngine:
     """Main class to handle all geometry operations"""
     
@@ -860,45 +1341,128 @@ class GeometryEngine:
         return polygon.contains_point(point)
     
     @staticmethod
-    def convex_hull(points: List[Point]) -> List[Point]:
-        """Calculate the convex hull of a set of points using Graham scan algorithm"""
+    def convex_hull(points: Union[List[Point], PointArray], method: str = 'monotone') -> Union[List[Point], PointArray]:
+        """Calculate the convex hull of a set of points (counter-clockwise, starting at the lowest point)
+
+        method is 'monotone' (Andrew's monotone chain) or 'quickhull' (output-sensitive).
+        Interior points are discarded up front with the Akl-Toussaint heuristic.
+        """
         try:
             if len(points) <= 2:
                 return points
-            
-            # Find the point with the lowest y-coordinate (and leftmost if tied)
-            pivot = min(points, key=lambda p: (p.y, p.x))
-            
-            # Sort points by polar angle with respect to pivot
-            def polar_angle(p):
-                if p.x == pivot.x and p.y == pivot.y:
-                    return -float('inf')  # Pivot comes first
-                return math.atan2(p.y - pivot.y, p.x - pivot.x)
-            
-            sorted_points = sorted(points, key=polar_angle)
-            
-            # Graham scan algorithm
-            hull = [sorted_points[0], sorted_points[1]]
-            
-            for i in range(2, len(sorted_points)):
-                while len(hull) > 1:
-                    # Check if the last three points make a right turn
-                    p1, p2, p3 = hull[-2], hull[-1], sorted_points[i]
-                    
-                    # Cross product to determine turn direction
-                    cross = (p2.x - p1.x) * (p3.y - p1.y) - (p2.y - p1.y) * (p3.x - p1.x)
-                    
-                    # If right turn or collinear, remove the middle point
-                    if cross <= 0:
-                        hull.pop()
-                    else:
-                        break
-                
-                hull.append(sorted_points[i])
-            
-            return hull
+            if isinstance(points, PointArray):
+                return points.take(hull.convex_hull_indices(points.xs, points.ys, method))
+            indices = hull.convex_hull_indices([p.x for p in points], [p.y for p in points], method)
+            return [points[i] for i in indices]
         except Exception as e:
             raise GeometryError(f"Error calculating convex hull: {str(e)}")
+
+    @staticmethod
+    def segment_intersections(segments: List[Tuple[Point, Point]]) -> Tuple[List[Tuple[Point, List[int]]],
+                                                                            List[Tuple[List[int], Point, Point]]]:
+        """Find every point where two or more segments meet, with a Bentley-Ottmann sweep
+
+        Returns the intersection points with the indices of the segments through each, and
+        the parts shared by collinear overlapping segments as (indices, start, end).
+        """
+        try:
+            result = sweep.segment_intersections([a.x for a, _ in segments], [a.y for a, _ in segments],
+                                                 [b.x for _, b in segments], [b.y for _, b in segments])
+            intersections = [(Point.from_floats(found.x, found.y), list(found.segments))
+                             for found in result.intersections]
+            overlaps = [(list(overlap.segments), Point.from_floats(*overlap.start), Point.from_floats(*overlap.end))
+                        for overlap in result.overlaps]
+            return intersections, overlaps
+        except Exception as e:
+            raise GeometryError(f"Error finding segment intersections: {str(e)}")
+    
+    @staticmethod
+    def nearest_neighbors(points: Union[List[Point], PointArray], queries: Union[List[Point], PointArray],
+                          k: int = 1) -> List[List[Tuple[int, float]]]:
+        """For each query point, the indices of its k nearest points and their distances, nearest first
+        
+        The points are indexed once in a KD-tree, so each query takes O(log n) on average.
+        """
+        try:
+            if k < 1:
+                raise GeometryError("k must be at least 1")
+            tree = kdtree.KDTree(*_coordinates(points))
+            return [tree.nearest(x, y, k) for x, y in zip(*_coordinates(queries))]
+        except Exception as e:
+            raise GeometryError(f"Error finding nearest neighbors: {str(e)}")
+    
+    @staticmethod
+    def radius_query(points: Union[List[Point], PointArray], queries: Union[List[Point], PointArray],
+                     radius: float) -> List[List[Tuple[int, float]]]:
+        """For each query point, the indices of the points within radius of it and their distances, nearest first"""
+        try:
+            if radius < 0:
+                raise GeometryError("Radius must be non-negative")
+            tree = kdtree.KDTree(*_coordinates(points))
+            return [tree.within(x, y, radius) for x, y in zip(*_coordinates(queries))]
+        except Exception as e:
+            raise GeometryError(f"Error finding points within radius: {str(e)}")
+    
+    @staticmethod
+    def closest_pair(points: Union[List[Point], PointArray]) -> Tuple[int, int, float]:
+        """Indices (i < j) and distance of the two closest points, by divide and conquer in O(n log n)"""
+        try:
+            if len(points) < 2:
+                raise GeometryError("At least two points are needed")
+            return kdtree.closest_pair(*_coordinates(points))
+        except Exception as e:
+            raise GeometryError(f"Error finding closest pair: {str(e)}")
+    
+    @staticmethod
+    def delaunay(points: Union[List[Point], PointArray]) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int, int]]]:
+        """Delaunay triangulation of a point set by incremental Bowyer-Watson insertion, O(n log n) expected
+        
+        Returns the triangles as counter-clockwise point index triples and, for each, the
+        triangles across the edges opposite its vertices (-1 on the convex hull). Duplicate
+        points appear under their first index; collinear point sets have no triangles.
+        """
+        try:
+            return tuple(delaunay.triangulate(*_coordinates(points)))
+        except Exception as e:
+            raise GeometryError(f"Error computing Delaunay triangulation: {str(e)}")
+    
+    @staticmethod
+    def voronoi(points: Union[List[Point], PointArray]) -> Tuple[PointArray, List[Tuple[List[int], List[Point]]]]:
+        """Voronoi diagram of a point set, derived from its Delaunay triangulation
+        
+        Returns the Voronoi vertices and, for each input point, the indices of its cell's
+        vertices counter-clockwise. Unbounded cells also have two ray directions: the cell
+        leaves its first vertex along the first ray and its last vertex along the second.
+        """
+        try:
+            diagram = delaunay.voronoi(*_coordinates(points))
+            cells = [(cell.vertices, [Point.from_floats(dx, dy) for dx, dy in cell.rays]) for cell in diagram.cells]
+            return PointArray(diagram.xs, diagram.ys), cells
+        except Exception as e:
+            raise GeometryError(f"Error computing Voronoi diagram: {str(e)}")
+    
+    @staticmethod
+    def min_enclosing_circle(points: Union[List[Point], PointArray],
+                             hull_points: Optional[Union[List[Point], PointArray]] = None) -> Circle:
+        """Smallest circle containing all the points, by randomized Welzl in O(n) expected time
+        
+        Only hull vertices can touch the circle, so when the convex hull of the points is
+        already known (see convex_hull), pass it as hull_points and only its vertices are searched.
+        """
+        try:
+            if hull_points is not None and len(hull_points) > 0:
+                points = hull_points
+            if len(points) == 0:
+                raise GeometryError("At least one point is needed")
+            if isinstance(points, PointArray):
+                found = enclosing.min_enclosing_circle(points.xs, points.ys)
+            else:
+                found = enclosing.min_enclosing_circle(*_coordinates(points))
+            if found.radius == 0:
+                raise GeometryError("All points coincide")
+            return Circle(Point.from_floats(found.x, found.y), found.radius)
+        except Exception as e:
+            raise GeometryError(f"Error computing minimum enclosing circle: {str(e)}")
     
     @staticmethod
     def create_point(x: float, y: float) -> Point:
@@ -0,0 +1,273 @@
+"""Size-aware offload of expensive operations to a process pool.
+
+Operations whose input holds fewer than min_points points run inline in the
+request thread. Larger ones are sent to a ProcessPoolExecutor so cheap
+requests are not stuck behind them. Point arrays cross the process boundary
+through a shared memory block, and so do point arrays in the result. Only the
+remaining, small arguments are pickled.
+
+Each offloaded request has a deadline. It covers the time spent waiting in
+the queue, and the worker also enforces it while computing (with SIGALRM,
+where available). A request that is still queued at its deadline is
+cancelled. The number of offloaded requests in flight is bounded, and
+requests beyond the bound are rejected instead of queued.
+"""
+import os
+import signal
+import threading
+import time
+from array import array
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+from geometry.models import GeometryError, PointArray
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, shared buffers are copied into array('d') instead
+    np = None
+
+DEFAULT_MIN_POINTS = 50000
+DEFAULT_TIMEOUT = 30.0
+# Extra time the request thread waits past the deadline for the worker to report its own timeout
+RESULT_GRACE = 1.0
+
+# (key, point count) of each array stored in a shared block, in storage order
+Layout = List[Tuple[str, int]]
+
+
+class OffloadError(GeometryError):
+    """Exception for offloaded computations that could not be completed"""
+    code = 'offload_error'
+    status = 500
+
+
+class OffloadTimeout(OffloadError):
+    """Exception for offloaded computations that ran past their deadline"""
+    code = 'timeout'
+    status = 504
+
+
+class OffloadBusy(OffloadError):
+    """Exception for requests rejected because the offload queue is full"""
+    code = 'server_busy'
+    status = 503
+
+
+def estimate_cost(args: Dict[str, Any]) -> int:
+    """Cost of running an operation on parsed arguments: the number of points or shapes in its inputs"""
+    return sum(len(value) for value in args.values() if isinstance(value, (PointArray, list)))
+
+
+def share_arrays(arrays: Dict[str, PointArray]) -> Tuple[SharedMemory, Layout]:
+    """Copy point arrays into a new shared memory block: all x buffers, then all y buffers"""
+    layout = [(key, len(points)) for key, points in arrays.items()]
+    total = sum(size for _, size in layout)
+    block = SharedMemory(create=True, size=max(16 * total, 1))
+    try:
+        offset = 0
+        for attribute in ('xs', 'ys'):
+            for key, size in layout:
+                buffer = getattr(arrays[key], attribute)
+                if np is not None:
+                    np.ndarray(size, dtype=np.float64, buffer=block.buf, offset=offset)[:] = buffer
+                else:
+                    block.buf[offset:offset + 8 * size] = buffer.tobytes()
+                offset += 8 * size
+    except BaseException:
+        release(block, unlink=True)
+        raise
+    return block, layout
+
+
+def attach_arrays(name: str, layout: Layout, copy: bool = False) -> Tuple[SharedMemory, Dict[str, PointArray]]:
+    """Open a shared block written by share_arrays; the arrays are views of it unless copy is set"""
+    block = SharedMemory(name=name)
+    total = sum(size for _, size in layout)
+    arrays, offset = {}, 0
+    for key, size in layout:
+        arrays[key] = PointArray(_read(block, offset, size, copy), _read(block, offset + 8 * total, size, copy))
+        offset += 8 * size
+    return block, arrays
+
+
+def _read(block: SharedMemory, offset: int, size: int, copy: bool):
+    if np is not None:
+        view = np.ndarray(size, dtype=np.float64, buffer=block.buf, offset=offset)
+        return view.copy() if copy else view
+    values = array('d')
+    values.frombytes(block.buf[offset:offset + 8 * size])
+    return values
+
+
+def release(block: SharedMemory, unlink: bool = False):
+    """Close a shared block, and remove it if unlink is set"""
+    try:
+        block.close()
+    except BufferError:
+        pass  # Views of the block are still alive; the mapping goes when they do
+    if unlink:
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _DeadlineExceeded(BaseException):
+    # Raised by the alarm; a BaseException so the models' "except Exception" wrappers let it through
+    pass
+
+
+def _alarm(signum, frame):
+    raise _DeadlineExceeded()
+
+
+def _run_in_worker(name: str, args: Dict[str, Any], block_name: Optional[str], layout: Layout,
+                   fields, lean: bool, deadline: float):
+    # Runs in a pool process: rebuild the arguments, compute and resolve the result, and
+    # hand its point arrays back through a new shared block
+    from geometry.operations import OPERATIONS, resolve
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise OffloadTimeout("Computation exceeded its time limit")
+    block = arrays = result = None
+    timer = hasattr(signal, 'setitimer')
+    if timer:
+        previous = signal.signal(signal.SIGALRM, _alarm)
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        if block_name is not None:
+            block, arrays = attach_arrays(block_name, layout)
+            args = dict(args, **arrays)
+        result = resolve(OPERATIONS[name].handler(**args), fields, lean, keep_arrays=True)
+        return _export(result)
+    except _DeadlineExceeded:
+        raise OffloadTimeout("Computation exceeded its time limit") from None
+    finally:
+        if timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        # Drop the views of the input block so it can be closed
+        args = arrays = result = None
+        if block is not None:
+            release(block)
+
+
+def _export(result) -> Tuple[Any, Optional[str], Layout]:
+    # Move the top-level point arrays of a result to a shared block the parent unlinks
+    if not isinstance(result, dict):
+        return result, None, []
+    arrays = {key: value for key, value in result.items() if isinstance(value, PointArray)}
+    if not arrays:
+        return result, None, []
+    out, layout = share_arrays(arrays)
+    release(out)
+    return {key: value for key, value in result.items() if key not in arrays}, out.name, layout
+
+
+class Offloader:
+    """Runs expensive operations in a lazily started process pool.
+
+    workers=0 turns offloading off. max_pending bounds the offloaded requests in flight
+    (queued or running); it defaults to twice the worker count.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_points: int = DEFAULT_MIN_POINTS,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT, max_pending: Optional[int] = None):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.min_points = min_points
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.offloaded = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def should_offload(self, args: Dict[str, Any]) -> bool:
+        return self.enabled and estimate_cost(args) >= self.min_points
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            # A pool inherited through fork (e.g. by a pre-fork server worker) is not usable
+            if self._executor is None or self._pid != os.getpid():
+                # Forking a threaded server is unsafe; the fork server starts clean processes
+                context = get_context('forkserver' if 'forkserver' in get_all_start_methods() else 'spawn')
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+                self._pid = os.getpid()
+            return self._executor
+
+    def run(self, name: str, args: Dict[str, Any], fields=None, lean: bool = False, keep_arrays: bool = False):
+        """Run operation name on its parsed arguments in the pool and return its resolved result"""
+        limit = self.max_pending or 2 * self.workers
+        with self._lock:
+            if self._pending >= limit:
+                self.rejected += 1
+                raise OffloadBusy("Too many large requests in progress, try again later")
+            self._pending += 1
+        block = None
+        try:
+            arrays = {key: value for key, value in args.items() if isinstance(value, PointArray)}
+            rest = {key: value for key, value in args.items() if key not in arrays}
+            layout = []
+            if arrays:
+                block, layout = share_arrays(arrays)
+            timeout = self.timeout
+            deadline = time.time() + timeout if timeout else float('inf')
+            future = self._pool().submit(_run_in_worker, name, rest, block.name if block else None, layout,
+                                         fields, lean, deadline)
+            try:
+                result, out_name, out_layout = future.result(timeout + RESULT_GRACE if timeout else None)
+            except (FutureTimeoutError, CancelledError):
+                future.cancel()
+                self.timeouts += 1
+                raise OffloadTimeout(f"Computation did not finish within {timeout:g} seconds")
+            except OffloadTimeout:
+                self.timeouts += 1
+                raise
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool for the next request
+                with self._lock:
+                    self._executor = None
+                raise OffloadError("A worker process stopped unexpectedly")
+            self.offloaded += 1
+        finally:
+            if block is not None:
+                release(block, unlink=True)
+            with self._lock:
+                self._pending -= 1
+
+        if out_name is not None:
+            out, arrays = attach_arrays(out_name, out_layout, copy=True)
+            release(out, unlink=True)
+            for key, points in arrays.items():
+                result[key] = points if keep_arrays else points.to_dicts()
+        return result
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'workers': self.workers,
+            'min_points': self.min_points,
+            'timeout': self.timeout,
+            'pending': self._pending,
+            'offloaded': self.offloaded,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
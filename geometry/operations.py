@@ -0,0 +1,756 @@
+import functools
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from geometry.cache import MISS, ResultCache, canonical_key
+from geometry.hull import HULL_METHODS
+from geometry.index import SpatialIndex
+from geometry.offload import Offloader
+from geometry.overlay import BOOLEAN_OPERATIONS
+from geometry.models import (
+    Point, PointArray, Line, Circle, Triangle, Polygon, Transformations, GeometryEngine, AffineTransform,
+    CachedShape, GeometryError
+)
+from geometry.schema import (
+    Field, ValidationError, compile_schema, nested, list_of, choice,
+    NUMBER, INTEGER, BOOLEAN, STRING, POINT, POINTS, LINE, CIRCLE, SEGMENT
+)
+
+class OperationError(GeometryError):
+    """Exception for unknown or malformed operations"""
+    code = 'invalid_operation'
+
+class CachePolicy(NamedTuple):
+    # Payload keys holding polygon rings whose vertex rotation does not change the result
+    rings: Tuple[str, ...] = ()
+    # Rebuilds the parts of a cached result that echo the request, given (result, data)
+    echo: Optional[Callable[[dict, dict], dict]] = None
+
+class Operation:
+    """A registered operation: its input schema, compiled validator and model call"""
+    __slots__ = ('name', 'handler', 'schema', 'validate', 'cache')
+
+    def __init__(self, name: str, handler: Callable[..., Any], schema: Dict[str, Field],
+                 cache: Optional[CachePolicy]):
+        self.name = name
+        self.handler = handler
+        self.schema = schema
+        self.validate = compile_schema(schema)
+        self.cache = cache
+
+    def __call__(self, data) -> Any:
+        """Validate a payload and run the operation on it, returning the raw result"""
+        return self.handler(**self.validate(data))
+
+# Registry of every geometry operation, keyed by its API name (e.g. "line/intersection")
+OPERATIONS: Dict[str, Operation] = {}
+
+# Upper bound on the number of operations accepted in a single batch
+MAX_BATCH_SIZE = 10000
+
+# Shared cache of operation results
+RESULT_CACHE = ResultCache()
+
+# Process pool for operations on large inputs
+OFFLOADER = Offloader()
+
+def operation(name: str, schema: Optional[Dict[str, Field]] = None, cache: bool = True,
+              rings: Tuple[str, ...] = (), echo: Optional[Callable[[dict, dict], dict]] = None):
+    """Register a function as the handler of an operation.
+
+    schema maps payload keys to Fields; the handler is called with the parsed values as
+    keyword arguments. Pass cache=False for operations with side effects or results that
+    depend on server state.
+    """
+    def decorator(func):
+        policy = CachePolicy(rings, echo) if cache else None
+        OPERATIONS[name] = Operation(name, func, schema or {}, policy)
+        return func
+    return decorator
+
+def error_code(error: Exception) -> str:
+    """Stable error code for an exception raised while running an operation"""
+    if isinstance(error, GeometryError):
+        return error.code
+    return 'internal_error'
+
+def error_info(error: Exception) -> dict:
+    """Structured description of an error: message, code and, for bad input, the payload path"""
+    info = {'error': str(error), 'code': error_code(error)}
+    path = getattr(error, 'path', None)
+    if path:
+        info['path'] = path
+    return info
+
+# Operations return raw results: dicts whose values may be Lazy (computed only when
+# the caller asks for them), Echo (input repeated back, dropped in lean mode), shapes,
+# points or point arrays. resolve() turns a raw result into its JSON-ready form.
+class Lazy:
+    """Result value computed only if it is part of the response"""
+    __slots__ = ('func',)
+
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+
+class Echo:
+    """Result value that repeats the request's input back; omitted in lean mode"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+# Requested fields as a tree: {"polygon": {"area": None}} for "polygon.area"; None selects everything
+Fields = Optional[Dict[str, Any]]
+
+def parse_fields(fields: Union[None, str, Iterable[str]]) -> Fields:
+    """Parse a field projection such as "area,polygon.points" into a field tree"""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    tree = {}
+    for path in fields:
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        parts = path.split('.')
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break  # An ancestor is already selected whole
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree or None
+
+def resolve(value, fields: Fields = None, lean: bool = False, keep_arrays: bool = False):
+    """Evaluate a raw operation result, computing and keeping only the requested fields.
+
+    With keep_arrays, point arrays are returned as PointArray instead of lists of
+    dictionaries (for binary responses).
+    """
+    if isinstance(value, Echo):
+        value = value.value
+    if isinstance(value, Lazy):
+        value = value.func()
+    if keep_arrays and isinstance(value, PointArray):
+        return value
+    if isinstance(value, CachedShape):
+        value = value.to_dict(list(fields) if fields is not None else None)
+    elif isinstance(value, Point):
+        value = value.to_dict()
+    elif isinstance(value, PointArray):
+        value = value.to_dicts()
+
+    if isinstance(value, list):
+        return [resolve(item, fields, lean, keep_arrays) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if fields is None:
+        return {key: resolve(item, keep_arrays=keep_arrays) for key, item in value.items()
+                if not (lean and isinstance(item, Echo))}
+    unknown = [key for key in fields if key not in value]
+    if unknown:
+        raise OperationError(f"Unknown field: {unknown[0]}")
+    # Explicitly requested fields are kept even in lean mode
+    return {key: resolve(value[key], fields[key], keep_arrays=keep_arrays) for key in value if key in fields}
+
+def run_operation(name: str, data: dict, fields: Union[None, str, Iterable[str]] = None,
+                  lean: bool = False, keep_arrays: bool = False, use_cache: bool = True) -> dict:
+    """Run a registered operation on a request payload and return its result.
+
+    fields limits the result to the given keys ("area", "polygon.points", ...) and lean
+    drops the parts of the result that echo the input; neither is computed when left out.
+    keep_arrays leaves top-level point arrays as PointArray; such results are not cached.
+    use_cache=False always computes the result, without reading or filling the cache.
+    """
+    op = OPERATIONS.get(name)
+    if op is None:
+        raise OperationError(f"Unknown operation: {name}")
+    fields = parse_fields(fields)
+    policy = op.cache
+    if policy is None or not RESULT_CACHE.enabled or keep_arrays or not use_cache:
+        return _compute(op, data, fields, lean, keep_arrays)
+
+    try:
+        key = canonical_key(name, data, policy.rings, variant=[fields, bool(lean)])
+    except (TypeError, ValueError, KeyError, AttributeError):
+        # Malformed payload: let the validator report the error
+        return _compute(op, data, fields, lean)
+    result = RESULT_CACHE.get(key)
+    if result is MISS:
+        result = _compute(op, data, fields, lean)
+        RESULT_CACHE.put(key, result)
+    elif policy.echo is not None:
+        result = policy.echo(result, data)
+    return result
+
+def _compute(op: Operation, data, fields: Fields, lean: bool, keep_arrays: bool = False):
+    # Validate, then run inline or, for large inputs, in the offload pool. Operations
+    # registered with cache=False depend on in-process state and always run inline.
+    args = op.validate(data)
+    if op.cache is not None and OFFLOADER.should_offload(args):
+        return OFFLOADER.run(op.name, args, fields, lean, keep_arrays)
+    return resolve(op.handler(**args), fields, lean, keep_arrays)
+
+def run_batch(items: List[dict], use_cache: bool = True) -> List[dict]:
+    """Run a list of {"op": ..., "args": {...}} items, collecting per-item success or error.
+
+    Items may also carry "fields" and "lean", as accepted by run_operation.
+    """
+    if not isinstance(items, list):
+        raise OperationError("Batch must be a list of operations")
+    if len(items) > MAX_BATCH_SIZE:
+        raise OperationError(f"Batch exceeds the maximum of {MAX_BATCH_SIZE} operations")
+
+    results = []
+    for item in items:
+        try:
+            if not isinstance(item, dict) or 'op' not in item:
+                raise OperationError("Each batch item must be an object with an 'op' key")
+            result = run_operation(item['op'], item.get('args', {}), item.get('fields'), item.get('lean', False),
+                                   use_cache=use_cache)
+            results.append({'success': True, 'result': result})
+        except Exception as e:
+            results.append(dict(error_info(e), success=False))
+    return results
+
+# Helper functions to build models from request data
+def parse_point_array(data) -> PointArray:
+    if isinstance(data, PointArray):
+        # Already decoded, e.g. from a binary request body
+        return data
+    return PointArray.from_dicts(data)
+
+# Point operations
+@operation('point/distance', {'point1': POINT, 'point2': POINT})
+def point_distance(point1, point2):
+    return {
+        'distance': Lazy(lambda: point1.distance_to(point2)),
+        'point1': Echo(point1),
+        'point2': Echo(point2)
+    }
+
+@operation('point/midpoint', {'point1': POINT, 'point2': POINT})
+def point_midpoint(point1, point2):
+    return {
+        'midpoint': Lazy(lambda: point1.midpoint(point2)),
+        'point1': Echo(point1),
+        'point2': Echo(point2)
+    }
+
+@operation('point/section', {'point1': POINT, 'point2': POINT, 'ratio': NUMBER})
+def point_section(point1, point2, ratio):
+    return {
+        'section_point': Lazy(lambda: point1.section_formula(point2, ratio)),
+        'point1': Echo(point1),
+        'point2': Echo(point2),
+        'ratio': Echo(ratio)
+    }
+
+# Line operations
+LINE_SCHEMA = {'point1': POINT, 'point2': POINT}
+
+@operation('line/create', LINE_SCHEMA)
+def line_create(point1, point2):
+    return Line(point1, point2)
+
+@operation('line/slope', LINE_SCHEMA)
+def line_slope(point1, point2):
+    line = Line(point1, point2)
+    return {
+        'slope': Lazy(line.slope),
+        'line': Echo(line)
+    }
+
+@operation('line/equation', LINE_SCHEMA)
+def line_equation(point1, point2):
+    line = Line(point1, point2)
+    return {
+        'equation': Lazy(line.equation),
+        'line': Echo(line)
+    }
+
+@operation('line/parallel', {'line1': LINE, 'line2': LINE})
+def line_parallel(line1, line2):
+    return {
+        'is_parallel': Lazy(lambda: line1.is_parallel(line2)),
+        'line1': Echo(line1),
+        'line2': Echo(line2)
+    }
+
+@operation('line/perpendicular', {'line1': LINE, 'line2': LINE})
+def line_perpendicular(line1, line2):
+    return {
+        'is_perpendicular': Lazy(lambda: line1.is_perpendicular(line2)),
+        'line1': Echo(line1),
+        'line2': Echo(line2)
+    }
+
+@operation('line/angle', {'line1': LINE, 'line2': LINE})
+def line_angle(line1, line2):
+    return {
+        'angle': Lazy(lambda: line1.angle_with(line2)),
+        'line1': Echo(line1),
+        'line2': Echo(line2)
+    }
+
+@operation('line/intersection', {'line1': LINE, 'line2': LINE})
+def line_intersection(line1, line2):
+    return {
+        'intersection': Lazy(lambda: line1.intersection_with(line2)),
+        'line1': Echo(line1),
+        'line2': Echo(line2)
+    }
+
+# Circle operations
+CIRCLE_SCHEMA = {'center': POINT, 'radius': NUMBER}
+
+@operation('circle/create', CIRCLE_SCHEMA)
+def circle_create(center, radius):
+    return Circle(center, radius)
+
+@operation('circle/area', CIRCLE_SCHEMA)
+def circle_area(center, radius):
+    circle = Circle(center, radius)
+    return {
+        'area': Lazy(circle.area),
+        'circle': Echo(circle)
+    }
+
+@operation('circle/circumference', CIRCLE_SCHEMA)
+def circle_circumference(center, radius):
+    circle = Circle(center, radius)
+    return {
+        'circumference': Lazy(circle.circumference),
+        'circle': Echo(circle)
+    }
+
+@operation('circle/contains', {'circle': CIRCLE, 'point': POINT})
+def circle_contains(circle, point):
+    return {
+        'contains': Lazy(lambda: circle.contains_point(point)),
+        'circle': Echo(circle),
+        'point': Echo(point)
+    }
+
+@operation('circle/line_intersection', {'circle': CIRCLE, 'line': LINE})
+def circle_line_intersection(circle, line):
+    return {
+        'intersections': Lazy(lambda: circle.intersection_with_line(line)),
+        'circle': Echo(circle),
+        'line': Echo(line)
+    }
+
+# Transform pipeline steps: the validator of each step type and how it builds its transform
+TRANSFORM_STEPS: Dict[str, Tuple[Callable[..., dict], Callable[..., AffineTransform]]] = {
+    'translate': (compile_schema({'dx': NUMBER, 'dy': NUMBER}), AffineTransform.translation),
+    'rotate': (compile_schema({'center': POINT, 'angle': NUMBER}),
+               lambda center, angle: AffineTransform.rotation(center, angle)),
+    'scale': (compile_schema({'center': POINT, 'sx': NUMBER, 'sy': NUMBER}), AffineTransform.scaling),
+    'reflect': (compile_schema({'line': LINE}), AffineTransform.reflection),
+    'reflect_x': (compile_schema({}), AffineTransform.reflection_x),
+    'reflect_y': (compile_schema({}), AffineTransform.reflection_y),
+}
+
+def parse_transform_step(step, path: str = '') -> AffineTransform:
+    """Build the affine transform described by one pipeline step"""
+    if not isinstance(step, dict):
+        raise ValidationError("Expected a JSON object", path, 'invalid_type')
+    kind = step.get('type')
+    if kind not in TRANSFORM_STEPS:
+        raise OperationError(f"Unknown transform step type: {kind}")
+    validate, build = TRANSFORM_STEPS[kind]
+    return build(**validate(step, path))
+
+# Pipeline steps parse to (step, transform) pairs, so stages can echo each step as sent
+TRANSFORM_STEP = Field(lambda step, path: (step, parse_transform_step(step, path)))
+
+# Triangle operations
+TRIANGLE_SCHEMA = {'point1': POINT, 'point2': POINT, 'point3': POINT}
+
+@operation('triangle/create', TRIANGLE_SCHEMA)
+def triangle_create(point1, point2, point3):
+    return Triangle(point1, point2, point3)
+
+@operation('triangle/area', TRIANGLE_SCHEMA)
+def triangle_area(point1, point2, point3):
+    triangle = Triangle(point1, point2, point3)
+    return {
+        'area': Lazy(triangle.area),
+        'triangle': Echo(triangle)
+    }
+
+@operation('triangle/centroid', TRIANGLE_SCHEMA)
+def triangle_centroid(point1, point2, point3):
+    triangle = Triangle(point1, point2, point3)
+    return {
+        'centroid': Lazy(triangle.centroid),
+        'triangle': Echo(triangle)
+    }
+
+@operation('triangle/orthocenter', TRIANGLE_SCHEMA)
+def triangle_orthocenter(point1, point2, point3):
+    triangle = Triangle(point1, point2, point3)
+    return {
+        'orthocenter': Lazy(triangle.orthocenter),
+        'triangle': Echo(triangle)
+    }
+
+@operation('triangle/circumcenter', TRIANGLE_SCHEMA)
+def triangle_circumcenter(point1, point2, point3):
+    triangle = Triangle(point1, point2, point3)
+    return {
+        'circumcenter': Lazy(triangle.circumcenter),
+        'triangle': Echo(triangle)
+    }
+
+# Polygon operations. Results are cached per ring regardless of the starting vertex,
+# so a cache hit re-attaches the vertices in the order the caller sent them.
+POLYGON_SCHEMA = {'points': POINTS}
+
+def _echo_polygon_points(result, data):
+    if 'points' not in result:
+        return result
+    return dict(result, points=parse_point_array(data['points']).to_dicts())
+
+def _echo_polygon(result, data):
+    if 'polygon' not in result:
+        return result
+    return dict(result, polygon=_echo_polygon_points(result['polygon'], data))
+
+@operation('polygon/create', POLYGON_SCHEMA, rings=('points',), echo=_echo_polygon_points)
+def polygon_create(points):
+    return Polygon(points)
+
+@operation('polygon/area', POLYGON_SCHEMA, rings=('points',), echo=_echo_polygon)
+def polygon_area(points):
+    polygon = Polygon(points)
+    return {
+        'area': Lazy(polygon.area),
+        'polygon': Echo(polygon)
+    }
+
+@operation('polygon/perimeter', POLYGON_SCHEMA, rings=('points',), echo=_echo_polygon)
+def polygon_perimeter(points):
+    polygon = Polygon(points)
+    return {
+        'perimeter': Lazy(polygon.perimeter),
+        'polygon': Echo(polygon)
+    }
+
+@operation('polygon/centroid', POLYGON_SCHEMA, rings=('points',), echo=_echo_polygon)
+def polygon_centroid(points):
+    polygon = Polygon(points)
+    return {
+        'centroid': Lazy(polygon.centroid),
+        'polygon': Echo(polygon)
+    }
+
+@operation('polygon/is_convex', POLYGON_SCHEMA, rings=('points',), echo=_echo_polygon)
+def polygon_is_convex(points):
+    polygon = Polygon(points)
+    return {
+        'is_convex': Lazy(polygon.is_convex),
+        'polygon': Echo(polygon)
+    }
+
+# Edge indices depend on the starting vertex, so rotated rings must not share a cache entry
+@operation('polygon/is_simple', POLYGON_SCHEMA)
+def polygon_is_simple(points):
+    polygon = Polygon(points)
+    return {
+        'is_simple': Lazy(polygon.is_simple),
+        'intersecting_edges': Lazy(polygon.self_intersections),
+        # Only the vertices: a degenerate ring is a valid input here but has no centroid
+        'points': Echo(polygon.coords)
+    }
+
+@operation('polygon/triangulate', POLYGON_SCHEMA)
+def polygon_triangulate(points):
+    polygon = Polygon(points)
+    return {
+        'triangles': Lazy(polygon.triangulate),
+        'points': Echo(polygon.coords)
+    }
+
+@operation('polygon/boolean', {'polygon1': POINTS, 'polygon2': POINTS, 'operation': choice(*BOOLEAN_OPERATIONS)})
+def polygon_boolean(polygon1, polygon2, operation):
+    first, second = Polygon(polygon1), Polygon(polygon2)
+    found = functools.lru_cache(maxsize=None)(lambda: first.boolean(second, operation))
+    return {
+        # Outer boundaries are counter-clockwise and holes clockwise
+        'polygons': Lazy(found),
+        # Holes count negatively
+        'area': Lazy(lambda: sum(polygon.coords.signed_area() for polygon in found())),
+        'polygon1': Echo(first.coords),
+        'polygon2': Echo(second.coords)
+    }
+
+def _as_list(values) -> list:
+    return values.tolist() if hasattr(values, 'tolist') else values
+
+@operation('polygon/contains_points', {'points': POINTS, 'test_points': POINTS}, rings=('points',))
+def polygon_contains_points(points, test_points):
+    polygon = Polygon(points)
+    found = functools.lru_cache(maxsize=None)(lambda: _as_list(polygon.prepare().contains_points(test_points)))
+    return {
+        'contains': Lazy(found),
+        'inside_count': Lazy(lambda: sum(found()))
+    }
+
+# Transformation operations
+@operation('transform/translate', {'dx': NUMBER, 'dy': NUMBER, 'points': POINTS})
+def transform_translate(dx, dy, points):
+    return {
+        'original_points': Echo(points),
+        'transformed_points': Lazy(lambda: Transformations.translate_shape(points, dx, dy)),
+        'dx': Echo(dx),
+        'dy': Echo(dy)
+    }
+
+@operation('transform/rotate', {'angle': NUMBER, 'points': POINTS, 'center': POINT})
+def transform_rotate(angle, points, center):
+    return {
+        'original_points': Echo(points),
+        'transformed_points': Lazy(lambda: Transformations.rotate_shape(points, center, angle)),
+        'center': Echo(center),
+        'angle': Echo(angle)
+    }
+
+@operation('transform/reflect', {'points': POINTS, 'line': LINE})
+def transform_reflect(points, line):
+    return {
+        'original_points': Echo(points),
+        'transformed_points': Lazy(lambda: Transformations.reflect_shape(points, line)),
+        'line': Echo(line)
+    }
+
+@operation('transform/scale', {'sx': NUMBER, 'sy': NUMBER, 'points': POINTS, 'center': POINT})
+def transform_scale(sx, sy, points, center):
+    return {
+        'original_points': Echo(points),
+        'transformed_points': Lazy(lambda: Transformations.scale_shape(points, center, sx, sy)),
+        'center': Echo(center),
+        'sx': Echo(sx),
+        'sy': Echo(sy)
+    }
+
+@operation('transform/pipeline', {
+    'points': POINTS,
+    'steps': list_of(TRANSFORM_STEP),
+    'return_stages': BOOLEAN.optional(False)
+})
+def transform_pipeline(points, steps, return_stages):
+    composed = AffineTransform.compose([transform for _, transform in steps])
+
+    def stages():
+        # Each stage applies the fused prefix of the pipeline to the original points
+        result = []
+        prefix = AffineTransform.identity()
+        for step, transform in steps:
+            prefix = prefix.then(transform)
+            result.append({'step': step, 'points': points.transform(prefix)})
+        return result
+
+    result = {
+        'original_points': Echo(points),
+        'transformed_points': Lazy(lambda: points.transform(composed)),
+        'matrix': Lazy(composed.matrix)
+    }
+    if return_stages:
+        result['stages'] = Lazy(stages)
+    return result
+
+# Engine operations
+@operation('engine/collinear', {'point1': POINT, 'point2': POINT, 'point3': POINT})
+def engine_collinear(point1, point2, point3):
+    return {
+        'is_collinear': Lazy(lambda: GeometryEngine.are_collinear(point1, point2, point3)),
+        'points': Echo([point1, point2, point3])
+    }
+
+@operation('engine/convex_hull', {'points': POINTS, 'method': choice(*HULL_METHODS).optional('monotone')})
+def engine_convex_hull(points, method):
+    return {
+        'original_points': Echo(points),
+        'hull_points': Lazy(lambda: GeometryEngine.convex_hull(points, method))
+    }
+
+@operation('engine/segment_intersections', {'segments': list_of(SEGMENT)})
+def engine_segment_intersections(segments):
+    found = functools.lru_cache(maxsize=None)(lambda: GeometryEngine.segment_intersections(segments))
+    return {
+        'intersections': Lazy(lambda: [{'point': point, 'segments': ids} for point, ids in found()[0]]),
+        'overlaps': Lazy(lambda: [{'segments': ids, 'start': start, 'end': end} for ids, start, end in found()[1]]),
+        'count': Lazy(lambda: len(found()[0])),
+        'segments': Echo([{'point1': a, 'point2': b} for a, b in segments])
+    }
+
+def _neighbors(points, found):
+    return [{'index': i, 'point': points[i], 'distance': distance} for i, distance in found]
+
+@operation('engine/nearest', {'points': POINTS, 'queries': POINTS, 'k': INTEGER.optional(1)})
+def engine_nearest(points, queries, k):
+    return {
+        'neighbors': Lazy(lambda: [_neighbors(points, found)
+                                   for found in GeometryEngine.nearest_neighbors(points, queries, k)]),
+        'points': Echo(points),
+        'queries': Echo(queries)
+    }
+
+@operation('engine/radius_query', {'points': POINTS, 'queries': POINTS, 'radius': NUMBER})
+def engine_radius_query(points, queries, radius):
+    return {
+        'matches': Lazy(lambda: [_neighbors(points, found)
+                                 for found in GeometryEngine.radius_query(points, queries, radius)]),
+        'points': Echo(points),
+        'queries': Echo(queries)
+    }
+
+@operation('engine/closest_pair', {'points': POINTS})
+def engine_closest_pair(points):
+    found = functools.lru_cache(maxsize=None)(lambda: GeometryEngine.closest_pair(points))
+    return {
+        'indices': Lazy(lambda: list(found()[:2])),
+        'pair': Lazy(lambda: [points[found()[0]], points[found()[1]]]),
+        'distance': Lazy(lambda: found()[2]),
+        'points': Echo(points)
+    }
+
+@operation('engine/delaunay', {'points': POINTS})
+def engine_delaunay(points):
+    found = functools.lru_cache(maxsize=None)(lambda: GeometryEngine.delaunay(points))
+    return {
+        'triangles': Lazy(lambda: found()[0]),
+        'neighbors': Lazy(lambda: found()[1]),
+        'count': Lazy(lambda: len(found()[0])),
+        'points': Echo(points)
+    }
+
+@operation('engine/voronoi', {'points': POINTS})
+def engine_voronoi(points):
+    found = functools.lru_cache(maxsize=None)(lambda: GeometryEngine.voronoi(points))
+    return {
+        'vertices': Lazy(lambda: found()[0]),
+        'cells': Lazy(lambda: [{'vertices': vertices, 'rays': rays} for vertices, rays in found()[1]]),
+        'points': Echo(points)
+    }
+
+@operation('engine/min_enclosing_circle', {'points': POINTS})
+def engine_min_enclosing_circle(points):
+    return {
+        'circle': Lazy(lambda: GeometryEngine.min_enclosing_circle(points)),
+        'points': Echo(points)
+    }
+
+# Spatial index operations. Indexes are held in-process, keyed by name.
+INDEXES: Dict[str, SpatialIndex] = {}
+_indexes_lock = threading.Lock()
+
+# Validator and constructor of each indexable shape type
+SHAPE_TYPES: Dict[str, Tuple[Callable[..., dict], Callable[..., Any]]] = {
+    'polygon': (compile_schema(POLYGON_SCHEMA), Polygon),
+    'circle': (compile_schema(CIRCLE_SCHEMA), Circle),
+    # Triangle names its vertices p1, p2, p3, the schema point1, point2, point3
+    'triangle': (compile_schema(TRIANGLE_SCHEMA), lambda point1, point2, point3: Triangle(point1, point2, point3)),
+    'line': (compile_schema(LINE_SCHEMA), Line),
+}
+
+def parse_shape(data, path: str = ''):
+    """Build a Polygon, Circle, Triangle or Line from a {"type": ..., ...} description"""
+    if not isinstance(data, dict):
+        raise ValidationError("Expected a JSON object", path, 'invalid_type')
+    kind = data.get('type')
+    if kind not in SHAPE_TYPES:
+        raise OperationError(f"Unknown shape type: {kind}")
+    validate, build = SHAPE_TYPES[kind]
+    return build(**validate(data, path))
+
+def _parse_shape_id(value, path):
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValidationError("Shape ids must be strings or numbers", path, 'invalid_type')
+    return value
+
+SHAPE_ID = Field(_parse_shape_id)
+
+def _parse_indexed_shape(data, path):
+    shape = parse_shape(data, path)
+    if data.get('id') is None:
+        raise ValidationError("Missing required field: id", f"{path}.id", 'missing_field')
+    return _parse_shape_id(data['id'], f"{path}.id"), shape
+
+# Indexed shapes parse to (id, shape) pairs
+INDEXED_SHAPE = Field(_parse_indexed_shape)
+
+WINDOW = nested({'min_x': NUMBER, 'min_y': NUMBER, 'max_x': NUMBER, 'max_y': NUMBER},
+                lambda min_x, min_y, max_x, max_y: (min_x, min_y, max_x, max_y))
+
+INDEX_NAME = STRING.optional('default')
+
+def _index(name: str) -> SpatialIndex:
+    index = INDEXES.get(name)
+    if index is None:
+        raise OperationError(f"Unknown index: {name}")
+    return index
+
+@operation('index/build', {'name': INDEX_NAME, 'shapes': list_of(INDEXED_SHAPE),
+                           'max_entries': INTEGER.optional(16)}, cache=False)
+def index_build(name, shapes, max_entries):
+    index = SpatialIndex.bulk_load(shapes, max_entries)
+    with _indexes_lock:
+        INDEXES[name] = index
+    return {
+        'name': name,
+        'size': len(index)
+    }
+
+@operation('index/insert', {'name': INDEX_NAME, 'shapes': list_of(INDEXED_SHAPE)}, cache=False)
+def index_insert(name, shapes):
+    index = _index(name)
+    with _indexes_lock:
+        for shape_id, shape in shapes:
+            index.insert(shape_id, shape)
+    return {
+        'name': name,
+        'size': len(index)
+    }
+
+@operation('index/delete', {'name': INDEX_NAME, 'ids': list_of(SHAPE_ID)}, cache=False)
+def index_delete(name, ids):
+    index = _index(name)
+    with _indexes_lock:
+        deleted = [shape_id for shape_id in ids if index.delete(shape_id)]
+    return {
+        'deleted': deleted,
+        'size': len(index)
+    }
+
+@operation('index/query_point', {'name': INDEX_NAME, 'point': POINT}, cache=False)
+def index_query_point(name, point):
+    index = _index(name)
+    with _indexes_lock:
+        ids = index.query_point(point)
+    return {
+        'ids': ids,
+        'point': Echo(point)
+    }
+
+@operation('index/query_window', {'name': INDEX_NAME, 'window': WINDOW}, cache=False)
+def index_query_window(name, window):
+    index = _index(name)
+    with _indexes_lock:
+        ids = index.query_window(*window)
+    return {
+        'ids': ids,
+        'window': Echo(dict(zip(('min_x', 'min_y', 'max_x', 'max_y'), window)))
+    }
+
+@operation('index/nearest', {'name': INDEX_NAME, 'point': POINT, 'k': INTEGER.optional(1)}, cache=False)
+def index_nearest(name, point, k):
+    index = _index(name)
+    with _indexes_lock:
+        nearest = index.nearest(point, k)
+    return {
+        'nearest': [{'id': shape_id, 'distance': distance} for shape_id, distance in nearest],
+        'point': Echo(point)
+    }
@@ -0,0 +1,376 @@
+"""Boolean operations (intersection, union, difference) on simple polygons.
+
+The general case overlays the two boundaries, in the spirit of Martinez-Rueda:
+
+1. The Bentley-Ottmann sweep (geometry.sweep) finds every point where an edge
+   of one polygon meets an edge of the other, in O((n + k) log n), so edge
+   pairs that cannot meet are never tested.
+2. Edges are split at those points. A piece of one boundary is either shared
+   with the other boundary (running the same or the opposite way) or lies
+   wholly inside or outside the other polygon. That can only change where the
+   boundaries meet, so each run of pieces from one meeting point to the next
+   is settled by an exact turn test against the other boundary's corner at
+   its start. Only a boundary that never meets the other needs a
+   point-in-polygon test.
+3. Each operation keeps its own set of pieces, and these are linked into rings.
+
+Disjoint bounding boxes are answered without looking at the edges. For the
+intersection of two convex polygons, the overlay is skipped: the region
+between the lower of the upper chains and the higher of the lower chains is
+merged in one pass over the vertices in x order.
+
+Results are lists of rings, each a list of (x, y) vertices. Outer boundaries
+run counter-clockwise and holes clockwise. Shapes that touch at a point or
+along an edge are split into separate rings there, and contacts without area
+are dropped.
+"""
+import math
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from geometry import sweep
+from geometry.delaunay import orient
+
+BOOLEAN_OPERATIONS = ('intersection', 'union', 'difference')
+
+Ring = List[Tuple[float, float]]
+
+# Which pieces each operation keeps. Pieces of the first polygon are labelled 'inside' or
+# 'outside' the second, or 'same' / 'opposite' when shared with an edge of the second running
+# the same or the other way. Pieces of the second polygon are labelled likewise; their shared
+# pieces are never kept, since those of the first polygon already cover them.
+_KEEP_FIRST = {'intersection': ('inside', 'same'), 'union': ('outside', 'same'), 'difference': ('outside', 'opposite')}
+_KEEP_SECOND = {'intersection': 'inside', 'union': 'outside', 'difference': 'inside'}
+
+
+def boolean(xs_a: Sequence[float], ys_a: Sequence[float], xs_b: Sequence[float], ys_b: Sequence[float],
+            operation: str, convex: bool = False, tolerance: Optional[float] = None) -> List[Ring]:
+    """Rings of the intersection, union or difference (first minus second) of two simple polygons.
+
+    Pass convex=True when both polygons are known to be convex, which lets an intersection
+    skip the overlay. Points closer than the tolerance (by default scaled to the input's
+    extent, as in the sweep) are treated as equal.
+    """
+    if operation not in BOOLEAN_OPERATIONS:
+        raise ValueError(f"Unknown boolean operation: {operation}")
+    a, b = _ring(xs_a, ys_a), _ring(xs_b, ys_b)
+    if len(a) < 3 or len(b) < 3:
+        raise ValueError("A polygon must have at least 3 points")
+    (ax0, ay0, ax1, ay1), (bx0, by0, bx1, by1) = _bounds(a), _bounds(b)
+    if ax1 < bx0 or bx1 < ax0 or ay1 < by0 or by1 < ay0:
+        return {'intersection': [], 'union': [a, b], 'difference': [a]}[operation]
+    if convex and operation == 'intersection':
+        ring = convex_intersection(a, b)
+        return [ring] if ring else []
+    if tolerance is None:
+        extent = max(abs(v) for box in ((ax0, ay0, ax1, ay1), (bx0, by0, bx1, by1)) for v in box)
+        tolerance = sweep.RELATIVE_TOLERANCE * max(1.0, extent)
+    return _Overlay(a, b, tolerance).run(operation)
+
+
+def _ring(xs: Sequence[float], ys: Sequence[float]) -> Ring:
+    # Vertices as (x, y) tuples in counter-clockwise order
+    xs = xs.tolist() if hasattr(xs, 'tolist') else xs
+    ys = ys.tolist() if hasattr(ys, 'tolist') else ys
+    if len(xs) != len(ys):
+        raise ValueError("x and y sequences must have the same length")
+    ring = [(float(x), float(y)) for x, y in zip(xs, ys)]
+    if _signed_area(ring) < 0:
+        ring.reverse()
+    return ring
+
+
+def _signed_area(ring: Ring) -> float:
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1])) / 2
+
+
+def _bounds(ring: Ring) -> Tuple[float, float, float, float]:
+    xs, ys = [x for x, _ in ring], [y for _, y in ring]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _contains(ring: Ring, x: float, y: float) -> bool:
+    # Ray casting, as in Polygon.contains_point
+    inside = False
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+    return inside
+
+
+class _Overlay:
+    def __init__(self, a: Ring, b: Ring, tolerance: float):
+        self.a, self.b = a, b
+        self.eps = tolerance
+        # Points where the boundaries meet, after snapping nearby vertices together
+        self.nodes = set()
+        # Snapped position of vertices that lie within the tolerance of a node
+        self.snapped: Dict[Tuple[float, float], Tuple[float, float]] = {}
+
+    def run(self, operation: str) -> List[Ring]:
+        a, b = self.a, self.b
+        na = len(a)
+        splits = self.contacts()
+        pieces_a = self.pieces(a, splits[:na])
+        pieces_b = self.pieces(b, splits[na:])
+        keep_first, keep_second = _KEEP_FIRST[operation], _KEEP_SECOND[operation]
+        kept = [piece for piece, label in zip(pieces_a, self.classify(pieces_a, pieces_b, b))
+                if label in keep_first]
+        for (p, q), label in zip(pieces_b, self.classify(pieces_b, pieces_a, a)):
+            if label == keep_second:
+                kept.append((q, p) if operation == 'difference' else (p, q))
+        return _link(kept)
+
+    def contacts(self) -> List[List[Tuple[float, float]]]:
+        # Split points of every edge (those of the first polygon, then the second)
+        a, b, eps = self.a, self.b, self.eps
+        na, points = len(a), a + b
+        ends = [(i, i + 1 if i + 1 < na else 0) for i in range(na)]
+        ends += [(na + i, na + (i + 1 if i + 1 < len(b) else 0)) for i in range(len(b))]
+        found = sweep.segment_intersections(
+            [points[s][0] for s, _ in ends], [points[s][1] for s, _ in ends],
+            [points[t][0] for _, t in ends], [points[t][1] for _, t in ends], eps)
+
+        splits = [[] for _ in ends]
+        for hit in found.intersections:
+            edges = hit.segments
+            if edges[0] >= na or edges[-1] < na:
+                continue  # Edges of one polygon only: consecutive edges at their vertex
+            # Land on a vertex when the contact is one, so both boundaries split at the same point
+            near = [points[v] for e in edges for v in ends[e]
+                    if abs(points[v][0] - hit.x) <= eps and abs(points[v][1] - hit.y) <= eps]
+            node = self.snapped.get(near[0], near[0]) if near else (hit.x, hit.y)
+            for vertex in near:
+                self.snapped.setdefault(vertex, node)
+            self.nodes.add(node)
+            for e in edges:
+                splits[e].append(node)
+        for overlap in found.overlaps:
+            i, j = overlap.segments
+            if (i < na) == (j < na):
+                continue
+            for point in (overlap.start, overlap.end):
+                node = self.snapped.get(point, point)
+                self.nodes.add(node)
+                splits[i].append(node)
+                splits[j].append(node)
+        return splits
+
+    def pieces(self, ring: Ring, splits: List[List[Tuple[float, float]]]) -> List[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        # The edges of a ring cut at their split points, in order around the ring
+        snapped = self.snapped
+        pieces = []
+        for i, inner in enumerate(splits):
+            p = snapped.get(ring[i], ring[i])
+            q = snapped.get(ring[(i + 1) % len(ring)], ring[(i + 1) % len(ring)])
+            dx, dy = q[0] - p[0], q[1] - p[1]
+            inner = sorted(set(inner) - {p, q}, key=lambda s: (s[0] - p[0]) * dx + (s[1] - p[1]) * dy)
+            chain = [p] + inner + [q]
+            pieces.extend((s, t) for s, t in zip(chain, chain[1:]) if s != t)
+        return pieces
+
+    def classify(self, pieces, other_pieces, other: Ring) -> List[str]:
+        # Label each piece of one boundary against the other polygon
+        forward = dict(other_pieces)
+        backward = {q: p for p, q in other_pieces}
+        labels: List[Optional[str]] = [None] * len(pieces)
+        for k, (p, q) in enumerate(pieces):
+            if forward.get(p) == q:
+                labels[k] = 'same'
+            elif forward.get(q) == p:
+                labels[k] = 'opposite'
+        starts = [k for k, (p, _) in enumerate(pieces) if p in self.nodes]
+        if not starts:
+            # The boundaries never meet: the whole ring is on one side
+            x, y = pieces[0][0]
+            return ['inside' if _contains(other, x, y) else 'outside'] * len(pieces)
+        # A run of pieces from one node to the next is wholly inside or outside; its first
+        # piece leaves the node either into the other polygon's corner there or away from it
+        for s, t in zip(starts, starts[1:] + [starts[0] + len(pieces)]):
+            if labels[s] is not None:
+                continue  # A shared piece, which makes up the whole run
+            p, q = pieces[s]
+            label = 'inside' if _in_corner(backward[p], p, forward[p], q) else 'outside'
+            for k in range(s, t):
+                labels[k % len(pieces)] = label
+        return labels
+
+
+def _in_corner(before, vertex, after, point) -> bool:
+    # Whether the ray from a vertex of a counter-clockwise ring towards point enters the
+    # polygon, given the neighbouring vertices (the ray runs along neither edge)
+    bx, by = before
+    vx, vy = vertex
+    ax, ay = after
+    px, py = point
+    left_of_in = orient(bx, by, vx, vy, px, py) > 0
+    left_of_out = orient(vx, vy, ax, ay, px, py) > 0
+    turn = orient(bx, by, vx, vy, ax, ay)
+    if turn > 0:
+        return left_of_in and left_of_out
+    if turn < 0:
+        return left_of_in or left_of_out
+    return left_of_in
+
+
+def _link(edges) -> List[Ring]:
+    # Chain directed edges into rings with the region on their left. Where a vertex has
+    # several ways on, take the first clockwise from the way back, which follows the
+    # boundary of one face, so shapes touching at a vertex come out as separate rings.
+    outgoing: Dict[Tuple[float, float], List[Tuple[float, float]]] = {}
+    for p, q in edges:
+        outgoing.setdefault(p, []).append(q)
+    rings = []
+    for start, first in edges:
+        if first not in outgoing.get(start, ()):
+            continue  # Already used by an earlier ring
+        ring, p, q = [start], start, first
+        outgoing[start].remove(first)
+        while q != start:
+            choices = outgoing.get(q)
+            if not choices:
+                ring = None  # Dead end, only possible with inconsistent input
+                break
+            ring.append(q)
+            if len(choices) == 1:
+                following = choices.pop()
+            else:
+                back = math.atan2(p[1] - q[1], p[0] - q[0])
+                following = min(choices, key=lambda w: (back - math.atan2(w[1] - q[1], w[0] - q[0])) % (2 * math.pi)
+                                or 2 * math.pi)
+                choices.remove(following)
+            p, q = q, following
+        if ring is not None:
+            rings.extend(loop for loop in _loops(ring) if len(loop) >= 3 and _signed_area(loop) != 0)
+    return rings
+
+
+def _loops(ring: Ring) -> List[Ring]:
+    # Cut a closed walk that passes a vertex more than once (a hole touching the outer
+    # boundary) into simple loops at that vertex
+    loops, path, seen = [], [], {}
+    for point in ring:
+        if point in seen:
+            start = seen[point]
+            loops.append(path[start:])
+            for dropped in path[start + 1:]:
+                del seen[dropped]
+            del path[start + 1:]
+        else:
+            seen[point] = len(path)
+            path.append(point)
+    loops.append(path)
+    return loops
+
+
+def _chains(ring: Ring) -> Tuple[Ring, Ring]:
+    # Lower and upper chains of a convex counter-clockwise ring, both from left to right
+    n = len(ring)
+    left = min(range(n), key=ring.__getitem__)
+    right = max(range(n), key=ring.__getitem__)
+    lower = [ring[(left + k) % n] for k in range((right - left) % n + 1)]
+    upper = [ring[(left - k) % n] for k in range((left - right) % n + 1)]
+    return lower, upper
+
+
+def _sample(chain: Ring, xs: List[float], upper: bool) -> List[float]:
+    # Height of a chain at each of the sorted xs. At a vertical edge (only possible at the
+    # chain's ends) the outermost end is taken.
+    values, i, m = [], 0, len(chain)
+    for x in xs:
+        while i < m and chain[i][0] < x:
+            i += 1
+        if i < m and chain[i][0] == x:
+            j, ys = i, []
+            while j < m and chain[j][0] == x:
+                ys.append(chain[j][1])
+                j += 1
+            values.append(max(ys) if upper else min(ys))
+        else:
+            (x0, y0), (x1, y1) = chain[i - 1], chain[i]
+            values.append(y0 + (x - x0) * (y1 - y0) / (x1 - x0))
+    return values
+
+
+def convex_intersection(a: Ring, b: Ring) -> Optional[Ring]:
+    """Intersection of two convex counter-clockwise rings, or None if it has no area.
+
+    Between consecutive vertex x-coordinates every chain is a straight segment, so the
+    boundary of the intersection follows the lower of the two upper chains and the higher
+    of the two lower chains, with extra vertices where those cross.
+    """
+    lower_a, upper_a = _chains(a)
+    lower_b, upper_b = _chains(b)
+    lo, hi = max(lower_a[0][0], lower_b[0][0]), min(lower_a[-1][0], lower_b[-1][0])
+    if lo >= hi:
+        return None
+    chains = (upper_a, upper_b, lower_a, lower_b)
+    xs = sorted({x for chain in chains for x, _ in chain if lo < x < hi} | {lo, hi})
+    ua, ub = _sample(upper_a, xs, True), _sample(upper_b, xs, True)
+    la, lb = _sample(lower_a, xs, False), _sample(lower_b, xs, False)
+    corners = [{x for x, _ in chain} for chain in chains]
+    # Chains crossing exactly at a column make a corner there too
+    crossed = [_crossed_at([p - q for p, q in zip(ua, ub)]), _crossed_at([p - q for p, q in zip(la, lb)])]
+
+    # (x, top, bottom, top is a vertex, bottom is a vertex) at every vertex x and at every
+    # crossing of the two upper or the two lower chains. Elsewhere the boundary runs straight
+    # through the column, which is left out of the result.
+    columns = []
+    for k, x in enumerate(xs):
+        top, bottom = min(ua[k], ub[k]), max(la[k], lb[k])
+        columns.append((x, top, bottom,
+                        (x in corners[0] and ua[k] == top) or (x in corners[1] and ub[k] == top)
+                        or k in crossed[0],
+                        (x in corners[2] and la[k] == bottom) or (x in corners[3] and lb[k] == bottom)
+                        or k in crossed[1]))
+        if k + 1 == len(xs):
+            break
+        crossings = []
+        for upper, (p0, p1, q0, q1) in ((True, (ua[k], ua[k + 1], ub[k], ub[k + 1])),
+                                        (False, (la[k], la[k + 1], lb[k], lb[k + 1]))):
+            d0, d1 = p0 - q0, p1 - q1
+            if (d0 < 0 < d1) or (d1 < 0 < d0):
+                crossings.append((d0 / (d0 - d1), upper))
+        for t, upper in sorted(crossings):
+            columns.append((x + t * (xs[k + 1] - x),
+                            min(ua[k] + t * (ua[k + 1] - ua[k]), ub[k] + t * (ub[k + 1] - ub[k])),
+                            max(la[k] + t * (la[k + 1] - la[k]), lb[k] + t * (lb[k + 1] - lb[k])),
+                            upper, not upper))
+
+    # top - bottom is concave, so the columns with a positive gap form one range
+    open_columns = [k for k, column in enumerate(columns) if column[1] > column[2]]
+    if not open_columns:
+        return None
+    first, last = open_columns[0], open_columns[-1]
+    kept = columns[first:last + 1]
+    # Close the range where the chains meet, between a closed and an open column, or
+    # with a vertical edge at an end column that is open already
+    if first > 0:
+        kept.insert(0, _meeting(columns[first - 1], columns[first]))
+    else:
+        kept[0] = kept[0][:3] + (True, True)
+    if last + 1 < len(columns):
+        kept.append(_meeting(columns[last], columns[last + 1]))
+    else:
+        kept[-1] = kept[-1][:3] + (True, True)
+
+    ring = [(x, bottom) for x, _, bottom, _, corner in kept if corner]
+    ring += [(x, top) for x, top, _, corner, _ in reversed(kept) if corner]
+    # Where top meets bottom the point comes twice
+    ring = [p for p, q in zip(ring, ring[1:] + ring[:1]) if p != q]
+    return ring if len(ring) >= 3 else None
+
+
+def _crossed_at(differences: List[float]) -> Set[int]:
+    # Columns where the difference between two chains is zero and changes sign across it
+    return {k for k in range(1, len(differences) - 1)
+            if differences[k] == 0 and differences[k - 1] * differences[k + 1] < 0}
+
+
+def _meeting(left, right) -> Tuple[float, float, float, bool, bool]:
+    # Column where the gap between top and bottom reaches zero, between an open and a closed column
+    (x0, top0, bottom0), (x1, top1, bottom1) = left[:3], right[:3]
+    gap0, gap1 = top0 - bottom0, top1 - bottom1
+    t = gap0 / (gap0 - gap1)
+    x = x0 + t * (x1 - x0)
+    y = (top0 + t * (top1 - top0) + bottom0 + t * (bottom1 - bottom0)) / 2
+    return x, y, y, True, True
@@ -0,0 +1,225 @@
+"""Prepared polygons for fast repeated point-in-polygon queries.
+
+A PreparedPolygon precomputes the bounding box and edge coordinate arrays
+of a Polygon once. Convex polygons are answered with an O(log n) binary
+search over the fan of triangles around the first vertex. Other polygons
+use a static interval tree over the y-ranges of their edges, so each query
+only visits the edges that a horizontal ray through the point can cross.
+"""
+from typing import List, Optional
+
+from geometry.models import Point, PointArray, Polygon, PolygonError
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, bulk queries fall back to per-point lookups
+    np = None
+
+# Tolerance used when deciding if a point lies on an edge
+EDGE_TOLERANCE = 1e-10
+
+
+class _IntervalNode:
+    __slots__ = ('center', 'by_low', 'by_high', 'left', 'right')
+
+    def __init__(self, center: float, by_low: List[int], by_high: List[int],
+                 left: Optional['_IntervalNode'], right: Optional['_IntervalNode']):
+        self.center = center
+        self.by_low = by_low
+        self.by_high = by_high
+        self.left = left
+        self.right = right
+
+
+class PreparedPolygon:
+    """Polygon with cached edge arrays and a search structure for point queries"""
+
+    def __init__(self, polygon: Polygon):
+        coords = polygon.coords
+        xs, ys = coords.to_list(coords.xs), coords.to_list(coords.ys)
+        self.polygon = polygon
+        self.bbox = polygon.bounding_box()
+        self.x1, self.y1 = xs, ys
+        self.x2, self.y2 = xs[1:] + xs[:1], ys[1:] + ys[:1]
+        self.y_low = [min(a, b) for a, b in zip(self.y1, self.y2)]
+        self.y_high = [max(a, b) for a, b in zip(self.y1, self.y2)]
+
+        self.fan = self._convex_fan(xs, ys) if polygon.is_convex() else None
+        self.tree = None if self.fan else self._build_tree(list(range(len(xs))))
+
+    @property
+    def is_convex(self) -> bool:
+        """True when queries use the O(log n) convex path"""
+        return self.fan is not None
+
+    @staticmethod
+    def _convex_fan(xs: List[float], ys: List[float]):
+        # Counter-clockwise vertices without collinear ones, or None if the turn test was fooled
+        # by a self-intersecting ring (e.g. a pentagram), whose fan is not angularly sorted
+        n = len(xs)
+        fan_x, fan_y = [], []
+        for i in range(n):
+            px, py = xs[i - 1], ys[i - 1]
+            nx, ny = xs[(i + 1) % n], ys[(i + 1) % n]
+            if (xs[i] - px) * (ny - ys[i]) - (ys[i] - py) * (nx - xs[i]) != 0:
+                fan_x.append(xs[i])
+                fan_y.append(ys[i])
+        if len(fan_x) < 3:
+            return None
+        area2 = sum(fan_x[i - 1] * fan_y[i] - fan_x[i] * fan_y[i - 1] for i in range(len(fan_x)))
+        if area2 < 0:
+            fan_x.reverse()
+            fan_y.reverse()
+        x0, y0 = fan_x[0], fan_y[0]
+        for i in range(1, len(fan_x) - 1):
+            if (fan_x[i] - x0) * (fan_y[i + 1] - y0) - (fan_y[i] - y0) * (fan_x[i + 1] - x0) <= 0:
+                return None
+        return fan_x, fan_y
+
+    def _build_tree(self, edges: List[int]) -> Optional[_IntervalNode]:
+        # Centered interval tree over the [y_low, y_high] range of each edge
+        if not edges:
+            return None
+        ends = sorted([self.y_low[e] for e in edges] + [self.y_high[e] for e in edges])
+        center = ends[len(ends) // 2]
+        below, above, spanning = [], [], []
+        for e in edges:
+            if self.y_high[e] < center:
+                below.append(e)
+            elif self.y_low[e] > center:
+                above.append(e)
+            else:
+                spanning.append(e)
+        by_low = sorted(spanning, key=lambda e: self.y_low[e])
+        by_high = sorted(spanning, key=lambda e: -self.y_high[e])
+        return _IntervalNode(center, by_low, by_high, self._build_tree(below), self._build_tree(above))
+
+    def _edges_spanning(self, y: float) -> List[int]:
+        # Edges whose y-range contains y
+        found = []
+        node = self.tree
+        while node is not None:
+            if y < node.center:
+                for e in node.by_low:
+                    if self.y_low[e] > y:
+                        break
+                    found.append(e)
+                node = node.left
+            elif y > node.center:
+                for e in node.by_high:
+                    if self.y_high[e] < y:
+                        break
+                    found.append(e)
+                node = node.right
+            else:
+                found.extend(node.by_low)
+                break
+        return found
+
+    def contains_point(self, point: Point) -> bool:
+        """Check if a point is inside or on the boundary of the polygon"""
+        try:
+            return self._contains_xy(point.x, point.y)
+        except Exception as e:
+            raise PolygonError(f"Error checking if point is inside polygon: {str(e)}")
+
+    def _contains_xy(self, px: float, py: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if px < min_x or px > max_x or py < min_y or py > max_y:
+            return False
+        if self.fan is not None:
+            return self._convex_contains(px, py)
+
+        inside = False
+        x1, y1, x2, y2 = self.x1, self.y1, self.x2, self.y2
+        for e in self._edges_spanning(py):
+            ax, ay, bx, by = x1[e], y1[e], x2[e], y2[e]
+            cross = (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+            if abs(cross) < EDGE_TOLERANCE and min(ax, bx) <= px <= max(ax, bx):
+                return True
+            if (ay > py) != (by > py) and px < (bx - ax) * (py - ay) / (by - ay) + ax:
+                inside = not inside
+        return inside
+
+    def _convex_contains(self, px: float, py: float) -> bool:
+        fx, fy = self.fan
+        n = len(fx)
+        x0, y0 = fx[0], fy[0]
+        dx, dy = px - x0, py - y0
+        # Outside the wedge spanned by the first and last fan edges
+        if (fx[1] - x0) * dy - (fy[1] - y0) * dx < -EDGE_TOLERANCE:
+            return False
+        if (fx[n - 1] - x0) * dy - (fy[n - 1] - y0) * dx > EDGE_TOLERANCE:
+            return False
+        # Binary search for the fan triangle (v0, v[lo], v[lo + 1]) holding the point
+        lo, hi = 1, n - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if (fx[mid] - x0) * dy - (fy[mid] - y0) * dx >= 0:
+                lo = mid
+            else:
+                hi = mid
+        ax, ay, bx, by = fx[lo], fy[lo], fx[lo + 1], fy[lo + 1]
+        return (bx - ax) * (py - ay) - (by - ay) * (px - ax) >= -EDGE_TOLERANCE
+
+    def contains_points(self, points: PointArray):
+        """Bulk containment test, one boolean per point"""
+        try:
+            if np is None:
+                return [self._contains_xy(x, y) for x, y in zip(points.xs, points.ys)]
+            return self._contains_points_numpy(points.xs, points.ys)
+        except Exception as e:
+            raise PolygonError(f"Error checking if points are inside polygon: {str(e)}")
+
+    def _contains_points_numpy(self, px, py):
+        min_x, min_y, max_x, max_y = self.bbox
+        result = np.zeros(len(px), dtype=bool)
+        candidates = np.nonzero((px >= min_x) & (px <= max_x) & (py >= min_y) & (py <= max_y))[0]
+        if len(candidates) == 0:
+            return result
+        qx, qy = px[candidates], py[candidates]
+
+        if self.fan is not None:
+            result[candidates] = self._convex_contains_numpy(qx, qy)
+            return result
+
+        # Sort the query points by y so every edge touches one contiguous run of them
+        order = np.argsort(qy, kind='stable')
+        sx, sy = qx[order], qy[order]
+        starts = np.searchsorted(sy, self.y_low, side='left')
+        stops = np.searchsorted(sy, self.y_high, side='right')
+        inside = np.zeros(len(sx), dtype=bool)
+        on_edge = np.zeros(len(sx), dtype=bool)
+        for e in np.nonzero(stops > starts)[0].tolist():
+            s, t = starts[e], stops[e]
+            ex, ey = sx[s:t], sy[s:t]
+            ax, ay, bx, by = self.x1[e], self.y1[e], self.x2[e], self.y2[e]
+            cross = (bx - ax) * (ey - ay) - (by - ay) * (ex - ax)
+            on_edge[s:t] |= (np.abs(cross) < EDGE_TOLERANCE) & (ex >= min(ax, bx)) & (ex <= max(ax, bx))
+            if ay != by:
+                crosses = ((ay > ey) != (by > ey)) & (ex < (bx - ax) * (ey - ay) / (by - ay) + ax)
+                inside[s:t] ^= crosses
+        hits = np.empty(len(sx), dtype=bool)
+        hits[order] = inside | on_edge
+        result[candidates] = hits
+        return result
+
+    def _convex_contains_numpy(self, qx, qy):
+        fx, fy = np.asarray(self.fan[0]), np.asarray(self.fan[1])
+        n = len(fx)
+        dx, dy = qx - fx[0], qy - fy[0]
+        ok = ((fx[1] - fx[0]) * dy - (fy[1] - fy[0]) * dx >= -EDGE_TOLERANCE) & \
+             ((fx[n - 1] - fx[0]) * dy - (fy[n - 1] - fy[0]) * dx <= EDGE_TOLERANCE)
+        # Vectorized binary search: every step halves the candidate fan range of all points at once
+        lo = np.ones(len(qx), dtype=np.intp)
+        hi = np.full(len(qx), n - 1, dtype=np.intp)
+        while True:
+            active = hi - lo > 1
+            if not active.any():
+                break
+            mid = (lo + hi) // 2
+            left = (fx[mid] - fx[0]) * dy - (fy[mid] - fy[0]) * dx >= 0
+            lo = np.where(active & left, mid, lo)
+            hi = np.where(active & ~left, mid, hi)
+        ax, ay, bx, by = fx[lo], fy[lo], fx[lo + 1], fy[lo + 1]
+        return ok & ((bx - ax) * (qy - ay) - (by - ay) * (qx - ax) >= -EDGE_TOLERANCE)
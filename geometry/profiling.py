@@ -0,0 +1,116 @@
+"""Run a single call under cProfile and summarize it for an API response.
+
+The summary holds the functions with the most self time and the profile as
+collapsed stacks ("outer;inner;leaf microseconds" per line), the input format
+of flamegraph.pl, speedscope and similar tools. cProfile records caller and
+callee pairs rather than whole stacks, so stacks are rebuilt by walking the
+call graph down from its roots and splitting each function's time between
+its callers in proportion to the time each caller spent in it.
+"""
+import cProfile
+import os
+import pstats
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Number of functions listed in a profile summary
+DEFAULT_TOP = 25
+# Stacks deeper than this are cut off (recursion is also cut at its first repeat)
+MAX_STACK_DEPTH = 64
+
+# Only one profiler can be active at a time
+_profile_lock = threading.Lock()
+
+# pstats function key: (file name, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+
+def profile_call(func: Callable[..., Any], *args, **kwargs) -> Tuple[Any, pstats.Stats]:
+    """Call func under cProfile; returns its result and the collected statistics"""
+    profile = cProfile.Profile()
+    with _profile_lock:
+        result = profile.runcall(func, *args, **kwargs)
+    return result, pstats.Stats(profile)
+
+
+def frame_name(key: FunctionKey) -> str:
+    """Readable name of a profiled function, e.g. models.py:area:951"""
+    filename, line, name = key
+    if filename == '~':  # Built-in functions
+        label = name
+    else:
+        label = f"{os.path.basename(filename)}:{name}:{line}"
+    return label.replace(';', ',').replace(' ', '_')
+
+
+def top_functions(stats: pstats.Stats, limit: int = DEFAULT_TOP) -> List[dict]:
+    """Functions with the most self time, with their call counts and times in seconds"""
+    rows = []
+    for key, (primitive_calls, calls, self_time, cumulative_time, _) in stats.stats.items():
+        rows.append({
+            'function': frame_name(key),
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'self_time': self_time,
+            'cumulative_time': cumulative_time
+        })
+    rows.sort(key=lambda row: row['self_time'], reverse=True)
+    return rows[:limit]
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """Profile as collapsed stack lines weighted in microseconds of self time"""
+    entries = stats.stats
+    callees: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    for key, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees.setdefault(caller, []).append((key, edge_cumulative))
+
+    totals: Dict[str, float] = {}
+
+    def walk(key: FunctionKey, path: List[str], on_stack: set, share: float, depth: int):
+        # share is the fraction of this function's time that was spent on this path
+        _, _, self_time, cumulative_time, _ = entries[key]
+        path = path + [frame_name(key)]
+        stack = ';'.join(path)
+        totals[stack] = totals.get(stack, 0.0) + self_time * share
+        if depth >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_cumulative in callees.get(key, ()):
+            callee_cumulative = entries[callee][3]
+            if callee in on_stack or callee_cumulative <= 0:
+                continue
+            # Time spent in callee from this call site, on this path
+            callee_share = share * edge_cumulative / callee_cumulative
+            if callee_share * callee_cumulative * 1e6 >= 1:
+                walk(callee, path, on_stack | {callee}, callee_share, depth + 1)
+
+    for key, (_, _, _, _, callers) in entries.items():
+        if not callers and key[2] != "<method 'disable' of '_lsprof.Profiler' objects>":
+            walk(key, [], {key}, 1.0, 0)
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in totals.items() if round(seconds * 1e6) > 0]
+
+
+def save_profile(stats: pstats.Stats, directory: str, label: str = 'request') -> Dict[str, str]:
+    """Write the raw statistics (.prof, readable with pstats or snakeviz) and collapsed stacks"""
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}")
+    stats.dump_stats(base + '.prof')
+    with open(base + '.collapsed', 'w') as f:
+        f.write('\n'.join(collapsed_stacks(stats)) + '\n')
+    return {'stats': base + '.prof', 'collapsed': base + '.collapsed'}
+
+
+def summarize(stats: pstats.Stats, top: int = DEFAULT_TOP, directory: Optional[str] = None,
+              label: str = 'request') -> dict:
+    """Profile section of an API response, optionally saving the profile to directory"""
+    summary = {
+        'total_time': stats.total_tt,
+        'top_functions': top_functions(stats, top),
+        'collapsed_stacks': collapsed_stacks(stats)
+    }
+    if directory:
+        summary['saved'] = save_profile(stats, directory, label)
+    return summary
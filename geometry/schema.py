@@ -0,0 +1,168 @@
+"""Declarative request schemas compiled into payload validators.
+
+An operation declares its input as a mapping of payload keys to Field
+objects, e.g. {"line1": LINE, "line2": LINE}. compile_schema turns that
+mapping into a single function, built once per operation, that checks a
+payload and returns the model objects to call the operation with. Problems
+are reported as ValidationError with an error code and the dotted path of
+the offending value, without formatting a traceback.
+"""
+from typing import Any, Callable, Dict, List, Optional
+
+from geometry.models import Point, PointArray, Line, Circle, Triangle, GeometryError, PointError
+
+# Marks a missing payload key
+_MISSING = object()
+
+
+class ValidationError(GeometryError):
+    """Exception for request payloads that do not match an operation's schema"""
+    code = 'invalid_request'
+
+    def __init__(self, message: str, path: str = '', code: Optional[str] = None):
+        super().__init__(message)
+        self.path = path
+        if code is not None:
+            self.code = code
+
+
+def _join(path: str, key) -> str:
+    return f"{path}.{key}" if path else str(key)
+
+
+class Field:
+    """Payload field: parse(value, path) checks a JSON value and converts it to a model value"""
+    __slots__ = ('parse', 'required', 'default')
+
+    def __init__(self, parse: Callable[[Any, str], Any], required: bool = True, default: Any = None):
+        self.parse = parse
+        self.required = required
+        self.default = default
+
+    def optional(self, default: Any = None) -> 'Field':
+        """Same field, but the key may be left out (or null) to use default"""
+        return Field(self.parse, False, default)
+
+
+def compile_schema(spec: Dict[str, Field]) -> Callable[[Any], Dict[str, Any]]:
+    """Build the validator of a schema: payload dict in, parsed arguments out"""
+    fields = tuple((key, field.parse, field.required, field.default) for key, field in spec.items())
+
+    def validate(data, path: str = '') -> Dict[str, Any]:
+        if not isinstance(data, dict):
+            raise ValidationError("Expected a JSON object", path, 'invalid_type')
+        args = {}
+        for key, parse, required, default in fields:
+            value = data.get(key, _MISSING)
+            if value is _MISSING or value is None:
+                if required:
+                    raise ValidationError(f"Missing required field: {key}", _join(path, key), 'missing_field')
+                args[key] = default
+            else:
+                args[key] = parse(value, _join(path, key))
+        return args
+    return validate
+
+
+def nested(spec: Dict[str, Field], build: Callable[..., Any]) -> Field:
+    """Field holding a JSON object with its own schema, converted with build(**args)"""
+    validate = compile_schema(spec)
+
+    def parse(value, path):
+        return build(**validate(value, path))
+    return Field(parse)
+
+
+def list_of(item: Field) -> Field:
+    """Field holding a JSON array whose elements all match item"""
+    parse_item = item.parse
+
+    def parse(value, path):
+        if not isinstance(value, list):
+            raise ValidationError("Expected a JSON array", path, 'invalid_type')
+        return [parse_item(element, _join(path, i)) for i, element in enumerate(value)]
+    return Field(parse)
+
+
+def choice(*values: str) -> Field:
+    """Field holding one of a fixed set of strings"""
+    def parse(value, path):
+        if value not in values:
+            raise ValidationError(f"Expected one of: {', '.join(values)}", path, 'invalid_value')
+        return value
+    return Field(parse)
+
+
+def _parse_number(value, path) -> float:
+    if isinstance(value, bool):
+        raise ValidationError("Expected a number", path, 'invalid_type')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValidationError("Expected a number", path, 'invalid_type')
+
+
+def _parse_integer(value, path) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValidationError("Expected an integer", path, 'invalid_type')
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValidationError("Expected an integer", path, 'invalid_type')
+    if not number.is_integer():
+        raise ValidationError("Expected an integer", path, 'invalid_type')
+    return int(number)
+
+
+def _parse_boolean(value, path) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    raise ValidationError("Expected true or false", path, 'invalid_type')
+
+
+def _parse_string(value, path) -> str:
+    if not isinstance(value, str):
+        raise ValidationError("Expected a string", path, 'invalid_type')
+    return value
+
+
+def _parse_point(value, path) -> Point:
+    try:
+        return Point(value['x'], value['y'])
+    except (KeyError, TypeError, IndexError):
+        raise ValidationError("Expected a point object with x and y", path, 'invalid_type')
+    except PointError as e:
+        raise ValidationError(str(e), path, 'invalid_value')
+
+
+def _parse_points(value, path) -> PointArray:
+    if isinstance(value, PointArray):
+        # Already decoded, e.g. from a binary request body
+        return value
+    if not isinstance(value, list):
+        raise ValidationError("Expected a JSON array of points", path, 'invalid_type')
+    try:
+        return PointArray.from_dicts(value)
+    except PointError as e:
+        raise ValidationError(str(e), path, 'invalid_value')
+
+
+def _parse_raw(value, path):
+    return value
+
+
+NUMBER = Field(_parse_number)
+INTEGER = Field(_parse_integer)
+BOOLEAN = Field(_parse_boolean)
+STRING = Field(_parse_string)
+ANY = Field(_parse_raw)
+POINT = Field(_parse_point)
+# Missing x or y coordinates in a point list default to 0, as in PointArray.from_dicts
+POINTS = Field(_parse_points)
+LINE = nested({'point1': POINT, 'point2': POINT}, Line)
+CIRCLE = nested({'center': POINT, 'radius': NUMBER}, Circle)
+TRIANGLE = nested({'point1': POINT, 'point2': POINT, 'point3': POINT}, Triangle)
+# Unlike LINE, a segment may have identical endpoints; it parses to a (point1, point2) pair
+SEGMENT = nested({'point1': POINT, 'point2': POINT}, lambda point1, point2: (point1, point2))
@@ -0,0 +1,265 @@
+"""Pre-fork production server: python -m geometry.serve [--workers 4] [--port 5000]
+
+The master process imports the app, warms up the models and only then opens
+the listening socket and forks the workers, so every worker starts with
+the code paths already loaded (and shared copy-on-write). Workers serve
+one request at a time from the shared socket and exit after --max-requests
+requests (plus a random jitter, so they do not all restart together). The
+master replaces any worker that exits.
+
+SIGTERM or SIGINT shuts down gracefully: workers stop accepting, finish the
+request in hand and exit; those still running after --graceful-timeout are
+killed. SIGHUP replaces every worker the same way, without closing the socket.
+
+Each worker keeps its own result cache, spatial indexes and metrics, so
+/metrics and /api/cache/stats describe the worker that answered. Needs
+os.fork (Linux, macOS).
+"""
+import argparse
+import errno
+import gc
+import importlib
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+from werkzeug.serving import BaseWSGIServer
+
+# How often idle workers and the master check for signals, in seconds
+POLL_INTERVAL = 0.5
+# Workers that exit sooner than this after starting are restarted with a delay, to avoid a fork loop
+MIN_WORKER_LIFETIME = 1.0
+
+logger = logging.getLogger('geometry.serve')
+
+
+def load_app(target: str):
+    """Import a WSGI app from a "module:attribute" string"""
+    module_name, _, attribute = target.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute or 'app')
+
+
+def warm_up():
+    """Run a few representative operations so imports, lookups and code paths are hot before forking"""
+    from geometry.operations import run_operation
+
+    square = [{'x': 0, 'y': 0}, {'x': 4, 'y': 0}, {'x': 4, 'y': 3}, {'x': 0, 'y': 3}]
+    requests = [
+        ('line/intersection', {'line1': {'point1': {'x': 0, 'y': 0}, 'point2': {'x': 1, 'y': 1}},
+                               'line2': {'point1': {'x': 0, 'y': 1}, 'point2': {'x': 1, 'y': 0}}}),
+        ('circle/line_intersection', {'circle': {'center': {'x': 0, 'y': 0}, 'radius': 2},
+                                      'line': {'point1': {'x': -3, 'y': 0}, 'point2': {'x': 3, 'y': 1}}}),
+        ('triangle/circumcenter', {'point1': square[0], 'point2': square[1], 'point3': square[2]}),
+        ('polygon/area', {'points': square}),
+        ('polygon/contains_points', {'points': square, 'test_points': square}),
+        ('engine/convex_hull', {'points': square}),
+        ('transform/pipeline', {'points': square, 'steps': [{'type': 'rotate', 'center': square[0], 'angle': 30}]}),
+    ]
+    for name, data in requests:
+        run_operation(name, data, use_cache=False)
+
+
+class WorkerServer(BaseWSGIServer):
+    """Werkzeug server on an inherited non-blocking listening socket.
+
+    Every worker polls the same socket, so all of them wake up for a new
+    connection and only one accept succeeds; the others go back to polling.
+    """
+
+    def __init__(self, listener: socket.socket, app: Callable):
+        host, port = listener.getsockname()[:2]
+        super().__init__(host, port, app, fd=listener.fileno())
+        self.socket.setblocking(False)
+
+    def get_request(self):
+        connection, address = super().get_request()
+        connection.setblocking(True)
+        return connection, address
+
+
+class Worker:
+    """Child process loop: serve requests until told to stop or the request budget is used up"""
+
+    def __init__(self, listener: socket.socket, app: Callable, max_requests: int):
+        self.listener = listener
+        self.app = app
+        self.max_requests = max_requests
+        self.served = 0
+        self.alive = True
+
+    def count_requests(self, environ, start_response):
+        self.served += 1
+        return self.app(environ, start_response)
+
+    def stop(self, signum, frame):
+        self.alive = False
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGHUP, self.stop)
+        # Ctrl-C reaches the whole process group; the master turns it into SIGTERM
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        server = WorkerServer(self.listener, self.count_requests)
+        server.timeout = POLL_INTERVAL
+        while self.alive and (not self.max_requests or self.served < self.max_requests):
+            server.handle_request()
+        server.socket.close()
+
+
+class Arbiter:
+    """Master process: keeps the configured number of workers running on one listening socket"""
+
+    def __init__(self, app: Callable, host: str = '0.0.0.0', port: int = 5000, workers: int = 2,
+                 max_requests: int = 0, max_requests_jitter: int = 0, graceful_timeout: float = 30.0,
+                 backlog: int = 2048):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.num_workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.backlog = backlog
+        self.listener: Optional[socket.socket] = None
+        self.workers: Dict[int, float] = {}  # pid -> start time
+        self.stopping = False
+        self.reload = False
+
+    def bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        listener = socket.socket(family, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((self.host, self.port))
+        listener.listen(self.backlog)
+        self.port = listener.getsockname()[1]
+        return listener
+
+    def spawn(self):
+        budget = self.max_requests
+        if budget and self.max_requests_jitter:
+            budget += random.randint(0, self.max_requests_jitter)
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return
+        # Child: never return into the master's code
+        status = 0
+        try:
+            random.seed()
+            Worker(self.listener, self.app, budget).run()
+        except BaseException:
+            logger.exception("Worker %s failed", os.getpid())
+            status = 1
+        finally:
+            os._exit(status)
+
+    def handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def handle_reload(self, signum, frame):
+        self.reload = True
+
+    def reap(self) -> bool:
+        """Collect exited workers; returns True if one died right after starting"""
+        crashed = False
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return crashed
+            if not pid:
+                return crashed
+            started = self.workers.pop(pid, None)
+            if started is not None and os.waitstatus_to_exitcode(status) != 0 and \
+                    time.monotonic() - started < MIN_WORKER_LIFETIME:
+                crashed = True
+
+    def signal_workers(self, signum: int):
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+
+    def run(self):
+        """Warm up, open the socket, fork the workers and supervise them until stopped"""
+        warm_up()
+        self.listener = self.bind()
+        # Objects created so far are never freed; keep the collector from touching (and copying) them
+        gc.freeze()
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        signal.signal(signal.SIGHUP, self.handle_reload)
+        logger.info("Serving on %s:%s with %d workers (pid %s)", self.host, self.port, self.num_workers, os.getpid())
+
+        try:
+            while not self.stopping:
+                if self.reload:
+                    self.reload = False
+                    logger.info("Replacing workers")
+                    self.signal_workers(signal.SIGHUP)
+                if self.reap():
+                    time.sleep(MIN_WORKER_LIFETIME)
+                while len(self.workers) < self.num_workers and not self.stopping:
+                    self.spawn()
+                time.sleep(POLL_INTERVAL)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        logger.info("Shutting down %d workers", len(self.workers))
+        self.signal_workers(signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.05)
+        self.signal_workers(signal.SIGKILL)
+        while self.workers:
+            try:
+                pid, _ = os.waitpid(-1, 0)
+            except ChildProcessError:
+                break
+            self.workers.pop(pid, None)
+        if self.listener is not None:
+            self.listener.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app', default='app:app', help='WSGI app to serve, as module:attribute')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-requests', type=int, default=10000,
+                        help='replace a worker after this many requests (0 never replaces workers)')
+    parser.add_argument('--max-requests-jitter', type=int, default=1000,
+                        help='add up to this many requests to each worker\'s budget')
+    parser.add_argument('--graceful-timeout', type=float, default=30.0,
+                        help='seconds workers get to finish their request on shutdown')
+    parser.add_argument('--access-log', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, 'fork'):
+        parser.error("the pre-fork server needs os.fork; use a WSGI server such as waitress on this platform")
+    logging.basicConfig(level=logging.INFO, format='[%(process)d] %(message)s')
+    if not args.access_log:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    app = load_app(args.app)
+    try:
+        Arbiter(app, args.host, args.port, args.workers, args.max_requests, args.max_requests_jitter,
+                args.graceful_timeout).run()
+    except OSError as e:
+        if e.errno == errno.EADDRINUSE:
+            sys.exit(f"Port {args.port} is already in use")
+        raise
+
+
+if __name__ == '__main__':
+    main()
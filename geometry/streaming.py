@@ -0,0 +1,170 @@
+"""Incremental processing of large point sets sent as NDJSON.
+
+Each line of the input is either one point object {"x": .., "y": ..} or a
+JSON array of such objects (a batch). Lines are read from the request body
+in fixed-size blocks and grouped into PointArray chunks, so memory use
+depends on the chunk size rather than on the size of the input.
+"""
+import json
+import math
+from typing import Iterable, Iterator, Optional
+
+from geometry.models import (
+    Point, PointArray, AffineTransform, GeometryError, LineError, PointError, PolygonError
+)
+from geometry.operations import error_info, parse_transform_step
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, chunks are processed with plain loops instead
+    np = None
+
+# Bytes read from the request body at a time
+READ_BLOCK_SIZE = 64 * 1024
+
+# Points grouped into one PointArray before processing
+STREAM_CHUNK_SIZE = 4096
+
+
+class StreamError(GeometryError):
+    """Exception for malformed streams"""
+    code = 'invalid_stream'
+
+
+def iter_lines(stream, block_size: int = READ_BLOCK_SIZE) -> Iterator[bytes]:
+    """Split a binary stream into non-blank lines, reading one block at a time"""
+    pending = b''
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        lines = (pending + block).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
+
+
+def iter_point_chunks(lines: Iterable[bytes], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[PointArray]:
+    """Group NDJSON point lines into PointArray chunks of at most chunk_size points"""
+    xs, ys = [], []
+    for number, line in enumerate(lines, 1):
+        try:
+            item = json.loads(line)
+            for point in (item if isinstance(item, list) else [item]):
+                xs.append(float(point['x']))
+                ys.append(float(point['y']))
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise PointError(f"Invalid point coordinates on line {number}")
+        while len(xs) >= chunk_size:
+            yield PointArray(xs[:chunk_size], ys[:chunk_size])
+            del xs[:chunk_size], ys[:chunk_size]
+    if xs:
+        yield PointArray(xs, ys)
+
+
+class RingAccumulator:
+    """Shoelace sums of a closed ring fed in chunks, in constant memory"""
+
+    def __init__(self):
+        self.count = 0
+        self.first = None
+        self.last = None
+        self.cross_sum = 0.0
+        self.cx_sum = 0.0
+        self.cy_sum = 0.0
+        self.perimeter = 0.0
+
+    def add(self, chunk: PointArray):
+        """Add the next vertices of the ring"""
+        n = len(chunk)
+        if n == 0:
+            return
+        xs, ys = chunk.to_list(chunk.xs), chunk.to_list(chunk.ys)
+        if self.last is None:
+            self.first = (xs[0], ys[0])
+            x1, y1, x2, y2 = xs[:-1], ys[:-1], xs[1:], ys[1:]
+        else:
+            x1, y1, x2, y2 = [self.last[0]] + xs[:-1], [self.last[1]] + ys[:-1], xs, ys
+        self._add_edges(x1, y1, x2, y2)
+        self.count += n
+        self.last = (xs[-1], ys[-1])
+
+    def _add_edges(self, x1, y1, x2, y2):
+        if np is not None:
+            x1, y1, x2, y2 = (np.asarray(v, dtype=np.float64) for v in (x1, y1, x2, y2))
+            if np.any((x1 == x2) & (y1 == y2)):
+                raise LineError("Cannot create a line with identical points")
+            factor = x1 * y2 - x2 * y1
+            self.cross_sum += float(factor.sum())
+            self.cx_sum += float(((x1 + x2) * factor).sum())
+            self.cy_sum += float(((y1 + y2) * factor).sum())
+            self.perimeter += float(np.hypot(x2 - x1, y2 - y1).sum())
+            return
+        for ax, ay, bx, by in zip(x1, y1, x2, y2):
+            if ax == bx and ay == by:
+                raise LineError("Cannot create a line with identical points")
+            factor = ax * by - bx * ay
+            self.cross_sum += factor
+            self.cx_sum += (ax + bx) * factor
+            self.cy_sum += (ay + by) * factor
+            self.perimeter += math.hypot(bx - ax, by - ay)
+
+    def finish(self) -> dict:
+        """Close the ring and return its area, perimeter and centroid"""
+        if self.count < 3:
+            raise PolygonError("A polygon must have at least 3 points")
+        (lx, ly), (fx, fy) = self.last, self.first
+        self._add_edges([lx], [ly], [fx], [fy])
+        self.last = self.first
+        try:
+            area6 = 3.0 * self.cross_sum
+            centroid = Point.from_floats(self.cx_sum / area6, self.cy_sum / area6)
+        except Exception as e:
+            raise PolygonError(f"Error calculating centroid: {str(e)}")
+        return {
+            'area': abs(self.cross_sum) / 2.0,
+            'perimeter': self.perimeter,
+            'centroid': centroid.to_dict(),
+            'vertex_count': self.count
+        }
+
+
+def polygon_measures(stream, chunk_size: int = STREAM_CHUNK_SIZE) -> dict:
+    """Area, perimeter and centroid of a polygon whose vertices arrive as NDJSON"""
+    ring = RingAccumulator()
+    for chunk in iter_point_chunks(iter_lines(stream), chunk_size):
+        ring.add(chunk)
+    return ring.finish()
+
+
+def read_transform_header(lines: Iterator[bytes]) -> AffineTransform:
+    """Parse the {"steps": [...]} header line of a transform stream into one fused transform"""
+    line: Optional[bytes] = next(lines, None)
+    if line is None:
+        raise StreamError("Transform stream is empty")
+    try:
+        header = json.loads(line)
+    except ValueError:
+        raise StreamError("The first line of a transform stream is not valid JSON")
+    if not isinstance(header, dict) or not isinstance(header.get('steps'), list):
+        raise StreamError("The first line of a transform stream must be a {\"steps\": [...]} header")
+    return AffineTransform.compose([parse_transform_step(step) for step in header['steps']])
+
+
+def transform_lines(lines: Iterator[bytes], transform: AffineTransform,
+                    chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Transform streamed points chunk by chunk, yielding NDJSON output as it is ready.
+
+    The response has already started by the time a bad line is found, so errors are
+    reported as a final {"success": false, "error": ...} line.
+    """
+    try:
+        for chunk in iter_point_chunks(lines, chunk_size):
+            out = chunk.transform(transform)
+            yield ''.join(json.dumps({'x': x, 'y': y}) + '\n'
+                          for x, y in zip(out.to_list(out.xs), out.to_list(out.ys)))
+    except Exception as e:
+        yield json.dumps(dict(error_info(e), success=False)) + '\n'
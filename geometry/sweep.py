@@ -0,0 +1,300 @@
+"""Bentley-Ottmann sweep for all intersections among line segments.
+
+The sweep line moves left to right over the segment endpoints and the
+crossings found so far. Its status is the list of segments the line
+currently cuts, ordered bottom to top. Only segments that become neighbours
+in that order are tested against each other, so the sweep takes
+O((n + k) log n) comparisons for n segments and k intersection points.
+The status is a plain Python list searched by bisection. Its inserts and
+deletes are memmoves, which is far cheaper in practice than a balanced tree
+written in Python.
+
+Segments are closed, so touching endpoints count as intersections.
+Collinear overlapping segments are reported at the start of their overlap
+and listed separately with the shared part. Zero-length segments (points)
+and vertical segments are supported. Coordinates are floats; points
+closer than a tolerance scaled to the input's extent are treated as equal.
+
+ring_crossings runs the same sweep over the edges of a polygon to test it
+for simplicity. Asked only whether the ring is simple, it is the Shamos-Hoey
+test: any crossing between neighbours in the status already answers the
+question, so crossings are never queued and the sweep stops at the first one,
+taking O(n log n) time.
+"""
+import heapq
+import math
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Relative tolerance, multiplied by the largest absolute coordinate
+RELATIVE_TOLERANCE = 1e-9
+
+
+class Intersection(NamedTuple):
+    """Point shared by two or more segments, with the indices of all segments through it"""
+    x: float
+    y: float
+    segments: Tuple[int, ...]
+
+
+class Overlap(NamedTuple):
+    """Part shared by two collinear segments, from its leftmost (then lowest) end"""
+    segments: Tuple[int, int]
+    start: Tuple[float, float]
+    end: Tuple[float, float]
+
+
+class SweepResult(NamedTuple):
+    intersections: List[Intersection]
+    overlaps: List[Overlap]
+
+
+def segment_intersections(x1s: Sequence[float], y1s: Sequence[float], x2s: Sequence[float],
+                          y2s: Sequence[float], tolerance: Optional[float] = None) -> SweepResult:
+    """All intersection points among the segments (x1s[i], y1s[i]) - (x2s[i], y2s[i]).
+
+    Intersections are listed in sweep order (by x, then y); each pair of segments is
+    reported once, at the leftmost point the two share.
+    """
+    return _Sweep(x1s, y1s, x2s, y2s, tolerance).run()
+
+
+def ring_crossings(xs: Sequence[float], ys: Sequence[float], first_only: bool = False,
+                   tolerance: Optional[float] = None) -> List[Tuple[int, int]]:
+    """Pairs of edges (i, j), i < j, of the closed ring through the vertices that make it non-simple.
+
+    Edge i runs from vertex i to vertex i + 1 (the last edge back to vertex 0). Consecutive
+    edges may only meet at the vertex they share; any other contact between two edges is
+    reported. With first_only the sweep stops at the first pair found.
+    """
+    ring = _RingSweep(xs, ys, tolerance, first_only)
+    if first_only:
+        try:
+            ring.run()
+        except _Found as found:
+            return [found.pair]
+        return []
+    result = ring.run()
+    pairs = set()
+    for found in result.intersections:
+        segments = found.segments
+        for k, i in enumerate(segments):
+            for j in segments[k + 1:]:
+                if not ring.allowed(i, j, found.x, found.y):
+                    pairs.add((i, j))
+    return sorted(pairs)
+
+
+class _Sweep:
+    def __init__(self, x1s, y1s, x2s, y2s, tolerance):
+        n = len(x1s)
+        if not (len(y1s) == len(x2s) == len(y2s) == n):
+            raise ValueError("Segment coordinate sequences must have the same length")
+        # Each segment runs from its left (then lower) endpoint a to its other endpoint b
+        self.ax, self.ay, self.bx, self.by = ax, ay, bx, by = [], [], [], []
+        for x1, y1, x2, y2 in zip(x1s, y1s, x2s, y2s):
+            x1, y1, x2, y2 = float(x1), float(y1), float(x2), float(y2)
+            if (x2, y2) < (x1, y1):
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            ax.append(x1)
+            ay.append(y1)
+            bx.append(x2)
+            by.append(y2)
+        if tolerance is None:
+            extent = max((abs(v) for values in (ax, ay, bx, by) for v in values), default=0.0)
+            tolerance = RELATIVE_TOLERANCE * max(1.0, extent)
+        self.eps = tolerance
+        # Slope of each segment just right of its left endpoint; vertical segments come last
+        self.slopes = [(by[s] - ay[s]) / (bx[s] - ax[s]) if bx[s] != ax[s] else math.inf for s in range(n)]
+
+        self.events: List[Tuple[float, float]] = []
+        self.queued = set()
+        self.starts: Dict[Tuple[float, float], List[int]] = {}
+        for s in range(n):
+            self.starts.setdefault((ax[s], ay[s]), []).append(s)
+            self.push((ax[s], ay[s]))
+            self.push((bx[s], by[s]))
+        self.status: List[int] = []
+        self.reported = set()
+        self.intersections: List[Intersection] = []
+        self.overlaps: List[Overlap] = []
+
+    def push(self, point: Tuple[float, float]):
+        if point not in self.queued:
+            self.queued.add(point)
+            heapq.heappush(self.events, point)
+
+    def y_at(self, s: int, px: float, py: float) -> float:
+        # Height of segment s on the sweep line at x = px. A vertical segment covers a
+        # whole range there; it is placed at the event height, clamped to that range.
+        ax, bx = self.ax[s], self.bx[s]
+        if ax == bx:
+            return min(max(py, self.ay[s]), self.by[s])
+        t = min(max((px - ax) / (bx - ax), 0.0), 1.0)
+        return self.ay[s] + t * (self.by[s] - self.ay[s])
+
+    def run(self) -> SweepResult:
+        eps = self.eps
+        events, starts, status = self.events, self.starts, self.status
+        while events:
+            point = heapq.heappop(events)
+            self.queued.discard(point)
+            px, py = point
+            upper = starts.pop(point, [])
+            # Events closer than the tolerance (e.g. a crossing computed next to an endpoint) are one event
+            while events and events[0][0] - px <= eps and abs(events[0][1] - py) <= eps:
+                merged = heapq.heappop(events)
+                self.queued.discard(merged)
+                upper += starts.pop(merged, [])
+
+            # Segments in the status that pass through or end at the event point form one block
+            lo, hi = 0, len(status)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.y_at(status[mid], px, py) < py - eps:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            hi = lo
+            while hi < len(status) and self.y_at(status[hi], px, py) <= py + eps:
+                hi += 1
+            through = status[lo:hi]
+
+            if len(upper) + len(through) > 1:
+                self.record(px, py, upper + through)
+
+            # Reinsert the segments that continue past the event in their order just right of it
+            continuing = [s for s in upper + through if not self.ends_at(s, px, py)]
+            continuing.sort(key=lambda s: (self.slopes[s], s))
+            status[lo:hi] = continuing
+            if continuing:
+                if lo > 0:
+                    self.check(status[lo - 1], continuing[0], px, py)
+                end = lo + len(continuing)
+                if end < len(status):
+                    self.check(continuing[-1], status[end], px, py)
+            elif 0 < lo < len(status):
+                self.check(status[lo - 1], status[lo], px, py)
+        self.intersections.sort(key=lambda found: (found.x, found.y))
+        return SweepResult(self.intersections, self.overlaps)
+
+    def ends_at(self, s: int, px: float, py: float) -> bool:
+        return abs(self.bx[s] - px) <= self.eps and abs(self.by[s] - py) <= self.eps
+
+    def record(self, px: float, py: float, segments: List[int]):
+        # Report the point if it holds a pair of segments not reported before
+        segments = sorted(set(segments))
+        new = False
+        for k, i in enumerate(segments):
+            for j in segments[k + 1:]:
+                if (i, j) not in self.reported:
+                    self.reported.add((i, j))
+                    new = True
+                    self.check_overlap(i, j)
+        if new:
+            self.intersections.append(Intersection(px, py, tuple(segments)))
+
+    def check_overlap(self, i: int, j: int):
+        shared = self.shared_part(i, j)
+        if shared is not None:
+            self.overlaps.append(Overlap((i, j), *shared))
+
+    def shared_part(self, i: int, j: int) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        # (start, end) of the part two collinear segments have in common, if it is longer than eps
+        ax, ay, bx, by = self.ax, self.ay, self.bx, self.by
+        dxi, dyi, dxj, dyj = bx[i] - ax[i], by[i] - ay[i], bx[j] - ax[j], by[j] - ay[j]
+        length_i, length_j = math.hypot(dxi, dyi), math.hypot(dxj, dyj)
+        if length_i <= self.eps or length_j <= self.eps:
+            return None
+        # Parallel, and the start of j lies on the line through i
+        if abs(dxi * dyj - dyi * dxj) > self.eps * max(length_i, length_j):
+            return None
+        if abs(dxi * (ay[j] - ay[i]) - dyi * (ax[j] - ax[i])) > self.eps * length_i:
+            return None
+        # Measure the overlap along i: nearly vertical segments leaving a point up and down
+        # pass the tests above and have their ends in the same (x, y) order, but share nothing
+        t1 = (dxi * (ax[j] - ax[i]) + dyi * (ay[j] - ay[i])) / length_i
+        t2 = (dxi * (bx[j] - ax[i]) + dyi * (by[j] - ay[i])) / length_i
+        if min(length_i, max(t1, t2)) - max(0.0, min(t1, t2)) <= self.eps:
+            return None
+        start = max((ax[i], ay[i]), (ax[j], ay[j]))
+        end = min((bx[i], by[i]), (bx[j], by[j]))
+        return start, end
+
+    def check(self, s: int, t: int, px: float, py: float):
+        # Queue the crossing of two neighbouring segments if it lies ahead of the sweep line
+        point = self.crossing(s, t)
+        if point is None:
+            return
+        x, y = point
+        if x > px + self.eps or (x >= px - self.eps and y > py + self.eps):
+            self.push(point)
+
+    def crossing(self, s: int, t: int) -> Optional[Tuple[float, float]]:
+        ax, ay, bx, by = self.ax, self.ay, self.bx, self.by
+        rx, ry = bx[s] - ax[s], by[s] - ay[s]
+        qx, qy = bx[t] - ax[t], by[t] - ay[t]
+        denominator = rx * qy - ry * qx
+        if denominator == 0:
+            return None  # Parallel; collinear overlaps are found at segment endpoints
+        wx, wy = ax[t] - ax[s], ay[t] - ay[s]
+        u = (wx * qy - wy * qx) / denominator
+        v = (wx * ry - wy * rx) / denominator
+        # Parameter tolerance equivalent to eps along each segment
+        tol_s = self.eps / max(math.hypot(rx, ry), self.eps)
+        tol_t = self.eps / max(math.hypot(qx, qy), self.eps)
+        if not (-tol_s <= u <= 1 + tol_s and -tol_t <= v <= 1 + tol_t):
+            return None
+        # Snap crossings at an endpoint to the exact endpoint, so they merge with its event
+        for k, param, tol in ((s, u, tol_s), (t, v, tol_t)):
+            if param <= tol:
+                return ax[k], ay[k]
+            if param >= 1 - tol:
+                return bx[k], by[k]
+        return ax[s] + u * rx, ay[s] + u * ry
+
+
+class _Found(Exception):
+    # Ends a first_only ring sweep at the first offending pair of edges
+    def __init__(self, pair: Tuple[int, int]):
+        super().__init__(pair)
+        self.pair = pair
+
+
+class _RingSweep(_Sweep):
+    # Sweep over the edges of a closed ring. With first_only it is the Shamos-Hoey test:
+    # offending pairs raise _Found as soon as they are seen instead of being recorded.
+    def __init__(self, xs, ys, tolerance, first_only=False):
+        xs, ys = [float(x) for x in xs], [float(y) for y in ys]
+        super().__init__(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1], tolerance)
+        self.xs, self.ys = xs, ys
+        self.first_only = first_only
+
+    def allowed(self, i: int, j: int, px: float, py: float) -> bool:
+        # Consecutive edges may touch at their shared vertex, but not overlap
+        n = len(self.xs)
+        if (j - i) % n == 1:
+            vertex = j
+        elif (i - j) % n == 1:
+            vertex = i
+        else:
+            return False
+        if abs(self.xs[vertex] - px) > self.eps or abs(self.ys[vertex] - py) > self.eps:
+            return False
+        return self.shared_part(i, j) is None
+
+    def record(self, px: float, py: float, segments: List[int]):
+        if not self.first_only:
+            return super().record(px, py, segments)
+        segments = sorted(set(segments))
+        for k, i in enumerate(segments):
+            for j in segments[k + 1:]:
+                if not self.allowed(i, j, px, py):
+                    raise _Found((i, j))
+
+    def check(self, s: int, t: int, px: float, py: float):
+        if not self.first_only:
+            return super().check(s, t, px, py)
+        # Any contact between neighbours other than a shared vertex answers the test, wherever it is
+        point = self.crossing(s, t)
+        if point is not None and not self.allowed(s, t, *point):
+            raise _Found((min(s, t), max(s, t)))
@@ -0,0 +1,286 @@
+"""Triangulation of simple polygons.
+
+Polygons with more than EAR_CLIPPING_MAX_VERTICES vertices are first split
+into y-monotone pieces. A sweep from top to bottom adds a diagonal at every
+split and merge vertex (de Berg et al., Computational Geometry, chapter 3).
+Each piece is then triangulated in linear time with a stack, so the whole
+polygon takes O(n log n). Small polygons go straight to ear clipping: it is
+O(n^2), but cheaper than the sweep at that size.
+
+Vertices at the same height are ordered as if the plane were turned by a
+tiny angle (left one first), so horizontal edges need no special case. The
+polygon must be simple (see Polygon.is_simple); either orientation is
+accepted. Like the other engines, this works on coordinate buffers and
+answers with vertex indices.
+"""
+import math
+from typing import Dict, List, Sequence, Tuple
+
+from geometry.delaunay import orient
+
+# Polygons with at most this many vertices are ear clipped
+EAR_CLIPPING_MAX_VERTICES = 32
+
+
+def _floats(values: Sequence[float]) -> List[float]:
+    return values.tolist() if hasattr(values, 'tolist') else [float(v) for v in values]
+
+
+def triangulate_polygon(xs: Sequence[float], ys: Sequence[float]) -> List[Tuple[int, int, int]]:
+    """Triangles covering the simple polygon with vertices (xs[i], ys[i]), as counter-clockwise
+    vertex index triples; a polygon with n vertices gives n - 2 triangles"""
+    xs, ys = _floats(xs), _floats(ys)
+    n = len(xs)
+    if len(ys) != n:
+        raise ValueError("x and y sequences must have the same length")
+    if n < 3:
+        return []
+    ring = list(range(n))
+    if sum(xs[i - 1] * ys[i] - xs[i] * ys[i - 1] for i in range(n)) < 0:
+        ring.reverse()
+    if n <= EAR_CLIPPING_MAX_VERTICES:
+        return ear_clip(xs, ys, ring)
+    triangles = []
+    for piece in monotone_pieces(xs, ys, ring):
+        triangles.extend(_triangulate_monotone(xs, ys, piece))
+    return triangles
+
+
+def ear_clip(xs: List[float], ys: List[float], ring: List[int]) -> List[Tuple[int, int, int]]:
+    """Triangulate a simple counter-clockwise polygon, given as vertex indices, by cutting off ears"""
+    ring = list(ring)
+    triangles = []
+    i = misses = 0
+    while len(ring) > 3:
+        k = len(ring)
+        i %= k
+        a, b, c = ring[i - 1], ring[i], ring[(i + 1) % k]
+        if _is_ear(xs, ys, ring, a, b, c):
+            triangles.append((a, b, c))
+            del ring[i]
+            misses = 0
+        else:
+            i += 1
+            misses += 1
+            if misses > k:
+                raise ValueError("Polygon is not simple")
+    triangles.append(tuple(ring))
+    return triangles
+
+
+def _is_ear(xs, ys, ring, a, b, c) -> bool:
+    # b is a strictly convex corner and no other vertex lies in (or on) the triangle a, b, c
+    ax, ay, bx, by, cx, cy = xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+    if orient(ax, ay, bx, by, cx, cy) <= 0:
+        return False
+    for p in ring:
+        if p == a or p == b or p == c:
+            continue
+        px, py = xs[p], ys[p]
+        if orient(ax, ay, bx, by, px, py) >= 0 and orient(bx, by, cx, cy, px, py) >= 0 \
+                and orient(cx, cy, ax, ay, px, py) >= 0:
+            return False
+    return True
+
+
+def monotone_pieces(xs: List[float], ys: List[float], ring: List[int]) -> List[List[int]]:
+    """Split a simple counter-clockwise polygon, given as vertex indices, into y-monotone pieces.
+
+    Each piece is a list of vertex indices in counter-clockwise order.
+    """
+    n = len(ring)
+    px = [xs[v] for v in ring]
+    py = [ys[v] for v in ring]
+    # Below this point, positions k in ring stand for vertices; edge k runs from k to k + 1.
+
+    def below(a: int, b: int) -> bool:
+        return py[a] < py[b] or (py[a] == py[b] and px[a] > px[b])
+
+    # Edge k at height y lies at x = base_x[k] + (y - py[k]) * slope[k]. Horizontal edges enter
+    # and leave the status at their own height, before any other vertex there is processed,
+    # so their position never matters.
+    base_x, slope = px[:], [0.0] * n
+    for a in range(n):
+        b = a + 1 if a + 1 < n else 0
+        if py[a] != py[b]:
+            slope[a] = (px[b] - px[a]) / (py[b] - py[a])
+        elif px[b] < px[a]:
+            base_x[a] = px[b]
+
+    # Edges cut by the sweep line that have the interior on their right, ordered left to right
+    status: List[int] = []
+    helper = [0] * n
+    is_merge = [False] * n
+    diagonals: Dict[int, List[int]] = {}
+
+    def edge_left_of(k: int) -> int:
+        x, y = px[k], py[k]
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            edge = status[mid]
+            if base_x[edge] + (y - py[edge]) * slope[edge] <= x:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            raise ValueError("Polygon is not simple")
+        return status[lo - 1]
+
+    def position(x: float, y: float) -> int:
+        # Index of the first edge in the status at or right of (x, y)
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            edge = status[mid]
+            if base_x[edge] + (y - py[edge]) * slope[edge] < x:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def insert(edge: int):
+        status.insert(position(px[edge], py[edge]), edge)
+        helper[edge] = edge
+
+    def connect(a: int, b: int):
+        if (a - b) % n in (1, n - 1):
+            return
+        diagonals.setdefault(a, []).append(b)
+        diagonals.setdefault(b, []).append(a)
+
+    def close_edge(edge: int, k: int):
+        # Leaving an edge: a merge vertex waiting as its helper gets its diagonal down to k
+        if is_merge[helper[edge]]:
+            connect(k, helper[edge])
+        # The edge ends at k, so it sits where k would go; rounding may put it next door
+        i = position(px[k], py[k])
+        for j in (i, i - 1, i + 1):
+            if 0 <= j < len(status) and status[j] == edge:
+                del status[j]
+                return
+        status.remove(edge)
+
+    def pass_edge(edge: int, k: int):
+        # k becomes the lowest vertex seen right of edge, after linking up a waiting merge vertex
+        if is_merge[helper[edge]]:
+            connect(k, helper[edge])
+        helper[edge] = k
+
+    for k in sorted(range(n), key=lambda k: (-py[k], px[k])):
+        previous, following = k - 1 if k else n - 1, k + 1 if k + 1 < n else 0
+        previous_below, following_below = below(previous, k), below(following, k)
+        convex = orient(px[previous], py[previous], px[k], py[k], px[following], py[following]) > 0
+        if previous_below and following_below:
+            if convex:  # Start vertex
+                insert(k)
+            else:  # Split vertex: link it up to the lowest vertex seen left of it
+                left = edge_left_of(k)
+                connect(k, helper[left])
+                helper[left] = k
+                insert(k)
+        elif not previous_below and not following_below:
+            if convex:  # End vertex
+                close_edge(previous, k)
+            else:  # Merge vertex: the diagonal down from it is added by a later vertex
+                is_merge[k] = True
+                close_edge(previous, k)
+                pass_edge(edge_left_of(k), k)
+        elif not previous_below:  # Regular vertex with the interior on its right
+            close_edge(previous, k)
+            insert(k)
+        else:  # Regular vertex with the interior on its left
+            pass_edge(edge_left_of(k), k)
+
+    return [[ring[k] for k in piece] for piece in _faces(px, py, diagonals)]
+
+
+def _faces(px: List[float], py: List[float], diagonals: Dict[int, List[int]]) -> List[List[int]]:
+    # Pieces of a counter-clockwise polygon (ring positions) split along non-crossing diagonals.
+    # Walking with a piece on the left, the next vertex after u -> v is the first neighbour
+    # of v clockwise from u.
+    n = len(px)
+    around: Dict[int, List[int]] = {}
+    for v, others in diagonals.items():
+        neighbors = [(v - 1) % n, (v + 1) % n] + others
+        neighbors.sort(key=lambda w: math.atan2(py[w] - py[v], px[w] - px[v]))
+        around[v] = neighbors
+
+    def step(u: int, v: int) -> int:
+        neighbors = around.get(v)
+        if neighbors is None:
+            return (v + 1) % n
+        return neighbors[neighbors.index(u) - 1]
+
+    edge_done = bytearray(n)
+    diagonal_done = set()
+    starts = [(k, (k + 1) % n) for k in range(n)] + [(v, w) for v, others in diagonals.items() for w in others]
+    faces = []
+    for start in starts:
+        u, v = start
+        if (edge_done[u] if v == (u + 1) % n else (u, v) in diagonal_done):
+            continue
+        face = []
+        while True:
+            face.append(u)
+            if v == (u + 1) % n:
+                edge_done[u] = 1
+            else:
+                diagonal_done.add((u, v))
+            u, v = v, step(u, v)
+            if (u, v) == start:
+                break
+        faces.append(face)
+    return faces
+
+
+def _triangulate_monotone(xs: List[float], ys: List[float], piece: List[int]) -> List[Tuple[int, int, int]]:
+    # Triangulate a y-monotone counter-clockwise polygon with the stack algorithm
+    k = len(piece)
+    if k == 3:
+        return [tuple(piece)]
+    key = lambda v: (-ys[v], xs[v])
+    top = min(range(k), key=lambda i: key(piece[i]))
+    bottom = max(range(k), key=lambda i: key(piece[i]))
+    # Counter-clockwise from the top, the left chain runs down to the bottom, the right chain back up
+    left = set()
+    i = top
+    while i != bottom:
+        left.add(piece[i])
+        i = (i + 1) % k
+    chains = [piece[(top + j) % k] for j in range((bottom - top) % k)]
+    chains += [piece[(top - j) % k] for j in range(1, (top - bottom) % k)]
+    # The two chains are already sorted, so this is a linear merge
+    order = sorted(chains + [piece[bottom]], key=key)
+
+    triangles = []
+
+    def add(a: int, b: int, c: int):
+        if orient(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) < 0:
+            b, c = c, b
+        triangles.append((a, b, c))
+
+    stack = [order[0], order[1]]
+    for j in range(2, k - 1):
+        v = order[j]
+        if (v in left) != (stack[-1] in left):
+            # Opposite chain: v sees every vertex on the stack
+            while len(stack) > 1:
+                add(v, stack.pop(), stack[-1])
+            stack = [order[j - 1], v]
+        else:
+            # Same chain: cut off triangles while the diagonal from v stays inside
+            on_left = v in left
+            last = stack.pop()
+            while stack:
+                turn = orient(xs[stack[-1]], ys[stack[-1]], xs[last], ys[last], xs[v], ys[v])
+                if (turn <= 0) if on_left else (turn >= 0):
+                    break
+                add(v, last, stack[-1])
+                last = stack.pop()
+            stack.append(last)
+            stack.append(v)
+    v = order[k - 1]
+    while len(stack) > 1:
+        add(v, stack.pop(), stack[-1])
+    return triangles
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from geometry import binary, models
+from geometry.binary import BinaryFormatError, pack, unpack
+from geometry.models import PointArray
+
+
+def message(meta, count):
+    """A message with the metadata as given, unlike pack, which writes "arrays" itself"""
+    encoded = json.dumps(meta).encode()
+    encoded += b' ' * (-len(encoded) % 8)
+    return binary.HEADER.pack(binary.MAGIC, len(encoded), count) + encoded + bytes(16 * count)
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def engine(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(binary, 'np', None)
+        monkeypatch.setattr(models, 'np', None)
+    elif binary.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def test_round_trip(engine):
+    arrays = {'polygon1': PointArray([0.0, 4.0, 4.0], [0.0, 0.0, 3.0]), 'empty': PointArray([], []),
+              'polygon2': PointArray([1.5, -2.25], [1e300, -0.0])}
+    meta, decoded = unpack(pack({'operation': 'union', 'k': 3}, arrays))
+    assert meta == {'operation': 'union', 'k': 3}
+    assert list(decoded) == list(arrays)
+    for name, points in arrays.items():
+        assert decoded[name].to_dicts() == points.to_dicts()
+
+
+def test_body_without_arrays_is_points(engine):
+    meta, decoded = unpack(message({'k': 1}, 2))
+    assert meta == {'k': 1} and list(decoded) == ['points'] and len(decoded['points']) == 2
+
+
+@pytest.mark.parametrize('meta, count', [
+    ({'arrays': [1]}, 1),
+    ({'arrays': {'points': '1'}}, 1),
+    ({'arrays': {'a': -1, 'points': 2}}, 1),
+    ({'arrays': {'points': 1.5}}, 1),
+    ({'arrays': {'points': True}}, 1),
+    ({'arrays': 'points'}, 1),
+    ({'arrays': {'points': 3}}, 2),
+    ([1, 2], 0),
+])
+def test_malformed_metadata_is_an_error(engine, meta, count):
+    with pytest.raises(BinaryFormatError):
+        unpack(message(meta, count))
+
+
+@pytest.mark.parametrize('buffer', [b'', b'GPF0' + bytes(12), binary.HEADER.pack(binary.MAGIC, 0, 1)])
+def test_malformed_header_is_an_error(buffer):
+    with pytest.raises(BinaryFormatError):
+        unpack(buffer)
+
+
+def test_endpoint_rejects_malformed_arrays():
+    from app import app
+    client = app.test_client()
+    response = client.post('/api/polygon/area', data=message({'arrays': {'a': -1, 'points': 2}}, 1),
+                           content_type=binary.MIME_TYPE)
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'invalid_binary'
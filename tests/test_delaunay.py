@@ -0,0 +1,123 @@
+import math
+import random
+from fractions import Fraction
+
+import pytest
+
+from geometry import delaunay, hull
+from geometry.models import GeometryEngine, Point
+
+
+def exact(points):
+    """The points as exact integers, all scaled by the same power of two (floats are dyadic rationals)"""
+    ratios = [(Fraction(x), Fraction(y)) for x, y in points]
+    scale = max(value.denominator for point in ratios for value in point)
+    return [(int(x * scale), int(y * scale)) for x, y in ratios]
+
+
+def exact_orient(a, b, c):
+    (ax, ay), (bx, by), (cx, cy) = a, b, c
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def exact_incircle(a, b, c, d):
+    """Positive if d is strictly inside the circle through counter-clockwise a, b, c, in exact arithmetic"""
+    rows = [(x - d[0], y - d[1]) for x, y in (a, b, c)]
+    (adx, ady), (bdx, bdy), (cdx, cdy) = rows
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+            + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def hull_area(points, values):
+    """Twice the area of the points' convex hull, from their exact values"""
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    ring = [values[i] for i in hull.convex_hull_indices(xs, ys)]
+    return abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1])))
+
+
+def random_points(rng):
+    count = rng.randint(3, 60)
+    kind = rng.choice(['grid', 'float', 'circle'])
+    if kind == 'grid':
+        # Collinear and cocircular points everywhere, and duplicates
+        size = rng.choice([2, 4, 8])
+        return [(float(rng.randint(0, size)), float(rng.randint(0, size))) for _ in range(count)]
+    if kind == 'circle':
+        # Points on a circle are cocircular up to rounding
+        return [(math.cos(2 * math.pi * k / count), math.sin(2 * math.pi * k / count)) for k in range(count)]
+    return [(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(count)]
+
+
+def check_triangulation(points):
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    triangles, neighbors = delaunay.triangulate(xs, ys)
+    first = {}
+    for i, point in enumerate(points):
+        first.setdefault(point, i)
+    values = exact(points)
+    distinct = [values[i] for i in first.values()]
+    if all(exact_orient(distinct[0], distinct[-1], q) == 0 for q in distinct):
+        # Collinear, or a single point
+        assert triangles == [] and neighbors == []
+        return triangles
+    assert len(neighbors) == len(triangles)
+    # Every distinct point is a vertex, under its first index
+    assert {i for triangle in triangles for i in triangle} == set(first.values()), points
+    area = 0
+    for a, b, c in triangles:
+        twice_area = exact_orient(values[a], values[b], values[c])
+        assert twice_area > 0, points
+        area += twice_area
+        # Empty circumcircle: no point strictly inside, by brute force over every point
+        for d in first.values():
+            assert exact_incircle(values[a], values[b], values[c], values[d]) <= 0, (points, (a, b, c), d)
+    assert area == hull_area(points, values), points
+    # Neighbours agree: the triangle across each edge shares it and points back
+    for t, (triangle, across) in enumerate(zip(triangles, neighbors)):
+        for k, other in enumerate(across):
+            edge = {triangle[(k + 1) % 3], triangle[(k + 2) % 3]}
+            if other == -1:
+                continue
+            assert edge <= set(triangles[other]) and t in neighbors[other], points
+    return triangles
+
+
+def test_triangulation_has_empty_circumcircles():
+    rng = random.Random(0)
+    for _ in range(300):
+        check_triangulation(random_points(rng))
+
+
+@pytest.mark.parametrize('points', [
+    [(0.0, 0.0), (1.0, 1.0), (2.0, 2.0), (3.0, 3.0)],
+    [(1.0, 1.0)] * 4,
+    [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0)],
+    [(float(x), float(y)) for x in range(6) for y in range(6)],
+    [(1e9 + x, 1e9 + y) for x, y in [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0), (0.5, 0.5)]],
+])
+def test_degenerate_point_sets(points):
+    check_triangulation(points)
+
+
+def test_voronoi_vertices_are_empty_circle_centers():
+    rng = random.Random(1)
+    points = [(rng.uniform(-50, 50), rng.uniform(-50, 50)) for _ in range(80)]
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    triangulation = delaunay.triangulate(xs, ys)
+    diagram = delaunay.voronoi(xs, ys, triangulation)
+    assert len(diagram.xs) == len(triangulation.triangles) and len(diagram.cells) == len(points)
+    for (a, b, c), x, y in zip(triangulation.triangles, diagram.xs, diagram.ys):
+        radius = math.hypot(xs[a] - x, ys[a] - y)
+        assert math.hypot(xs[b] - x, ys[b] - y) == pytest.approx(radius)
+        assert math.hypot(xs[c] - x, ys[c] - y) == pytest.approx(radius)
+        assert min(math.hypot(px - x, py - y) for px, py in points) == pytest.approx(radius)
+    for site, cell in enumerate(diagram.cells):
+        assert all(site in triangulation.triangles[t] for t in cell.vertices)
+
+
+def test_engine_delaunay_matches_triangulate():
+    rng = random.Random(2)
+    points = [Point(rng.uniform(0, 10), rng.uniform(0, 10)) for _ in range(40)]
+    triangles, neighbors = GeometryEngine.delaunay(points)
+    expected = delaunay.triangulate([p.x for p in points], [p.y for p in points])
+    assert (triangles, neighbors) == tuple(expected)
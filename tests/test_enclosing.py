@@ -0,0 +1,100 @@
+import itertools
+import math
+import random
+
+import pytest
+
+from geometry import enclosing
+from geometry.models import GeometryEngine, GeometryError, Point, PointArray
+
+
+def random_points(rng, count):
+    kind = rng.choice(['grid', 'float', 'circle'])
+    if kind == 'grid':
+        # Duplicates, collinear and cocircular points
+        size = rng.choice([1, 3, 10])
+        return [(float(rng.randint(0, size)), float(rng.randint(0, size))) for _ in range(count)]
+    if kind == 'circle':
+        return [(math.cos(a), math.sin(a)) for a in (rng.uniform(0, 2 * math.pi) for _ in range(count))]
+    return [(rng.gauss(0, 50), rng.gauss(0, 50)) for _ in range(count)]
+
+
+def encloses(circle, points, tolerance=1e-9):
+    x, y, radius = circle
+    return all(math.hypot(px - x, py - y) <= radius * (1 + tolerance) + tolerance for px, py in points)
+
+
+def brute_force_radius(points):
+    """Smallest circle through two points as a diameter, or three on the boundary, holding every point"""
+    candidates = []
+    for (ax, ay), (bx, by) in itertools.combinations(points, 2):
+        candidates.append(((ax + bx) / 2, (ay + by) / 2, math.hypot(ax - bx, ay - by) / 2))
+    for (ax, ay), (bx, by), (cx, cy) in itertools.combinations(points, 3):
+        d = 2 * ((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+        if d == 0:
+            continue
+        b2, c2 = (bx - ax) ** 2 + (by - ay) ** 2, (cx - ax) ** 2 + (cy - ay) ** 2
+        ux, uy = ((cy - ay) * b2 - (by - ay) * c2) / d, ((bx - ax) * c2 - (cx - ax) * b2) / d
+        candidates.append((ax + ux, ay + uy, math.hypot(ux, uy)))
+    return min(radius for x, y, radius in candidates if encloses((x, y, radius), points))
+
+
+def check_circle(found, points):
+    assert encloses(found[:3], points), points
+    x, y, radius = found[:3]
+    assert 1 <= len(found.support) <= 3
+    for i in found.support:
+        assert math.hypot(points[i][0] - x, points[i][1] - y) == pytest.approx(radius, rel=1e-9, abs=1e-9)
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def engine(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(enclosing, 'np', None)
+    elif enclosing.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def test_matches_brute_force_on_small_sets(engine):
+    rng = random.Random(0)
+    for _ in range(300):
+        points = random_points(rng, rng.randint(2, 12))
+        if len(set(points)) < 2:
+            continue
+        found = enclosing.min_enclosing_circle(*zip(*points), seed=rng.randrange(1000))
+        check_circle(found, points)
+        assert found.radius == pytest.approx(brute_force_radius(points), rel=1e-9, abs=1e-12), points
+
+
+def test_every_point_is_inside_on_large_sets(engine):
+    # Large enough for the NumPy path and the octagon prefilter
+    rng = random.Random(1)
+    for _ in range(20):
+        points = random_points(rng, rng.randint(64, 3000))
+        xs, ys = [x for x, _ in points], [y for _, y in points]
+        found = enclosing.min_enclosing_circle(xs, ys, seed=0)
+        check_circle(found, points)
+        for other in (enclosing.min_enclosing_circle(xs, ys, seed=1),
+                      enclosing.min_enclosing_circle(xs, ys, seed=0, prefilter=False)):
+            assert other.radius == pytest.approx(found.radius, rel=1e-9)
+            assert (other.x, other.y) == pytest.approx((found.x, found.y), rel=1e-6, abs=1e-6)
+
+
+def test_engine_circle_with_and_without_hull():
+    rng = random.Random(2)
+    points = [Point(rng.gauss(0, 10), rng.gauss(0, 10)) for _ in range(500)]
+    circle = GeometryEngine.min_enclosing_circle(points)
+    assert encloses((circle.center.x, circle.center.y, circle.radius), [(p.x, p.y) for p in points])
+    hull = GeometryEngine.convex_hull(points)
+    for found in (GeometryEngine.min_enclosing_circle(points, hull_points=hull),
+                  GeometryEngine.min_enclosing_circle(PointArray.from_points(points))):
+        assert found.radius == pytest.approx(circle.radius)
+        assert (found.center.x, found.center.y) == pytest.approx((circle.center.x, circle.center.y))
+
+
+def test_coincident_points_are_an_error():
+    with pytest.raises(GeometryError):
+        GeometryEngine.min_enclosing_circle([Point(1, 1), Point(1, 1), Point(1, 1)])
+    with pytest.raises(GeometryError):
+        GeometryEngine.min_enclosing_circle([])
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from geometry import hull
+from geometry.models import GeometryEngine, Point
+
+# Three points on the bottom edge are equally far from the chord (0, 4) -> (4, 4)
+COLLINEAR_EDGE = [(0, 4), (3, 0), (1, 0), (4, 0), (4, 4)]
+
+
+@pytest.fixture(params=['numpy', 'vectorized', 'python'])
+def engine(request, monkeypatch):
+    """Run each test on the scalar NumPy path, the vectorized QuickHull split and pure Python"""
+    if request.param == 'python':
+        monkeypatch.setattr(hull, 'np', None)
+    elif hull.np is None:
+        pytest.skip("NumPy is not installed")
+    elif request.param == 'vectorized':
+        monkeypatch.setattr(hull, 'QUICKHULL_VECTOR_MIN_POINTS', 0)
+    return request.param
+
+
+def vertices(coords, method):
+    points = [Point(x, y) for x, y in coords]
+    return [(p.x, p.y) for p in GeometryEngine.convex_hull(points, method)]
+
+
+def test_quickhull_skips_collinear_points_at_equal_distance(engine):
+    assert vertices(COLLINEAR_EDGE, 'quickhull') == [(1, 0), (4, 0), (4, 4), (0, 4)]
+    assert vertices(COLLINEAR_EDGE, 'quickhull') == vertices(COLLINEAR_EDGE, 'monotone')
+
+
+def test_quickhull_matches_monotone_on_integer_grids(engine):
+    rng = random.Random(0)
+    for _ in range(200):
+        coords = [(rng.randint(-4, 4), rng.randint(-4, 4)) for _ in range(rng.choice([5, 20, 100]))]
+        assert vertices(coords, 'quickhull') == vertices(coords, 'monotone')
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from geometry import operations
+from geometry.index import SpatialIndex, SpatialIndexError, shape_contains, shape_distance, shape_intersects_window
+from geometry.models import Circle, Line, Point, Polygon, Triangle
+
+
+def random_shapes(count, rng):
+    shapes = []
+    for i in range(count):
+        x, y = rng.uniform(-100, 100), rng.uniform(-100, 100)
+        kind = i % 4
+        if kind == 0:
+            shape = Circle(Point(x, y), rng.uniform(0.5, 8))
+        elif kind == 1:
+            shape = Line(Point(x, y), Point(x + rng.uniform(-10, 10), y + rng.uniform(1, 10)))
+        elif kind == 2:
+            shape = Triangle(Point(x, y), Point(x + rng.uniform(1, 10), y), Point(x, y + rng.uniform(1, 10)))
+        else:
+            w, h = rng.uniform(1, 10), rng.uniform(1, 10)
+            # Concave, so the exact tests matter inside the bounding box
+            shape = Polygon([Point(x, y), Point(x + w, y), Point(x + w / 2, y + h / 2),
+                             Point(x + w, y + h), Point(x, y + h)])
+        shapes.append((i, shape))
+    return shapes
+
+
+def random_window(rng):
+    x, y = rng.uniform(-110, 110), rng.uniform(-110, 110)
+    return x, y, x + rng.uniform(0, 40), y + rng.uniform(0, 40)
+
+
+@pytest.fixture
+def indexed():
+    """A bulk-loaded index with some shapes inserted and deleted afterwards, and the shapes it holds"""
+    rng = random.Random(0)
+    shapes = random_shapes(400, rng)
+    index = SpatialIndex.bulk_load(shapes[:300], max_entries=4)
+    for shape_id, shape in shapes[300:]:
+        index.insert(shape_id, shape)
+    for shape_id in range(0, 400, 7):
+        assert index.delete(shape_id)
+    return index, {shape_id: shape for shape_id, shape in shapes if shape_id % 7}
+
+
+def test_query_window_matches_linear_scan(indexed):
+    index, shapes = indexed
+    rng = random.Random(1)
+    for _ in range(200):
+        window = random_window(rng)
+        expected = {i for i, shape in shapes.items() if shape_intersects_window(shape, window)}
+        assert sorted(index.query_window(*window)) == sorted(expected)
+
+
+def test_query_point_matches_linear_scan(indexed):
+    index, shapes = indexed
+    rng = random.Random(2)
+    for _ in range(300):
+        point = Point(rng.uniform(-110, 110), rng.uniform(-110, 110))
+        expected = {i for i, shape in shapes.items() if shape_contains(shape, point)}
+        assert sorted(index.query_point(point)) == sorted(expected)
+
+
+def test_nearest_matches_linear_scan(indexed):
+    index, shapes = indexed
+    rng = random.Random(3)
+    for _ in range(50):
+        point = Point(rng.uniform(-110, 110), rng.uniform(-110, 110))
+        distances = sorted(shape_distance(shape, point) for shape in shapes.values())
+        assert [distance for _, distance in index.nearest(point, 5)] == pytest.approx(distances[:5])
+
+
+def test_len_and_membership(indexed):
+    index, shapes = indexed
+    assert len(index) == len(shapes)
+    assert all(shape_id in index for shape_id in shapes)
+    assert 0 not in index and not index.delete(0)
+
+
+def test_inverted_window_is_an_error(indexed):
+    with pytest.raises(SpatialIndexError):
+        indexed[0].query_window(1, 0, 0, 1)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app import app
+    monkeypatch.setattr(operations, 'INDEXES', {})
+    return app.test_client()
+
+
+def point(x, y):
+    return {'x': x, 'y': y}
+
+
+SHAPES = [
+    {'type': 'circle', 'id': 'c', 'center': point(0, 0), 'radius': 2},
+    {'type': 'triangle', 'id': 't', 'point1': point(5, 0), 'point2': point(9, 0), 'point3': point(5, 4)},
+    {'type': 'line', 'id': 7, 'point1': point(-5, 5), 'point2': point(5, 5)},
+    {'type': 'polygon', 'id': 'p', 'points': [point(1, 1), point(6, 1), point(6, 3), point(1, 3)]},
+]
+
+
+def test_index_endpoints(client):
+    response = client.post('/api/index/build', json={'name': 'shapes', 'shapes': SHAPES})
+    assert response.get_json()['result'] == {'name': 'shapes', 'size': 4}
+
+    def query(route, **args):
+        response = client.post(f'/api/index/{route}', json=dict(args, name='shapes'))
+        assert response.status_code == 200
+        return response.get_json()['result']
+
+    assert sorted(query('query_point', point=point(1.2, 1.2))['ids']) == ['c', 'p']
+    window = {'min_x': 4, 'min_y': 2.5, 'max_x': 6, 'max_y': 6}
+    assert sorted(query('query_window', window=window)['ids'], key=str) == [7, 'p', 't']
+    assert query('nearest', point=point(20, 0), k=1)['nearest'][0]['id'] == 't'
+
+    assert query('insert', shapes=[{'type': 'circle', 'id': 'd', 'center': point(20, 0), 'radius': 1}])['size'] == 5
+    assert query('nearest', point=point(20, 0))['nearest'] == [{'id': 'd', 'distance': 0.0}]
+    assert query('delete', ids=['d', 'missing']) == {'deleted': ['d'], 'size': 4}
+
+
+def test_index_endpoint_errors(client):
+    response = client.post('/api/index/query_point', json={'name': 'missing', 'point': point(0, 0)})
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'invalid_operation'
+
+    response = client.post('/api/index/build', json={'name': 'shapes', 'shapes': [dict(SHAPES[0], id=None)]})
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'missing_field'
+
+    response = client.post('/api/index/build', json={'name': 'shapes', 'shapes': [{'type': 'hexagon', 'id': 1}]})
+    assert response.status_code == 400
+
+    client.post('/api/index/build', json={'name': 'shapes', 'shapes': SHAPES})
+    response = client.post('/api/index/query_window',
+                           json={'name': 'shapes', 'window': {'min_x': 1, 'min_y': 0, 'max_x': 0, 'max_y': 1}})
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'index_error'
@@ -0,0 +1,84 @@
+import itertools
+import math
+import random
+
+import pytest
+
+from geometry import kdtree
+from geometry.models import GeometryEngine, GeometryError, Point, PointArray
+
+
+def random_points(rng, count, size):
+    # Small grids give many duplicate points and distance ties
+    xs = [float(rng.randint(0, size)) for _ in range(count)]
+    ys = [float(rng.randint(0, size)) for _ in range(count)]
+    return xs, ys
+
+
+def scan(xs, ys, x, y):
+    """Every point as (index, distance), nearest first (ties by index), like the tree answers"""
+    return sorted(((i, math.hypot(px - x, py - y)) for i, (px, py) in enumerate(zip(xs, ys))),
+                  key=lambda found: (found[1], found[0]))
+
+
+def check(found, expected):
+    assert [i for i, _ in found] == [i for i, _ in expected]
+    assert [d for _, d in found] == pytest.approx([d for _, d in expected])
+
+
+@pytest.mark.parametrize('leaf_size', [1, 2, kdtree.DEFAULT_LEAF_SIZE])
+def test_nearest_and_within_match_linear_scan(leaf_size):
+    rng = random.Random(leaf_size)
+    for _ in range(60):
+        xs, ys = random_points(rng, rng.randint(1, 200), rng.choice([3, 20, 1000]))
+        tree = kdtree.KDTree(xs, ys, leaf_size)
+        assert len(tree) == len(xs)
+        for _ in range(10):
+            x, y = rng.uniform(-5, 1005), rng.uniform(-5, 1005)
+            if rng.random() < 0.3:
+                # Query at a point of the set, so distance zero and exact ties occur
+                x, y = rng.choice(list(zip(xs, ys)))
+            expected = scan(xs, ys, x, y)
+            for k in (1, 3, 10, len(xs) + 5):
+                check(tree.nearest(x, y, k), expected[:k])
+            for radius in (0.0, 1.0, rng.uniform(0, 300)):
+                check(tree.within(x, y, radius), [(i, d) for i, d in expected if d * d <= radius * radius])
+
+
+def test_empty_tree_and_degenerate_queries():
+    tree = kdtree.KDTree([], [])
+    assert len(tree) == 0
+    assert tree.nearest(0, 0, 3) == [] and tree.within(0, 0, 1) == []
+    tree = kdtree.KDTree([1.0, 2.0], [1.0, 2.0])
+    assert tree.nearest(0, 0, 0) == [] and tree.within(0, 0, -1) == []
+
+
+def test_closest_pair_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(300):
+        xs, ys = random_points(rng, rng.randint(2, 80), rng.choice([5, 50, 10000]))
+        i, j, distance = kdtree.closest_pair(xs, ys)
+        expected = min(math.hypot(xs[a] - xs[b], ys[a] - ys[b]) for a, b in itertools.combinations(range(len(xs)), 2))
+        assert i < j
+        assert distance == pytest.approx(expected)
+        assert math.hypot(xs[i] - xs[j], ys[i] - ys[j]) == pytest.approx(expected)
+    assert kdtree.closest_pair([1.0], [1.0]) is None
+
+
+@pytest.mark.parametrize('as_array', [False, True])
+def test_engine_queries_match_linear_scan(as_array):
+    rng = random.Random(1)
+    xs, ys = random_points(rng, 150, 40)
+    qx, qy = random_points(rng, 20, 40)
+    if as_array:
+        points, queries = PointArray(xs, ys), PointArray(qx, qy)
+    else:
+        points, queries = [Point(x, y) for x, y in zip(xs, ys)], [Point(x, y) for x, y in zip(qx, qy)]
+    for found, x, y in zip(GeometryEngine.nearest_neighbors(points, queries, 4), qx, qy):
+        check(found, scan(xs, ys, x, y)[:4])
+    for found, x, y in zip(GeometryEngine.radius_query(points, queries, 6.5), qx, qy):
+        check(found, [(i, d) for i, d in scan(xs, ys, x, y) if d <= 6.5])
+    with pytest.raises(GeometryError):
+        GeometryEngine.nearest_neighbors(points, queries, 0)
+    with pytest.raises(GeometryError):
+        GeometryEngine.closest_pair(points.take([0]) if as_array else points[:1])
@@ -0,0 +1,95 @@
+import collections
+import functools
+import inspect
+
+import pytest
+
+from geometry import models
+from geometry.models import Line, Point, Polygon, Triangle
+
+
+class Computations:
+    """Counts computations of memoized methods ('Class.method') and Line constructions ('Line')"""
+
+    def __init__(self):
+        self.total = collections.Counter()
+        self.per_shape = collections.Counter()
+        self.shapes = []  # Keeps counted shapes alive so their ids are not reused
+
+    def counting(self, key, function):
+        @functools.wraps(function)
+        def wrapper(shape, *args, **kwargs):
+            self.total[key] += 1
+            self.per_shape[key, id(shape)] += 1
+            self.shapes.append(shape)
+            return function(shape, *args, **kwargs)
+        return wrapper
+
+    def __getitem__(self, key):
+        return self.total[key]
+
+    def assert_computed_once(self):
+        repeated = [key for (key, _), count in self.per_shape.items() if key != 'Line' and count > 1]
+        assert not repeated
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    computations = Computations()
+    for cls in (Line, Triangle, Polygon):
+        for name, attribute in list(vars(cls).items()):
+            original = getattr(attribute, '__wrapped__', None)
+            if inspect.isfunction(attribute) and original is not None:
+                counted = computations.counting(f'{cls.__name__}.{name}', original)
+                monkeypatch.setattr(cls, name, models.memoized(counted))
+    # Both Line() and the internal constructor for known-distinct endpoints go through _init
+    monkeypatch.setattr(Line, '_init', computations.counting('Line', Line._init))
+    return computations
+
+
+def test_triangle_values_are_computed_once(computed):
+    triangle = Triangle(Point(0, 0), Point(4, 0), Point(1, 3))
+    first = triangle.to_dict()
+    lines = computed['Line']
+    assert computed['Triangle.orthocenter'] == computed['Triangle.circumcenter'] == 1
+
+    assert triangle.to_dict() == first
+    triangle.circumcircle()
+    triangle.circumcircle()
+    triangle.orthocenter()
+    assert computed['Line'] == lines
+    computed.assert_computed_once()
+
+
+def test_polygon_centroid_reuses_area(computed):
+    polygon = Polygon([Point(0, 0), Point(4, 0), Point(4, 3), Point(0, 3)])
+    for _ in range(3):
+        polygon.centroid()
+        polygon.area()
+    assert computed['Polygon.area'] == computed['Polygon.centroid'] == 1
+    computed.assert_computed_once()
+
+
+def test_line_to_dict_computes_each_value_once(computed):
+    line = Line(Point(0, 0), Point(3, 4))
+    assert line.to_dict() == line.to_dict()
+    assert computed['Line.slope'] == computed['Line.equation'] == computed['Line.length'] == 1
+    assert computed['Line'] == 1
+    computed.assert_computed_once()
+
+
+def test_values_are_cached_per_shape(computed):
+    Line(Point(0, 0), Point(3, 4)).length()
+    Line(Point(0, 0), Point(3, 4)).length()
+    assert computed['Line.length'] == 2
+
+
+@pytest.mark.parametrize('ring', [[(1, 1), (5, 1), (5, 4), (1, 4)], [(1, 1), (1, 4), (5, 4), (5, 1)],
+                                  [(0, 0), (6, 0), (6, 6), (3, 2), (0, 6)], [(0, 6), (3, 2), (6, 6), (6, 0), (0, 0)]])
+def test_polygon_centroid_matches_original_formula(ring):
+    # The original divides by the unsigned area, so clockwise rings give the centroid negated
+    area = abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]))) / 2
+    cx = sum((x0 + x1) * (x0 * y1 - x1 * y0) for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1])) / (6 * area)
+    cy = sum((y0 + y1) * (x0 * y1 - x1 * y0) for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1])) / (6 * area)
+    centroid = Polygon([Point(x, y) for x, y in ring]).centroid()
+    assert (centroid.x, centroid.y) == pytest.approx((cx, cy))
@@ -0,0 +1,57 @@
+import pytest
+
+from geometry import prepared
+from geometry.binary import MIME_TYPE, pack, unpack
+from geometry.models import Point, PointArray
+from geometry.operations import OPERATIONS, Echo, Lazy, resolve, run_operation
+
+SQUARE = [{'x': 0, 'y': 0}, {'x': 4, 'y': 0}, {'x': 4, 'y': 4}, {'x': 0, 'y': 4}]
+TEST_POINTS = [{'x': 1, 'y': 1}, {'x': 5, 'y': 1}, {'x': 2, 'y': 3}]
+
+
+def test_resolve_passes_lean_and_keep_arrays_into_lists():
+    points = PointArray([1.0, 2.0], [3.0, 4.0])
+    value = Lazy(lambda: [{'points': points, 'input': Echo(Point(0, 0))}, Echo(points)])
+    assert resolve(value) == [{'points': points.to_dicts(), 'input': {'x': 0.0, 'y': 0.0}}, points.to_dicts()]
+    assert resolve(value, lean=True) == [{'points': points.to_dicts()}, points.to_dicts()]
+    kept = resolve(value, lean=True, keep_arrays=True)
+    assert kept[0]['points'] is points and kept[1] is points
+
+
+def test_contains_points_is_computed_lazily_and_once(monkeypatch):
+    calls = []
+    contains_points = prepared.PreparedPolygon.contains_points
+    monkeypatch.setattr(prepared.PreparedPolygon, 'contains_points',
+                        lambda self, points: calls.append(len(points)) or contains_points(self, points))
+    op = OPERATIONS['polygon/contains_points']
+    result = op.handler(**op.validate({'points': SQUARE, 'test_points': TEST_POINTS}))
+    assert all(isinstance(value, Lazy) for value in result.values())
+    assert not calls
+    assert resolve(result) == {'contains': [True, False, True], 'inside_count': 2}
+    assert calls == [3]
+
+
+def test_contains_points_fields():
+    result = run_operation('polygon/contains_points', {'points': SQUARE, 'test_points': TEST_POINTS},
+                           fields='inside_count', use_cache=False)
+    assert result == {'inside_count': 2}
+
+
+def test_binary_pipeline_stages_keep_nested_points_in_the_metadata():
+    from app import app
+    body = pack({'steps': [{'type': 'translate', 'dx': 1, 'dy': 2}], 'return_stages': True},
+                {'points': PointArray([0.0, 1.0], [0.0, 1.0])})
+    response = app.test_client().post('/api/transform/pipeline', data=body, content_type=MIME_TYPE,
+                                      headers={'Accept': MIME_TYPE})
+    assert response.status_code == 200
+    meta, arrays = unpack(response.data)
+    assert meta['result']['stages'][0]['points'] == [{'x': 1.0, 'y': 2.0}, {'x': 2.0, 'y': 3.0}]
+    assert arrays['transformed_points'].to_dicts() == [{'x': 1.0, 'y': 2.0}, {'x': 2.0, 'y': 3.0}]
+
+
+@pytest.mark.parametrize('lean', [False, True])
+def test_lean_responses_drop_echoes_only(lean):
+    data = {'points': SQUARE[:2], 'steps': [{'type': 'translate', 'dx': 1, 'dy': 0}], 'return_stages': True}
+    result = run_operation('transform/pipeline', data, lean=lean, use_cache=False)
+    assert ('original_points' in result) == (not lean)
+    assert result['stages'][0]['points'] == [{'x': 1.0, 'y': 0.0}, {'x': 5.0, 'y': 0.0}]
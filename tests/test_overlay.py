@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from geometry import hull, overlay
+from geometry.models import Point, Polygon
+
+# Chains that cross exactly at another vertex's x-coordinate
+CROSSING_AT_COLUMN = [
+    ([(-8, 4), (-8, 3), (-6, -4), (-2, -8), (12, 0)], [(7, 3), (7, 4), (5, 5), (-3, -4), (6, -4), (7, -4)], 40.36657681940701),
+]
+
+
+def area(ring):
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1])) / 2
+
+
+def clip(subject, clipper):
+    """Sutherland-Hodgman clipping of a ring by a convex counter-clockwise ring"""
+    for (ax, ay), (bx, by) in zip(clipper, clipper[1:] + clipper[:1]):
+        side = lambda p: (bx - ax) * (p[1] - ay) - (by - ay) * (p[0] - ax)
+        points, subject = subject, []
+        for p, q in zip(points, points[1:] + points[:1]):
+            if side(p) >= 0:
+                subject.append(p)
+            if (side(p) < 0) != (side(q) < 0):
+                t = side(p) / (side(p) - side(q))
+                subject.append((p[0] + t * (q[0] - p[0]), p[1] + t * (q[1] - p[1])))
+        if not subject:
+            break
+    return subject
+
+
+def convex_ring(rng, size):
+    xs = [rng.randint(-size, size) for _ in range(rng.randint(3, 12))]
+    ys = [rng.randint(-size, size) for _ in range(len(xs))]
+    return [(xs[i], ys[i]) for i in hull.convex_hull_indices(xs, ys)]
+
+
+def convex_pairs(count, seed=0):
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < count:
+        a, b = convex_ring(rng, 8), convex_ring(rng, 8)
+        if len(a) >= 3 and len(b) >= 3:
+            pairs.append((a, b))
+    return pairs
+
+
+def vertices(rings):
+    return sorted((round(x, 9), round(y, 9)) for ring in rings for x, y in ring)
+
+
+def as_polygon(ring):
+    return Polygon([Point(x, y) for x, y in ring])
+
+
+@pytest.mark.parametrize('a, b, expected', CROSSING_AT_COLUMN)
+def test_convex_intersection_keeps_corner_where_chains_cross_at_a_column(a, b, expected):
+    rings = overlay.boolean(*zip(*a), *zip(*b), 'intersection', convex=True)
+    assert len(rings) == 1
+    assert area(rings[0]) == pytest.approx(expected)
+    assert (5.0, -4.0) in rings[0]
+    assert sum(p.coords.signed_area() for p in as_polygon(a).intersection(as_polygon(b))) == pytest.approx(expected)
+
+
+def test_convex_intersection_matches_overlay_and_clipping():
+    for a, b in convex_pairs(1500):
+        args = (*zip(*a), *zip(*b), 'intersection')
+        fast, general = overlay.boolean(*args, convex=True), overlay.boolean(*args)
+        expected = area(clip(a, b))
+        assert sum(area(ring) for ring in fast) == pytest.approx(expected, abs=1e-9), (a, b)
+        assert sum(area(ring) for ring in general) == pytest.approx(expected, abs=1e-9), (a, b)
+        assert vertices(fast) == vertices(general), (a, b)
+
+
+@pytest.mark.parametrize('operation', overlay.BOOLEAN_OPERATIONS)
+def test_overlay_areas_add_up(operation):
+    for a, b in convex_pairs(300, seed=1):
+        first, second = as_polygon(a), as_polygon(b)
+        common = area(clip(a, b))
+        expected = {'intersection': common,
+                    'union': area(a) + area(b) - common,
+                    'difference': area(a) - common}[operation]
+        result = first.boolean(second, operation)
+        assert sum(p.coords.signed_area() for p in result) == pytest.approx(expected, abs=1e-9), (a, b)
+        assert all(p.is_simple() for p in result)
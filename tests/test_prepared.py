@@ -0,0 +1,72 @@
+import math
+import random
+
+import pytest
+
+from geometry import hull, prepared
+from geometry.models import GeometryEngine, Point, PointArray, Polygon
+
+POLYGONS = {
+    'square': [(0, 0), (4, 0), (4, 4), (0, 4)],
+    'clockwise triangle': [(0, 0), (2, 6), (6, 0)],
+    'octagon': [(2, 0), (4, 0), (6, 2), (6, 4), (4, 6), (2, 6), (0, 4), (0, 2)],
+    'arrow': [(0, 0), (6, 3), (0, 6), (2, 3)],
+    'comb': [(0, 0), (8, 0), (8, 6), (7, 6), (6, 2), (5, 6), (4, 6), (3, 2), (2, 6), (0, 6)],
+    # Horizontal edges at the heights of other vertices
+    'stairs': [(0, 0), (6, 0), (6, 2), (4, 2), (4, 4), (2, 4), (2, 6), (0, 6)],
+}
+
+
+def grid_points(ring):
+    """Every half-integer point over the polygon's bounding box, so vertices and edges are hit"""
+    xs, ys = [x for x, _ in ring], [y for _, y in ring]
+    return [(x / 2, y / 2) for x in range(2 * min(xs) - 2, 2 * max(xs) + 3)
+            for y in range(2 * min(ys) - 2, 2 * max(ys) + 3)]
+
+
+def random_convex(rng):
+    xs = [rng.randint(-10, 10) for _ in range(20)]
+    ys = [rng.randint(-10, 10) for _ in range(20)]
+    return [(xs[i], ys[i]) for i in hull.convex_hull_indices(xs, ys)]
+
+
+def check_against_ray_casting(ring, points):
+    polygon = Polygon([Point(x, y) for x, y in ring])
+    index = polygon.prepare()
+    expected = [GeometryEngine.is_point_inside_polygon(Point(x, y), polygon) for x, y in points]
+    assert [index.contains_point(Point(x, y)) for x, y in points] == expected, ring
+    bulk = index.contains_points(PointArray([x for x, _ in points], [y for _, y in points]))
+    assert [bool(inside) for inside in bulk] == expected, ring
+    return index
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def engine(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(prepared, 'np', None)
+    elif prepared.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize('name', POLYGONS)
+def test_contains_matches_ray_casting(name, engine):
+    ring = POLYGONS[name]
+    index = check_against_ray_casting(ring, grid_points(ring))
+    assert index.is_convex == (name in ('square', 'clockwise triangle', 'octagon'))
+
+
+def test_convex_polygons_match_ray_casting(engine):
+    rng = random.Random(0)
+    for _ in range(100):
+        ring = random_convex(rng)
+        if len(ring) >= 3:
+            assert check_against_ray_casting(ring, grid_points(ring)).is_convex
+
+
+def test_star_matches_ray_casting(engine):
+    ring = [(round(r * math.cos(2 * math.pi * k / 40), 3), round(r * math.sin(2 * math.pi * k / 40), 3))
+            for k, r in zip(range(40), [10, 4] * 20)]
+    rng = random.Random(1)
+    points = [(rng.uniform(-11, 11), rng.uniform(-11, 11)) for _ in range(2000)] + ring
+    check_against_ray_casting(ring, points)
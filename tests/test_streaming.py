@@ -0,0 +1,38 @@
+import io
+import json
+
+import pytest
+
+from geometry.models import Point
+from geometry.streaming import StreamError, iter_lines, read_transform_header
+
+
+def lines(*items):
+    return iter_lines(io.BytesIO(b'\n'.join(item if isinstance(item, bytes) else json.dumps(item).encode()
+                                           for item in items)))
+
+
+def test_header_steps_are_fused():
+    steps = [{'type': 'translate', 'dx': 1, 'dy': 2}, {'type': 'scale', 'center': {'x': 0, 'y': 0}, 'sx': 2, 'sy': 3}]
+    transform = read_transform_header(lines({'steps': steps}))
+    point = transform.apply(Point(1, 1))
+    assert (point.x, point.y) == (4.0, 9.0)
+
+
+@pytest.mark.parametrize('header', [b'{"steps": [', b'not json', b'\xff', [1], {'stages': []}, {'steps': 3}])
+def test_malformed_header_is_a_stream_error(header):
+    with pytest.raises(StreamError):
+        read_transform_header(lines(header))
+
+
+def test_empty_stream_is_a_stream_error():
+    with pytest.raises(StreamError):
+        read_transform_header(iter_lines(io.BytesIO(b'\n\n')))
+
+
+def test_transform_endpoint_rejects_malformed_header():
+    from app import app
+    client = app.test_client()
+    response = client.post('/api/stream/transform', data=b'{"steps": [\n{"x": 1, "y": 2}\n')
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'invalid_stream'
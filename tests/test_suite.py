@@ -0,0 +1,37 @@
+import importlib
+import os
+
+import pytest
+
+from geometry.operations import RESULT_CACHE
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+
+@pytest.fixture
+def suite(monkeypatch):
+    monkeypatch.syspath_prepend(BENCHMARKS)
+    # run_suite turns the result cache off for timing
+    monkeypatch.setattr(RESULT_CACHE, 'max_entries', RESULT_CACHE.max_entries)
+    return importlib.import_module('suite')
+
+
+def test_every_case_runs_on_the_smallest_workload(suite):
+    results = suite.run_suite([10], ['random'], None, 1, 0.0, 0, log=lambda *args: None)
+    errors = [f"{r['case']}: {r['error']}" for r in results if 'error' in r]
+    assert not errors
+    assert {r['case'] for r in results} == set(suite.CASES)
+    assert all(r['seconds'] >= 0 and r['runs'] >= 1 for r in results)
+
+
+def test_every_method_and_route_has_a_case(suite):
+    assert suite.uncovered() == []
+
+
+def test_compare_reports_only_slowdowns_past_the_threshold(suite):
+    baseline = [{'case': 'a', 'workload': 'random', 'size': 10, 'seconds': 1.0},
+                {'case': 'b', 'workload': 'random', 'size': 10, 'seconds': 1.0}]
+    results = [{'case': 'a', 'workload': 'random', 'size': 10, 'seconds': 1.2},
+               {'case': 'b', 'workload': 'random', 'size': 10, 'seconds': 1.5},
+               {'case': 'c', 'workload': 'random', 'size': 10, 'seconds': 9.0}]
+    assert [r['case'] for r in suite.compare(results, baseline, 0.25, min_delta=0)] == ['b']
@@ -0,0 +1,178 @@
+import itertools
+import random
+from fractions import Fraction
+
+import pytest
+
+from geometry import sweep
+from geometry.models import Point, Polygon
+
+# Degenerate rings: a vertex visited twice, an edge folding back over the one before it,
+# a vertex touching another edge, collinear edges overlapping, and a repeated vertex
+DEGENERATE_RINGS = {
+    'shared vertex': [(0, 0), (2, 0), (1, 1), (2, 2), (0, 2), (1, 1)],
+    'fold back': [(0, 0), (4, 0), (2, 0), (2, 3)],
+    'touching edge': [(0, 0), (4, 0), (4, 4), (2, 0), (0, 4)],
+    'collinear overlap': [(0, 0), (4, 0), (4, 2), (1, 2), (1, 0), (3, 0), (3, -2), (0, -2)],
+    'repeated vertex': [(0, 0), (3, 0), (3, 0), (3, 3), (0, 3)],
+    'simple': [(0, 0), (4, 0), (4, 4), (2, 1), (0, 4)],
+}
+
+
+def orient(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def on_segment(a, b, p):
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+
+def segments_meet(a, b, c, d):
+    """Whether closed segments ab and cd share a point, exactly on integer coordinates"""
+    d1, d2, d3, d4 = orient(c, d, a), orient(c, d, b), orient(a, b, c), orient(a, b, d)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+    return ((d1 == 0 and on_segment(c, d, a)) or (d2 == 0 and on_segment(c, d, b))
+            or (d3 == 0 and on_segment(a, b, c)) or (d4 == 0 and on_segment(a, b, d)))
+
+
+def meeting_point(a, b, c, d):
+    """Leftmost (then lowest) point shared by closed segments ab and cd, exactly, or None"""
+    if not segments_meet(a, b, c, d):
+        return None
+    denominator = (b[0] - a[0]) * (d[1] - c[1]) - (b[1] - a[1]) * (d[0] - c[0])
+    if denominator != 0:
+        t = Fraction((c[0] - a[0]) * (d[1] - c[1]) - (c[1] - a[1]) * (d[0] - c[0]), denominator)
+        return a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1])
+    # Collinear (or a point): the shared part runs between the inner two endpoints
+    return max(min(a, b), min(c, d))
+
+
+def overlap(a, b, c, d):
+    """Shared part of two collinear segments as (start, end), or None if they share at most a point"""
+    if a == b or c == d or orient(a, b, c) != 0 or orient(a, b, d) != 0:
+        return None
+    start, end = max(min(a, b), min(c, d)), min(max(a, b), max(c, d))
+    return (start, end) if start < end else None
+
+
+def random_segments(rng, count, size):
+    return [((rng.randint(0, size), rng.randint(0, size)), (rng.randint(0, size), rng.randint(0, size)))
+            for _ in range(count)]
+
+
+def intersections(segments):
+    (x1s, y1s), (x2s, y2s) = zip(*(a for a, _ in segments)), zip(*(b for _, b in segments))
+    return sweep.segment_intersections(x1s, y1s, x2s, y2s)
+
+
+def brute_force_crossings(ring):
+    """Edge pairs meeting anywhere other than the vertex shared by consecutive edges, in O(n^2)"""
+    n = len(ring)
+    edges = [(ring[i], ring[(i + 1) % n]) for i in range(n)]
+    pairs = []
+    for i, j in itertools.combinations(range(n), 2):
+        (a, b), (c, d) = edges[i], edges[j]
+        if not segments_meet(a, b, c, d):
+            continue
+        if (j - i) % n == 1 or (i - j) % n == 1:
+            # Consecutive edges: v is the shared vertex, p and q their other ends. They meet
+            # elsewhere only when collinear and heading the same way from v.
+            v, p, q = (b, a, d) if (j - i) % n == 1 else (a, b, c)
+            if orient(v, p, q) != 0 or (p[0] - v[0]) * (q[0] - v[0]) + (p[1] - v[1]) * (q[1] - v[1]) <= 0:
+                continue
+        pairs.append((i, j))
+    return pairs
+
+
+def random_rings(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        size = rng.choice([2, 3, 6])
+        yield [(rng.randint(0, size), rng.randint(0, size)) for _ in range(rng.randint(3, 9))]
+
+
+def has_repeated_vertex(ring):
+    # Polygon rejects these, like Line does for identical points
+    return any(p == q for p, q in zip(ring, ring[1:] + ring[:1]))
+
+
+def crossings(ring, first_only=False):
+    return sweep.ring_crossings([x for x, _ in ring], [y for _, y in ring], first_only)
+
+
+@pytest.mark.parametrize('name', DEGENERATE_RINGS)
+def test_ring_crossings_match_brute_force_on_degenerate_rings(name):
+    ring = DEGENERATE_RINGS[name]
+    assert crossings(ring) == brute_force_crossings(ring)
+    assert (name == 'simple') == (not brute_force_crossings(ring))
+
+
+def test_ring_crossings_match_brute_force_on_random_rings():
+    for ring in random_rings(3000):
+        expected = brute_force_crossings(ring)
+        assert crossings(ring) == expected, ring
+        # The early-exit sweep may stop at any offending pair
+        first = crossings(ring, first_only=True)
+        assert len(first) == min(len(expected), 1) and set(first) <= set(expected), ring
+
+
+def test_polygon_is_simple_and_self_intersections():
+    rings = [ring for ring in random_rings(1000, seed=1) if not has_repeated_vertex(ring)]
+    for ring in rings:
+        polygon = Polygon([Point(x, y) for x, y in ring])
+        expected = brute_force_crossings(ring)
+        assert polygon.is_simple() == (not expected), ring
+        assert polygon.self_intersections() == expected, ring
+
+
+def test_is_simple_endpoint():
+    from app import app
+    client = app.test_client()
+    for name, ring in DEGENERATE_RINGS.items():
+        response = client.post('/api/polygon/is_simple', json={'points': [{'x': x, 'y': y} for x, y in ring]})
+        if has_repeated_vertex(ring):
+            assert response.status_code == 400
+            continue
+        assert response.status_code == 200
+        result = response.get_json()['result']
+        assert result['is_simple'] == (name == 'simple')
+        assert [tuple(pair) for pair in result['intersecting_edges']] == brute_force_crossings(ring)
+
+
+def test_segment_intersections_match_brute_force():
+    rng = random.Random(2)
+    for _ in range(500):
+        segments = random_segments(rng, rng.randint(2, 12), rng.choice([4, 10, 1000]))
+        result = intersections(segments)
+        expected = {}
+        for i, j in itertools.combinations(range(len(segments)), 2):
+            point = meeting_point(*segments[i], *segments[j])
+            if point is not None:
+                expected[i, j] = point
+        expected_overlaps = {}
+        for i, j in itertools.combinations(range(len(segments)), 2):
+            shared = overlap(*segments[i], *segments[j])
+            if shared is not None:
+                expected_overlaps[i, j] = shared
+        assert {o.segments: (o.start, o.end) for o in result.overlaps} == expected_overlaps, segments
+
+        found = {}
+        for x, y, ids in result.intersections:
+            for i, j in itertools.combinations(ids, 2):
+                # Points list every segment through them, so only an overlapping pair shows up again
+                assert (i, j) not in found or (i, j) in expected_overlaps, segments
+                found.setdefault((i, j), (x, y))
+        assert sorted(found) == sorted(expected), segments
+        for pair, (x, y) in found.items():
+            assert (x, y) == pytest.approx(tuple(map(float, expected[pair])), abs=1e-6), segments
+
+
+def test_segment_intersections_on_degenerate_segments():
+    segments = [((0, 0), (4, 4)), ((0, 4), (4, 0)), ((2, 0), (2, 4)), ((0, 2), (4, 2)),  # All through (2, 2)
+                ((5, 5), (5, 5)), ((5, 5), (8, 5)), ((6, 5), (9, 5)), ((7, 5), (7, 5))]  # Points and overlaps
+    result = intersections(segments)
+    assert result.intersections[0] == (2.0, 2.0, (0, 1, 2, 3))
+    found = {pair for *_, ids in result.intersections for pair in itertools.combinations(ids, 2)}
+    assert found == {pair for pair in itertools.combinations(range(4), 2)} | {(4, 5), (5, 6), (5, 7), (6, 7)}
+    assert [(o.segments, o.start, o.end) for o in result.overlaps] == [((5, 6), (6.0, 5.0), (8.0, 5.0))]
@@ -0,0 +1,99 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from geometry import sweep, triangulate
+from geometry.models import Point, Polygon, PolygonError
+
+
+def twice_area(ring):
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]))
+
+
+def inside(ring, x, y):
+    """Ray casting, for points known not to be on the boundary"""
+    result = False
+    for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]):
+        if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+            result = not result
+    return result
+
+
+def random_star(rng, n, clockwise=False):
+    """Simple star-shaped polygon with integer vertices sorted by angle around the origin"""
+    while True:
+        angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(n))
+        radii = [rng.uniform(100, 1000) for _ in range(n)]
+        ring = [(round(r * math.cos(a)), round(r * math.sin(a))) for a, r in zip(angles, radii)]
+        if clockwise:
+            ring.reverse()
+        if len(set(ring)) == n and not sweep.ring_crossings(*zip(*ring), first_only=True):
+            return ring
+
+
+def comb(teeth):
+    """Horizontal edges at many shared heights, and collinear vertices along the base"""
+    ring = [(0, 0)] + [(x, 0) for x in range(2, 4 * teeth, 4)] + [(4 * teeth, 0)]
+    for k in reversed(range(teeth)):
+        ring += [(4 * k + 3, 6), (4 * k + 2, 2), (4 * k + 1, 6)]
+    return ring
+
+
+def stairs(steps):
+    ring = [(0, 0), (steps, 0)]
+    for k in reversed(range(steps)):
+        ring += [(k + 1, steps - k), (k, steps - k)]
+    return ring[:-1] + [(0, steps)]
+
+
+def check_triangulation(ring):
+    triangles = triangulate.triangulate_polygon([x for x, _ in ring], [y for _, y in ring])
+    n = len(ring)
+    assert len(triangles) == n - 2, ring
+    areas = [twice_area([ring[a], ring[b], ring[c]]) for a, b, c in triangles]
+    assert all(area > 0 for area in areas), ring
+    assert sum(areas) == abs(twice_area(ring)), ring
+    # Each polygon edge bounds one triangle, each diagonal two
+    edges = Counter(frozenset(pair) for a, b, c in triangles for pair in ((a, b), (b, c), (c, a)))
+    for k in range(n):
+        assert edges.pop(frozenset((k, (k + 1) % n))) == 1, ring
+    assert all(count == 2 for count in edges.values()), ring
+    for a, b, c in triangles:
+        assert inside(ring, *[sum(ring[i][axis] for i in (a, b, c)) / 3 for axis in (0, 1)]), ring
+    return triangles
+
+
+# Both sides of the switch from ear clipping to monotone pieces
+@pytest.mark.parametrize('n', [3, 4, 10, triangulate.EAR_CLIPPING_MAX_VERTICES,
+                               triangulate.EAR_CLIPPING_MAX_VERTICES + 1, 150])
+@pytest.mark.parametrize('clockwise', [False, True])
+def test_triangle_areas_add_up_to_the_polygon_area(n, clockwise):
+    rng = random.Random(n)
+    for _ in range(30):
+        check_triangulation(random_star(rng, n, clockwise))
+
+
+@pytest.mark.parametrize('ring', [comb(3), comb(20), stairs(5), stairs(40)])
+def test_horizontal_and_collinear_edges(ring):
+    check_triangulation(ring)
+    check_triangulation(ring[::-1])
+
+
+def test_polygon_triangulate():
+    ring = comb(12)
+    polygon = Polygon([Point(x, y) for x, y in ring])
+    assert polygon.triangulate() == triangulate.triangulate_polygon([x for x, _ in ring], [y for _, y in ring])
+    with pytest.raises(PolygonError):
+        Polygon([Point(0, 0), Point(2, 2), Point(2, 0), Point(0, 2)]).triangulate()
+
+
+def test_triangulate_endpoint():
+    from app import app
+    client = app.test_client()
+    ring = stairs(20)
+    response = client.post('/api/polygon/triangulate', json={'points': [{'x': x, 'y': y} for x, y in ring]})
+    assert response.status_code == 200
+    triangles = response.get_json()['result']['triangles']
+    assert sum(twice_area([ring[i] for i in triangle]) for triangle in triangles) == twice_area(ring)